@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Benchmark CPF generation throughput.
+
+Compares per-identifier random_cpf calls against the random_cpfs batch
+generator (numpy matrix products when numpy is installed, precomputed group
+tables otherwise).
+
+Usage:
+    python -m benchmarks.bench_cpf [--count 1000000]
+"""
+
+import argparse
+import time
+
+from src.utils import cpf
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=1_000_000, help='Number of CPFs to generate')
+    args = parser.parse_args()
+
+    single_count = max(1, args.count // 10)  # The per-call path is the slow one
+    start = time.perf_counter()
+    for _ in range(single_count):
+        cpf.random_cpf()
+    single_rate = single_count / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    cpf.random_cpfs(args.count)
+    batch_rate = args.count / (time.perf_counter() - start)
+
+    print(f'Batch implementation: {"numpy" if cpf.np is not None else "pure Python"}')
+    print(f'Before (random_cpf per call): {single_rate * 60:>14,.0f} CPFs/min')
+    print(f'After  (random_cpfs batch):   {batch_rate * 60:>14,.0f} CPFs/min')
+    print(f'Speedup: {batch_rate / single_rate:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark first-name sampling throughput.
+
+Compares the previous per-call ``random.choices`` approach (rebuilding the name
+and weight lists on every draw) against the precomputed alias tables used by
+BrazilianNameSampler.
+
+Usage:
+    python -m benchmarks.bench_name_sampler [--names 5000] [--draws 200000]
+"""
+
+import argparse
+import random
+import time
+
+from src.br_name_class import BrazilianNameSampler, TimePeriod
+
+
+def build_data(names_per_period: int) -> dict:
+    """Build synthetic name data with a realistic long-tailed distribution."""
+    names = {f'NOME{i}': {'percentage': 1.0 / (i + 1)} for i in range(names_per_period)}
+    return {
+        'common_names_percentage': {period.value: {'names': names, 'total': names_per_period} for period in TimePeriod},
+        'surnames': {'SILVA': {'percentage': 1.0}, 'top_40': {'SILVA': {'percentage': 1.0}}},
+    }
+
+
+def legacy_first_name(name_data: dict, time_period: TimePeriod) -> str:
+    """First-name draw as implemented before the alias tables."""
+    names_data = name_data[time_period.value]['names']
+    names = []
+    weights = []
+    for name, info in names_data.items():
+        names.append(name)
+        weights.append(info['percentage'])
+    return random.choices(names, weights=weights, k=1)[0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--names', type=int, default=5000, help='Number of distinct names per time period')
+    parser.add_argument('--draws', type=int, default=200_000, help='Number of names to draw')
+    args = parser.parse_args()
+
+    sampler = BrazilianNameSampler(build_data(args.names))
+    period = TimePeriod.UNTIL_2010
+
+    legacy_draws = max(1, args.draws // 100)  # The legacy path is O(n) per draw
+    start = time.perf_counter()
+    for _ in range(legacy_draws):
+        legacy_first_name(sampler.name_data, period)
+    legacy_rate = legacy_draws / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(args.draws):
+        sampler._sample_first_name(period)
+    alias_rate = args.draws / (time.perf_counter() - start)
+
+    print(f'Distinct names per period: {args.names}')
+    print(f'Before (random.choices per call): {legacy_rate:>14,.0f} names/sec')
+    print(f'After  (alias table):             {alias_rate:>14,.0f} names/sec')
+    print(f'Speedup: {alias_rate / legacy_rate:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
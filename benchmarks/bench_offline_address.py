@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark offline street address throughput.
+
+Compares the previous first-name lookup of AddressProvider_for_offline (reading
+and flattening the names file on every call) against the shared name pool,
+for street names in the '{{street_prefix}} {{first_name}} {{last_name}}' format.
+
+Usage:
+    python -m benchmarks.bench_offline_address [--names 5000] [--addresses 200000]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_sampler import write_fixtures
+from src.utils.address_for_offline import AddressProvider_for_offline
+
+
+def legacy_first_name(provider: AddressProvider_for_offline, names_path: Path) -> str:
+    """First-name draw as implemented before the shared pool."""
+    with names_path.open(encoding='utf-8') as f:
+        names_data = json.load(f)
+    all_names = []
+    for period_data in names_data['common_names_percentage'].values():
+        all_names.extend(period_data['names'])
+    return provider.random_element(all_names)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--names', type=int, default=5000, help='Number of distinct names per time period')
+    parser.add_argument('--addresses', type=int, default=200_000, help='Number of street names to generate')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        names_path = write_fixtures(Path(tmp), names_per_period=args.names, surnames=1)['names_path']
+        provider = AddressProvider_for_offline()
+
+        legacy_addresses = max(1, args.addresses // 1000)  # The legacy path parses the whole file per address
+        start = time.perf_counter()
+        for _ in range(legacy_addresses):
+            f'{provider.street_prefix()} {legacy_first_name(provider, names_path)} {provider.last_name()}'
+        legacy_rate = legacy_addresses / (time.perf_counter() - start)
+
+        provider = AddressProvider_for_offline(name_pool=AddressProvider_for_offline.load_name_pool(names_path))
+        start = time.perf_counter()
+        for _ in range(args.addresses):
+            f'{provider.street_prefix()} {provider.first_name()} {provider.last_name()}'
+        pooled_rate = args.addresses / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        first_names = provider.first_names(args.addresses)
+        for first_name in first_names:
+            f'{provider.street_prefix()} {first_name} {provider.last_name()}'
+        batched_rate = args.addresses / (time.perf_counter() - start)
+
+    print(f'Distinct names per period: {args.names}')
+    print(f'Before (names file read per address): {legacy_rate:>12,.0f} addresses/sec')
+    print(f'After  (shared name pool):            {pooled_rate:>12,.0f} addresses/sec')
+    print(f'After  (batched first_names):         {batched_rate:>12,.0f} addresses/sec')
+    print(f'Speedup: {pooled_rate / legacy_rate:.0f}x')
+
+
+if __name__ == '__main__':
+    main()
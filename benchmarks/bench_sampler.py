@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark end-to-end throughput of src.sampler.sample in offline mode.
+
+Builds synthetic name and surname files plus a locations file derived from
+src/data/locations_data_normalized.json in a temporary directory, then times
+full-profile generation (--all equivalent).
+
+Usage:
+    python -m benchmarks.bench_sampler [--qty 20000] [--repeat 3]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from src.br_name_class import TimePeriod
+from src.sampler import sample
+
+DATA_DIR = Path(__file__).resolve().parents[1] / 'src' / 'data'
+
+
+def write_fixtures(directory: Path, names_per_period: int = 5000, surnames: int = 5000) -> dict[str, Path]:
+    """Write the data files sample() needs into directory and return their paths."""
+    names = {f'Nome{i}': {'percentage': 1.0 / (i + 1)} for i in range(names_per_period)}
+    names_data = {'common_names_percentage': {period.value: {'names': names, 'total': names_per_period} for period in TimePeriod}}
+    surname_data = {f'SOBRENOME{i}': {'percentage': 1.0 / (i + 1)} for i in range(surnames)}
+    surname_data.update({'SILVA': {'percentage': 0.5}, 'SANTOS': {'percentage': 0.4}})
+    surname_data['top_40'] = {'SILVA': {'percentage': 0.5}, 'SANTOS': {'percentage': 0.4}}
+
+    with (DATA_DIR / 'locations_data_normalized.json').open(encoding='utf-8') as f:
+        locations = json.load(f)
+    for city_name, city_data in locations['cities'].items():
+        city_data['city_name'] = city_name
+
+    paths = {
+        'names_path': directory / 'names_data.json',
+        'surnames_path': directory / 'surnames_data.json',
+        'json_path': directory / 'locations_data.json',
+    }
+    paths['names_path'].write_text(json.dumps(names_data), encoding='utf-8')
+    paths['surnames_path'].write_text(json.dumps({'surnames': surname_data}), encoding='utf-8')
+    paths['json_path'].write_text(json.dumps(locations, ensure_ascii=False), encoding='utf-8')
+    return paths
+
+
+def sample_options(paths: dict[str, Path], qty: int) -> dict:
+    """Keyword arguments for a full-profile offline run."""
+    flags = [
+        'city_only', 'state_abbr_only', 'state_full_only', 'only_cep', 'cep_without_dash', 'make_api_call', 'return_only_name',
+        'name_raw', 'only_surname', 'top_40', 'with_only_one_surname', 'always_middle', 'only_middle', 'always_cpf', 'always_pis',
+        'always_cnpj', 'always_cei', 'always_rg', 'always_phone', 'only_cpf', 'only_pis', 'only_cnpj', 'only_cei', 'only_rg',
+        'only_fone', 'only_document',
+    ]  # fmt: skip
+    options = dict.fromkeys(flags, False)
+    options.update(
+        qty=qty,
+        q=None,
+        time_period=TimePeriod.UNTIL_2010,
+        middle_names_path=DATA_DIR / 'middle_names.json',
+        locations_path=None,
+        include_issuer=True,
+        save_to_jsonl=None,
+        all_data=True,
+        **paths,
+    )
+    return options
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--qty', type=int, default=20_000, help='Rows per run')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of timed runs (best is reported)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        options = sample_options(write_fixtures(Path(tmp)), args.qty)
+        best = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            sample(**options)
+            best = min(best, time.perf_counter() - start)
+
+    print(f'Rows per run: {args.qty}')
+    print(f'Best of {args.repeat}: {best:.3f}s ({args.qty / best:,.0f} rows/sec)')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,21 +1,78 @@
 import json
 import random
+import threading
+from array import array
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, replace
 from pathlib import Path
 
+from src.utils.alias_table import AliasTable
+from src.utils.cep_index import CepIndex, CepLocation, cep_to_int
+
+
+@dataclass(frozen=True, slots=True)
+class LocationTables:
+    """One consistent version of the sampler's derived tables.
+
+    City tables are parallel lists indexed by city index, in data order; a city whose
+    state is missing from the states table gets state index -1 and is never drawn
+    nationwide. The lists and dicts are never modified once the tables are published:
+    updates build new ones (sharing whatever didn't change) and publish a new
+    LocationTables with a single attribute assignment, so a draw that binds the
+    tables once sees a single version throughout.
+    """
+
+    state_names: list[str]
+    state_abbrs: list[str]
+    state_raw_weights: list[float]
+    state_weights: list[float]
+    state_index_by_abbr: dict[str, int]
+    state_alias: AliasTable
+    city_names: list[str]
+    city_state_index: list[int]
+    city_ibge_codes: list[str]
+    city_records: list[dict]
+    city_index_by_ibge: dict[str, int]
+    city_index_by_uf_name: dict[tuple[str, str], int]
+    city_indices_by_name: dict[str, list[int]]
+    city_index_by_key: dict[str, int]
+    # CEPs drawn for each city as integers (see BrazilianLocationSampler.city_cep_begins)
+    city_cep_begins: array
+    city_cep_ends: array
+    city_cep_lists: list[array | None]
+    # Per-state city tables (city indices, names and normalized weights in the same order)
+    city_indices_by_state: dict[str, list[int]]
+    city_names_by_state: dict[str, list[str]]
+    city_weights_by_state: dict[str, list[float]]
+    city_alias_by_state: dict[str, AliasTable]
+    # Nationwide city weights: each state's raw weight split among its cities (see _set_national_weights)
+    national_weights: list[float]
+    national_city_alias: AliasTable | None
+
+
+def _table(name: str, doc: str) -> property:
+    return property(lambda self: getattr(self._tables, name), doc=doc)
+
 
 class BrazilianLocationSampler:
     """Brazilian location sampling class for generating realistic location data."""
 
-    def __init__(self, json_file_path: str | Path):
+    # Serializes update_cities/update_states (draws never take it)
+    _update_lock = threading.Lock()
+
+    def __init__(self, json_file_path: str | Path, rng: random.Random | None = None):
         """Initialize the sampler with population data from JSON files.
 
         Args:
             json_file_path: Path to main JSON file with population data
+            rng: Random number source for every draw (defaults to the global random module)
 
         Raises:
             ValueError: If required data is missing or invalid
             FileNotFoundError: If JSON files cannot be found
         """
+        self.rng = rng if rng is not None else random
+
         with Path(json_file_path).open(encoding='utf-8') as file:
             self.data = json.load(file)
 
@@ -26,86 +83,293 @@ class BrazilianLocationSampler:
         # Pre-calculate weights for more efficient sampling
         self._calculate_weights()
 
+    state_names = _table('state_names', 'State names, indexed by state index.')
+    state_abbrs = _table('state_abbrs', 'State abbreviations, indexed by state index.')
+    state_weights = _table('state_weights', 'Normalized state weights, indexed by state index.')
+    city_names = _table('city_names', 'City names, indexed by city index.')
+    city_state_index = _table('city_state_index', "Each city's state index (-1 if its state is unknown).")
+    city_ibge_codes = _table('city_ibge_codes', "Each city's IBGE code (uf_code + city_code), or ''.")
+    city_records = _table('city_records', "Each city's data dictionary.")
+    city_index_by_ibge = _table('city_index_by_ibge', 'City index by IBGE code.')
+    city_index_by_uf_name = _table('city_index_by_uf_name', 'City index by (state abbreviation, city name).')
+    city_indices_by_state = _table('city_indices_by_state', "Each state's city indices.")
+    city_names_by_state = _table('city_names_by_state', "Each state's city names, in city_indices_by_state order.")
+    city_weights_by_state = _table('city_weights_by_state', "Each state's normalized city weights, in city_indices_by_state order.")
+    city_cep_begins = _table(
+        'city_cep_begins', "First CEP of each city's cep_range_begins..cep_range_ends range, as integers (1 if it has none)."
+    )
+    city_cep_ends = _table('city_cep_ends', "Last CEP of each city's range, as integers (0 if it has none).")
+    city_cep_lists = _table('city_cep_lists', "Each city's own 'ceps' list as integers, drawn from instead of its range, or None.")
+
+    @property
+    def tables(self) -> LocationTables:
+        """The current tables. Bind them once to read several tables of the same version."""
+        return self._tables
+
     def update_cities(self, cities_data: dict) -> None:
         """Update the cities data and recalculate weights.
 
         This method allows updating the cities data after initialization,
-        which is useful when loading custom location data.
+        which is useful when loading custom location data. Only the tables of
+        the states whose cities changed are rebuilt, and concurrent draws keep
+        seeing consistent tables (see LocationTables). Moving a city to another
+        state falls back to a full rebuild.
 
         Args:
-            cities_data: Dictionary containing city data to update or add
+            cities_data: Dictionary containing city data to update or add, keyed like the 'cities' table
 
         Raises:
             ValueError: If cities_data is not a valid dictionary
         """
         if not isinstance(cities_data, dict):
             raise ValueError('cities_data must be a dictionary')
+        if not cities_data:
+            return
 
-        # Update the cities data
-        if cities_data:
-            self.data['cities'].update(cities_data)
-
-        # Recalculate weights to ensure proper sampling
-        self._calculate_weights()
+        with self._update_lock:
+            self.data['cities'] = {**self.data['cities'], **cities_data}
+            tables = self._update_cities_incrementally(cities_data)
+            self._tables = tables if tables is not None else _build_tables(self.data)
+            self._cep_index = None
 
     def update_states(self, states_data: dict) -> None:
         """Update the states data and recalculate weights.
 
         This method allows updating the states data after initialization,
-        which is useful when loading custom location data.
+        which is useful when loading custom location data. Only the state table
+        is renormalized, plus the nationwide weights of the changed states'
+        cities so get_state_and_city follows the new state weights. Concurrent
+        draws keep seeing consistent tables. Renaming a state's abbreviation
+        falls back to a full rebuild.
 
         Args:
-            states_data: Dictionary containing state data to update or add
+            states_data: Dictionary containing state data to update or add, keyed by state name
 
         Raises:
             ValueError: If states_data is not a valid dictionary
         """
         if not isinstance(states_data, dict):
             raise ValueError('states_data must be a dictionary')
+        if not states_data:
+            return
 
-        # Update the states data
-        if states_data:
-            self.data['states'].update(states_data)
-
-        # Recalculate weights to ensure proper sampling
-        self._calculate_weights()
+        with self._update_lock:
+            self.data['states'] = {**self.data['states'], **states_data}
+            tables = self._update_states_incrementally(states_data)
+            self._tables = tables if tables is not None else _build_tables(self.data)
 
     def _calculate_weights(self) -> None:
-        """Pre-calculate weights for states and cities based on population percentages."""
-        # Calculate state weights
-        self.state_weights = []
-        self.state_names = []
+        """Pre-calculate weights and alias tables for states and cities based on population percentages."""
+        self._tables = _build_tables(self.data)
 
-        for state_name, state_data in self.data['states'].items():
-            self.state_names.append(state_name)
-            self.state_weights.append(state_data['population_percentage'])
+        # CEP reverse lookup index, built on first use
+        self._cep_index = None
 
-        # Normalize state weights to sum to 1
-        total_weight = sum(self.state_weights)
-        self.state_weights = [w / total_weight for w in self.state_weights]
+    def _update_cities_incrementally(self, cities_data: dict) -> LocationTables | None:
+        """Build the tables with changed and added cities applied, without a full rebuild.
 
-        # Calculate city weights per state
-        self.city_weights_by_state = {}
-        self.city_names_by_state = {}
-        self.city_data_by_name = {}
+        Only the per-state tables of the states whose cities changed are rebuilt; the
+        others are shared with the current tables.
 
-        for city_id, city_data in self.data['cities'].items():
+        Returns:
+            The new tables, or None if the update needs a full rebuild instead
+        """
+        tables = self._tables
+        for key, city_data in cities_data.items():
+            city_idx = tables.city_index_by_key.get(key)
+            if city_idx is not None and tables.city_records[city_idx]['city_uf'] != city_data['city_uf']:
+                return None
+
+        city_names = list(tables.city_names)
+        city_state_index = list(tables.city_state_index)
+        city_ibge_codes = list(tables.city_ibge_codes)
+        city_records = list(tables.city_records)
+        lookups = _CityLookups.copy_of(tables)
+        cep_begins, cep_ends, cep_lists = array('I', tables.city_cep_begins), array('I', tables.city_cep_ends), list(tables.city_cep_lists)
+        national_weights = list(tables.national_weights)
+        changed_states = {}
+
+        for key, city_data in cities_data.items():
             state = city_data['city_uf']
-            city_name = city_data['city_name']
+            city_idx = tables.city_index_by_key.get(key)
+            begin, end, ceps = _parse_city_ceps(city_data)
+            if city_idx is None:
+                city_idx = len(city_names)
+                cep_begins.append(0)
+                cep_ends.append(0)
+                cep_lists.append(None)
+                national_weights.append(0.0)
+                city_state_index.append(tables.state_index_by_abbr.get(state, -1))
+                city_ibge_codes.append('')
+                city_records.append(city_data)
+                city_names.append(city_data['city_name'])
+                indices = changed_states.setdefault(state, list(tables.city_indices_by_state.get(state, ())))
+                indices.append(city_idx)
+            else:
+                lookups.unindex(city_idx, city_records[city_idx], city_ibge_codes[city_idx])
+                city_records[city_idx] = city_data
+                city_names[city_idx] = city_data['city_name']
+                changed_states.setdefault(state, list(tables.city_indices_by_state[state]))
+            city_ibge_codes[city_idx] = lookups.index(key, city_idx, city_data)
+
+            cep_begins[city_idx], cep_ends[city_idx], cep_lists[city_idx] = begin, end, ceps
+
+        # Renormalize the affected states only
+        city_indices_by_state = dict(tables.city_indices_by_state)
+        city_names_by_state = dict(tables.city_names_by_state)
+        city_weights_by_state = dict(tables.city_weights_by_state)
+        city_alias_by_state = dict(tables.city_alias_by_state)
+        for state, indices in changed_states.items():
+            weights = [city_records[i]['population_percentage_state'] for i in indices]
+            total = sum(weights)
+            if total > 0:
+                weights = [w / total for w in weights]
+                city_alias_by_state[state] = AliasTable(weights)
+            else:
+                city_alias_by_state.pop(state, None)
+            city_indices_by_state[state] = indices
+            city_names_by_state[state] = [city_names[i] for i in indices]
+            city_weights_by_state[state] = weights
+            state_idx = tables.state_index_by_abbr.get(state, -1)
+            if state_idx >= 0:
+                _set_national_weights(national_weights, tables.state_raw_weights[state_idx], indices, city_records, weights)
+
+        return replace(
+            tables,
+            city_names=city_names,
+            city_state_index=city_state_index,
+            city_ibge_codes=city_ibge_codes,
+            city_records=city_records,
+            city_index_by_ibge=lookups.by_ibge,
+            city_index_by_uf_name=lookups.by_uf_name,
+            city_indices_by_name=lookups.by_name,
+            city_index_by_key=lookups.by_key,
+            city_cep_begins=cep_begins,
+            city_cep_ends=cep_ends,
+            city_cep_lists=cep_lists,
+            city_indices_by_state=city_indices_by_state,
+            city_names_by_state=city_names_by_state,
+            city_weights_by_state=city_weights_by_state,
+            city_alias_by_state=city_alias_by_state,
+            national_weights=national_weights,
+            national_city_alias=_national_alias(national_weights),
+        )
+
+    def _update_states_incrementally(self, states_data: dict) -> LocationTables | None:
+        """Build the tables with changed and added states applied, without a full rebuild.
+
+        Returns:
+            The new tables, or None if the update needs a full rebuild instead
+        """
+        tables = self._tables
+        state_index_by_name = {name: i for i, name in enumerate(tables.state_names)}
+        for state_name, state_data in states_data.items():
+            state_idx = state_index_by_name.get(state_name)
+            if state_idx is not None and tables.state_abbrs[state_idx] != state_data['state_abbr']:
+                return None
+            if state_idx is None and state_data['state_abbr'] in tables.state_index_by_abbr:
+                return None
+
+        state_names = list(tables.state_names)
+        state_abbrs = list(tables.state_abbrs)
+        state_index_by_abbr = dict(tables.state_index_by_abbr)
+        raw_weights = list(tables.state_raw_weights)
+        added = []
+        for state_name, state_data in states_data.items():
+            state_idx = state_index_by_name.get(state_name)
+            if state_idx is None:
+                state_idx = len(state_names)
+                state_index_by_name[state_name] = state_idx
+                raw_weights.append(0.0)
+                state_names.append(state_name)
+                state_abbrs.append(state_data['state_abbr'])
+                state_index_by_abbr[state_data['state_abbr']] = state_idx
+                added.append(state_data['state_abbr'])
+            raw_weights[state_idx] = state_data['population_percentage']
+
+        # Cities already loaded for a new state join the nationwide table
+        city_state_index = list(tables.city_state_index) if added else tables.city_state_index
+        for abbr in added:
+            for city_idx in tables.city_indices_by_state.get(abbr, ()):
+                city_state_index[city_idx] = state_index_by_abbr[abbr]
+
+        # Reweight the changed states' cities so nationwide draws follow the new state weights
+        national_weights = list(tables.national_weights)
+        for state_data in states_data.values():
+            state = state_data['state_abbr']
+            if state in tables.city_indices_by_state:
+                _set_national_weights(
+                    national_weights,
+                    raw_weights[state_index_by_abbr[state]],
+                    tables.city_indices_by_state[state],
+                    tables.city_records,
+                    tables.city_weights_by_state[state],
+                )
+
+        total_weight = sum(raw_weights)
+        state_weights = [w / total_weight for w in raw_weights]
+        return replace(
+            tables,
+            state_names=state_names,
+            state_abbrs=state_abbrs,
+            state_raw_weights=raw_weights,
+            state_weights=state_weights,
+            state_index_by_abbr=state_index_by_abbr,
+            state_alias=AliasTable(state_weights),
+            city_state_index=city_state_index,
+            national_weights=national_weights,
+            national_city_alias=_national_alias(national_weights),
+        )
+
+    @property
+    def cep_index(self) -> CepIndex:
+        """Interval index over the cities' CEP ranges, built once and rebuilt after the cities change."""
+        if self._cep_index is None:
+            self._cep_index = CepIndex(self.data['cities'])
+        return self._cep_index
+
+    def lookup_cep(self, cep: str | int) -> CepLocation | None:
+        """Find the city owning a CEP without any network access.
 
-            if state not in self.city_weights_by_state:
-                self.city_weights_by_state[state] = []
-                self.city_names_by_state[state] = []
+        Args:
+            cep: CEP with or without dash, or its integer value
 
-            self.city_names_by_state[state].append(city_name)
-            self.city_weights_by_state[state].append(city_data['population_percentage_state'])
-            self.city_data_by_name[city_name] = city_data
+        Returns:
+            CepLocation with the city name, state abbreviation and IBGE code, or None if no city's CEP range contains it
+        """
+        return self.cep_index.lookup(cep)
 
-        # Normalize city weights within each state
-        for state in self.city_weights_by_state:
-            total = sum(self.city_weights_by_state[state])
-            if total > 0:
-                self.city_weights_by_state[state] = [w / total for w in self.city_weights_by_state[state]]
+    def lookup_ceps(self, ceps: Iterable[str | int]) -> list[CepLocation | None]:
+        """Find the cities owning many CEPs (see lookup_cep), in order."""
+        return self.cep_index.lookup_many(ceps)
+
+    def city_index(self, city_name: str, state_abbr: str | None = None) -> int:
+        """Find a city's index in the city table.
+
+        Args:
+            city_name: City name
+            state_abbr: State abbreviation, needed when cities of several states share the name
+
+        Returns:
+            Index into city_names, city_records and the other city table lists
+
+        Raises:
+            ValueError: If the city is not found or its name is ambiguous without state_abbr
+        """
+        tables = self._tables
+        if state_abbr is not None:
+            city_idx = tables.city_index_by_uf_name.get((state_abbr, city_name))
+            if city_idx is None:
+                raise ValueError(f'City not found: {city_name} ({state_abbr})')
+            return city_idx
+
+        city_indices = tables.city_indices_by_name.get(city_name)
+        if not city_indices:
+            raise ValueError(f'City not found: {city_name}')
+        if len(city_indices) > 1:
+            states = ', '.join(sorted(tables.city_records[i]['city_uf'] for i in city_indices))
+            raise ValueError(f'City name {city_name} exists in several states ({states}); pass state_abbr')
+        return city_indices[0]
 
     def get_state(self) -> tuple[str, str]:
         """Get a random state weighted by population percentage.
@@ -113,9 +377,9 @@ class BrazilianLocationSampler:
         Returns:
             Tuple of (state_name, state_abbreviation)
         """
-        state_name = random.choices(self.state_names, weights=self.state_weights, k=1)[0]
-        state_abbr = self.data['states'][state_name]['state_abbr']
-        return state_name, state_abbr
+        tables = self._tables
+        idx = tables.state_alias.sample(self.rng)
+        return tables.state_names[idx], tables.state_abbrs[idx]
 
     def get_city(self, state_abbr: str | None = None) -> tuple[str, str]:
         """Get a random city weighted by population percentage.
@@ -129,52 +393,114 @@ class BrazilianLocationSampler:
         Raises:
             ValueError: If no cities found for given state
         """
+        tables = self._tables
         if state_abbr is None:
-            _, state_abbr = self.get_state()
+            state_abbr = tables.state_abbrs[tables.state_alias.sample(self.rng)]
+        return tables.city_names[self.get_city_index(state_abbr, tables)], state_abbr
 
-        if state_abbr not in self.city_weights_by_state:
-            raise ValueError(f'No cities found for state: {state_abbr}')
+    def get_city_index(self, state_abbr: str | None = None, tables: LocationTables | None = None) -> int:
+        """Get a random city's index in the city table, weighted by population percentage.
 
-        city_name = random.choices(self.city_names_by_state[state_abbr], weights=self.city_weights_by_state[state_abbr], k=1)[0]
+        Args:
+            state_abbr: Optional state abbreviation to get city from specific state
+            tables: Tables to draw from (defaults to the current ones, see tables)
 
-        return city_name, state_abbr
+        Returns:
+            Index into city_names, city_records and the other city table lists
+
+        Raises:
+            ValueError: If no cities found for given state
+        """
+        tables = tables if tables is not None else self._tables
+        if state_abbr is None:
+            state_abbr = tables.state_abbrs[tables.state_alias.sample(self.rng)]
+
+        alias = tables.city_alias_by_state.get(state_abbr)
+        if alias is None:
+            raise ValueError(f'No cities found for state: {state_abbr}')
+        return tables.city_indices_by_state[state_abbr][alias.sample(self.rng)]
 
     def get_state_and_city(self) -> tuple[str, str, str]:
         """Get a random state and city combination weighted by population percentage.
 
+        Draws a single city from the nationwide table in constant time. States come out
+        with the same weights as get_state.
+
         Returns:
             Tuple of (state_name, state_abbreviation, city_name)
         """
-        state_name, state_abbr = self.get_state()
-        city_name, _ = self.get_city(state_abbr)
-        return state_name, state_abbr, city_name
+        tables = self._tables
+        if tables.national_city_alias is None:
+            raise ValueError('No cities available for sampling')
+        city_idx = tables.national_city_alias.sample(self.rng)
+        state_idx = tables.city_state_index[city_idx]
+        return tables.state_names[state_idx], tables.state_abbrs[state_idx], tables.city_names[city_idx]
 
-    def _get_random_cep_for_city(self, city_name: str) -> str:
+    def get_state_and_city_batch(self, n: int, tables: LocationTables | None = None) -> tuple[list[int], list[int]]:
+        """Draw n state and city combinations as index arrays.
+
+        Args:
+            n: Number of draws
+            tables: Tables to draw from (defaults to the current ones). Pass the tables
+                the indices will be resolved against, so an update can't come in between.
+
+        Returns:
+            Tuple of (state_indices, city_indices) into state_names/state_abbrs and city_names
+        """
+        tables = tables if tables is not None else self._tables
+        if tables.national_city_alias is None:
+            raise ValueError('No cities available for sampling')
+        city_indices = tables.national_city_alias.sample_many(n, self.rng)
+        city_state_index = tables.city_state_index
+        return [city_state_index[i] for i in city_indices], city_indices
+
+    def _get_random_cep_for_city(self, city: int | str, state_abbr: str | None = None) -> str:
         """Generate random CEP from city's available CEPs or CEP range.
 
         Args:
-            city_name: Name of city to get CEP for
+            city: Index of the city in the city table, or its name
+            state_abbr: State abbreviation of a city given by name (see city_index)
 
         Returns:
-            Random valid CEP from city's available CEPs or generated from range
+            Random valid CEP from city's available CEPs or generated from range, as 8 digits without dash
 
         Raises:
             ValueError: If city not found or has no CEPs/CEP range
         """
-        if city_name not in self.city_data_by_name:
-            raise ValueError(f'City not found: {city_name}')
+        city_idx = city if isinstance(city, int) else self.city_index(city, state_abbr)
+        return self.random_ceps([city_idx], with_dash=False)[0]
 
-        city_data = self.city_data_by_name[city_name]
+    def random_ceps(self, city_indices: Sequence[int], with_dash: bool = True, tables: LocationTables | None = None) -> list[str]:
+        """Draw one random CEP per city, from the city's available CEPs or its CEP range.
 
-        # Try using specific CEPs first
-        if city_data.get('ceps'):
-            return random.choice(city_data['ceps'])
+        Args:
+            city_indices: Indices into the city table (e.g. from get_state_and_city_batch)
+            with_dash: Whether to format the CEPs as 12345-678 instead of 12345678
+            tables: Tables the indices refer to (defaults to the current ones)
 
-        # Fall back to generating from CEP range if available
-        if city_data.get('cep_range_begins') and city_data.get('cep_range_ends'):
-            range_start = int(city_data['cep_range_begins'].replace('-', ''))
-            range_end = int(city_data['cep_range_ends'].replace('-', ''))
-            return str(random.randint(range_start, range_end))
+        Returns:
+            Zero-padded CEPs, one per city index
+
+        Raises:
+            ValueError: If a city has no CEPs/CEP range
+        """
+        tables = tables if tables is not None else self._tables
+        uniform = self.rng.random
+        begins, ends, cep_lists = tables.city_cep_begins, tables.city_cep_ends, tables.city_cep_lists
+        ceps = []
+        append = ceps.append
+        for city_idx in city_indices:
+            cep_list = cep_lists[city_idx]
+            if cep_list is not None:
+                value = cep_list[int(uniform() * len(cep_list))]
+            else:
+                begin = begins[city_idx]
+                span = ends[city_idx] - begin + 1
+                if span <= 0:
+                    raise ValueError(f'City has no CEPs or CEP range: {tables.city_names[city_idx]}')
+                value = begin + int(uniform() * span)
+            append(f'{value // 1000:05d}-{value % 1000:03d}' if with_dash else f'{value:08d}')
+        return ceps
 
     def _format_cep(self, cep: str, with_dash: bool = True) -> str:
         """Format CEP string with optional dash.
@@ -211,7 +537,7 @@ class BrazilianLocationSampler:
         parts = [base]
 
         if include_cep:
-            cep = self._get_random_cep_for_city(city)
+            cep = self._get_random_cep_for_city(city, state_abbr)
             formatted_cep = self._format_cep(cep, not cep_without_dash)
             parts.append(formatted_cep)
 
@@ -238,8 +564,7 @@ class BrazilianLocationSampler:
             Formatted location string according to specified options
         """
         if only_cep:
-            city_name, _ = self.get_city()
-            cep = self._get_random_cep_for_city(city_name)
+            cep = self._get_random_cep_for_city(self.get_city_index())
             return self._format_cep(cep, not cep_without_dash)
 
         if state_abbr_only:
@@ -253,3 +578,176 @@ class BrazilianLocationSampler:
 
         state_name, state_abbr, city_name = self.get_state_and_city()
         return self.format_full_location(city_name, state_name, state_abbr, True, cep_without_dash)
+
+
+class _CityLookups:
+    """City lookup dictionaries being built, copied from published tables before any change."""
+
+    __slots__ = ('by_ibge', 'by_key', 'by_name', 'by_uf_name')
+
+    def __init__(self) -> None:
+        self.by_ibge: dict[str, int] = {}
+        self.by_uf_name: dict[tuple[str, str], int] = {}
+        self.by_name: dict[str, list[int]] = {}
+        self.by_key: dict[str, int] = {}
+
+    @classmethod
+    def copy_of(cls, tables: LocationTables) -> '_CityLookups':
+        lookups = cls()
+        lookups.by_ibge = dict(tables.city_index_by_ibge)
+        lookups.by_uf_name = dict(tables.city_index_by_uf_name)
+        lookups.by_name = dict(tables.city_indices_by_name)
+        lookups.by_key = dict(tables.city_index_by_key)
+        return lookups
+
+    def index(self, key: str, city_idx: int, city_data: dict) -> str:
+        """Point the city lookups at city_idx and return the city's IBGE code."""
+        city_name = city_data['city_name']
+        ibge_code = f'{city_data.get("uf_code", "")}{city_data.get("city_code", "")}'
+        if ibge_code:
+            self.by_ibge[ibge_code] = city_idx
+        self.by_uf_name[city_data['city_uf'], city_name] = city_idx
+        # New list: the old one may be shared with published tables
+        self.by_name[city_name] = [*self.by_name.get(city_name, ()), city_idx]
+        self.by_key[key] = city_idx
+        return ibge_code
+
+    def unindex(self, city_idx: int, old: dict, ibge_code: str) -> None:
+        """Drop the name and IBGE code lookups of a city about to be replaced."""
+        if self.by_ibge.get(ibge_code) == city_idx:
+            del self.by_ibge[ibge_code]
+        if self.by_uf_name.get((old['city_uf'], old['city_name'])) == city_idx:
+            del self.by_uf_name[old['city_uf'], old['city_name']]
+        same_name = [i for i in self.by_name[old['city_name']] if i != city_idx]
+        if same_name:
+            self.by_name[old['city_name']] = same_name
+        else:
+            del self.by_name[old['city_name']]
+
+
+def _build_tables(data: dict) -> LocationTables:
+    """Build every table from the locations data's 'states' and 'cities' tables."""
+    # Calculate state weights
+    state_raw_weights = []
+    state_names = []
+    state_abbrs = []
+
+    for state_name, state_data in data['states'].items():
+        state_names.append(state_name)
+        state_abbrs.append(state_data['state_abbr'])
+        state_raw_weights.append(state_data['population_percentage'])
+
+    # Normalize state weights to sum to 1
+    total_weight = sum(state_raw_weights)
+    state_weights = [w / total_weight for w in state_raw_weights]
+    state_index_by_abbr = {abbr: i for i, abbr in enumerate(state_abbrs)}
+
+    city_names = []
+    city_state_index = []
+    city_ibge_codes = []
+    city_records = []
+    lookups = _CityLookups()
+    cep_begins = array('I')
+    cep_ends = array('I')
+    cep_lists = []
+    city_indices_by_state = {}
+    city_names_by_state = {}
+    city_weights_by_state = {}
+
+    for key, city_data in data['cities'].items():
+        state = city_data['city_uf']
+        city_name = city_data['city_name']
+        city_idx = len(city_names)
+        state_idx = state_index_by_abbr.get(state, -1)
+
+        city_names.append(city_name)
+        city_state_index.append(state_idx)
+        city_records.append(city_data)
+        city_ibge_codes.append(lookups.index(key, city_idx, city_data))
+
+        begin, end, ceps = _parse_city_ceps(city_data)
+        cep_begins.append(begin)
+        cep_ends.append(end)
+        cep_lists.append(ceps)
+
+        if state not in city_indices_by_state:
+            city_indices_by_state[state] = []
+            city_names_by_state[state] = []
+            city_weights_by_state[state] = []
+        city_indices_by_state[state].append(city_idx)
+        city_names_by_state[state].append(city_name)
+        city_weights_by_state[state].append(city_data['population_percentage_state'])
+
+    # Normalize city weights within each state and build per-state alias tables
+    city_alias_by_state = {}
+    for state, weights in city_weights_by_state.items():
+        total = sum(weights)
+        if total > 0:
+            city_weights_by_state[state] = [w / total for w in weights]
+            city_alias_by_state[state] = AliasTable(city_weights_by_state[state])
+
+    # Nationwide city weights; cities of states missing from the states table are never drawn
+    national_weights = [0.0] * len(city_names)
+    for state, indices in city_indices_by_state.items():
+        state_idx = state_index_by_abbr.get(state, -1)
+        if state_idx >= 0:
+            _set_national_weights(national_weights, state_raw_weights[state_idx], indices, city_records, city_weights_by_state[state])
+
+    return LocationTables(
+        state_names=state_names,
+        state_abbrs=state_abbrs,
+        state_raw_weights=state_raw_weights,
+        state_weights=state_weights,
+        state_index_by_abbr=state_index_by_abbr,
+        state_alias=AliasTable(state_weights),
+        city_names=city_names,
+        city_state_index=city_state_index,
+        city_ibge_codes=city_ibge_codes,
+        city_records=city_records,
+        city_index_by_ibge=lookups.by_ibge,
+        city_index_by_uf_name=lookups.by_uf_name,
+        city_indices_by_name=lookups.by_name,
+        city_index_by_key=lookups.by_key,
+        city_cep_begins=cep_begins,
+        city_cep_ends=cep_ends,
+        city_cep_lists=cep_lists,
+        city_indices_by_state=city_indices_by_state,
+        city_names_by_state=city_names_by_state,
+        city_weights_by_state=city_weights_by_state,
+        city_alias_by_state=city_alias_by_state,
+        national_weights=national_weights,
+        national_city_alias=_national_alias(national_weights),
+    )
+
+
+def _set_national_weights(
+    national_weights: list[float], raw_state_weight: float, indices: list[int], city_records: list[dict], weights: list[float]
+) -> None:
+    """Set the nationwide weights of a state's cities to the state's weight times each city's share of it.
+
+    The shares follow population_percentage_total when every city of the state has it, and the
+    state's normalized city weights otherwise. Either way a nationwide draw picks states with the
+    same weights as get_state, also after update_states.
+    """
+    totals = [city_records[i].get('population_percentage_total') for i in indices]
+    total = sum(totals) if None not in totals else 0
+    shares = [t / total for t in totals] if total > 0 else weights
+    for city_idx, share in zip(indices, shares):
+        national_weights[city_idx] = raw_state_weight * share
+
+
+def _parse_city_ceps(city_data: dict) -> tuple[int, int, array | None]:
+    """Return a city's CEP range bounds and 'ceps' list as integers.
+
+    A city without a valid range gets the empty range (1, 0); one without a 'ceps' list gets None.
+    """
+    ceps = array('I', (value for value in map(cep_to_int, city_data.get('ceps') or ()) if value is not None))
+    begin = cep_to_int(city_data.get('cep_range_begins') or '')
+    end = cep_to_int(city_data.get('cep_range_ends') or '')
+    if begin is None or end is None or begin > end:
+        begin, end = 1, 0
+    return begin, end, ceps or None
+
+
+def _national_alias(national_weights: list[float]) -> AliasTable | None:
+    return AliasTable(national_weights) if national_weights and sum(national_weights) > 0 else None
@@ -2,9 +2,12 @@ import json
 import random
 from dataclasses import dataclass
 from enum import Enum
+from itertools import accumulate
 from pathlib import Path
 from typing import Any
 
+from src.utils.alias_table import AliasTable
+
 
 class TimePeriod(str, Enum):
     """Time periods available in the dataset"""
@@ -29,6 +32,25 @@ class NameComponents:
     surname: str
 
 
+@dataclass(frozen=True)
+class WeightedNames:
+    """Precomputed weighted name table, ready for random.choices(cum_weights=...)"""
+
+    names: list[str]
+    cum_weights: list[float]
+
+
+@dataclass(frozen=True)
+class SurnameIndex:
+    """Precomputed surname table with an alias table for O(1) weighted draws"""
+
+    surnames: list[str]
+    surnames_upper: list[str]
+    alias_table: AliasTable
+    prefixed: frozenset[int]  # Indices of surnames with prefix rules
+    junior: frozenset[int]  # Indices of JUNIOR/JR surnames
+
+
 class BrazilianNameSampler:
     # Dictionary mapping surnames to their prefixes and weights
     SURNAME_PREFIXES = {
@@ -48,7 +70,11 @@ class BrazilianNameSampler:
     }
 
     def __init__(
-        self, json_file_path: str | Path | dict, middle_names_path: str | Path | None = None, names_path: str | Path | None = None
+        self,
+        json_file_path: str | Path | dict,
+        middle_names_path: str | Path | None = None,
+        names_path: str | Path | None = None,
+        rng: random.Random | None = None,
     ):
         """
         Initialize the name sampler with population data.
@@ -58,7 +84,10 @@ class BrazilianNameSampler:
             json_file_path: Path to JSON file or pre-loaded data dictionary with surname data
             middle_names_path: Path to middle names JSON file
             names_path: Path to first names JSON file
+            rng: Random number source for every draw (defaults to the global random module)
         """
+        self.rng = rng if rng is not None else random
+
         # Load surname data
         if isinstance(json_file_path, str | Path):
             with Path(json_file_path).open(encoding='utf-8') as file:
@@ -84,6 +113,59 @@ class BrazilianNameSampler:
         self.middle_names_data = self._load_middle_names(middle_names_path) if middle_names_path else None
         self._validate_data()
 
+        # Precompute first-name alias tables so each draw is O(1)
+        self._first_name_tables = self._build_first_name_tables()
+
+        # Precompute surname indexes for the full table and the top 40 subset
+        self._surname_index = self._build_surname_index(self.surname_data)
+        self._top_40_surname_index = self._build_surname_index(self.top_40_surnames)
+
+        # Precompute the cleaned, normalized middle-name table once
+        self._middle_name_table = self._build_middle_name_table()
+
+    @property
+    def middle_names_data(self) -> dict[str, Any] | None:
+        """Raw middle names data. Replacing it invalidates the cached middle-name table."""
+        return self._middle_names_data
+
+    @middle_names_data.setter
+    def middle_names_data(self, data: dict[str, Any] | None) -> None:
+        self._middle_names_data = data
+        self._middle_name_table = None
+
+    @property
+    def middle_name_table(self) -> WeightedNames:
+        """Cleaned middle names with cumulative normalized weights.
+
+        Built on first access after the middle names data is loaded or replaced,
+        so batch callers can reuse it directly with random.choices.
+        """
+        if self._middle_name_table is None:
+            self._middle_name_table = self._build_middle_name_table()
+        return self._middle_name_table
+
+    def _build_first_name_tables(self) -> dict[str, tuple[list[str], AliasTable] | None]:
+        """Build one alias table per time period from the first names data.
+
+        Returns:
+            Mapping of time period value to (names, alias table), or None for periods without names
+        """
+        tables = {}
+        for period in TimePeriod:
+            names_data = self.name_data[period.value]['names']
+            names = list(names_data)
+            weights = [names_data[name]['percentage'] for name in names]
+            tables[period.value] = (names, AliasTable(weights)) if names else None
+        return tables
+
+    def _sample_first_name(self, time_period: TimePeriod) -> str:
+        """Draw a first name for the given time period from its precomputed alias table."""
+        table = self._first_name_tables[time_period.value]
+        if table is None:
+            raise ValueError(f'No names available for time period: {time_period.value}')
+        names, alias_table = table
+        return names[alias_table.sample(self.rng)]
+
     def _load_middle_names(self, path: str | Path) -> dict[str, Any]:
         """Load middle names data from JSON file."""
         with Path(path).open(encoding='utf-8') as file:
@@ -98,24 +180,25 @@ class BrazilianNameSampler:
         if not self.middle_names_data:
             return False
         # Use the overall percentage of people with second names
-        return random.random() < (self.middle_names_data['percentage_with_second'] / 100)
+        return self.rng.random() < (self.middle_names_data['percentage_with_second'] / 100)
 
-    def _get_random_middle_name(self) -> str:
-        """Get a random middle name based on precise frequency weights.
+    def _build_middle_name_table(self) -> WeightedNames:
+        """Extract the valid middle names and their cumulative normalized weights.
 
         Returns:
-            A randomly selected middle name weighted by its statistical frequency
+            WeightedNames table. Both lists are empty when there is no usable data.
 
         Raises:
             ValueError: If there's an error processing the middle names data or weights
         """
+        empty = WeightedNames([], [])
         if not self.middle_names_data or 'second_names' not in self.middle_names_data:
-            return ''
+            return empty
 
         try:
             second_names = self.middle_names_data['second_names']
             if not second_names:
-                return ''
+                return empty
 
             # Extract names and their corresponding percentages
             names = []
@@ -132,21 +215,30 @@ class BrazilianNameSampler:
                     continue  # Skip invalid percentage values
 
             if not names:
-                return ''
+                return empty
 
             # Normalize weights to ensure they sum to 1.0
             total_weight = sum(weights)
             if total_weight <= 0:
-                return ''
+                return empty
 
-            normalized_weights = [w / total_weight for w in weights]
-
-            # Use normalized weights for random selection
-            return random.choices(names, weights=normalized_weights, k=1)[0]
+            return WeightedNames(names, list(accumulate(w / total_weight for w in weights)))
 
         except (KeyError, ValueError, TypeError) as err:
             raise ValueError(f'Error processing middle names data: {err}') from err
 
+    def _get_random_middle_name(self) -> str:
+        """Get a random middle name based on precise frequency weights.
+
+        Returns:
+            A randomly selected middle name weighted by its statistical frequency
+        """
+        table = self.middle_name_table
+        if not table.names:
+            return ''
+
+        return self.rng.choices(table.names, cum_weights=table.cum_weights, k=1)[0]
+
     def get_random_name(
         self,
         time_period: TimePeriod = TimePeriod.UNTIL_2010,
@@ -168,16 +260,7 @@ class BrazilianNameSampler:
                 return NameComponents('', middle_name, '')
             return middle_name.upper() if raw else middle_name
 
-        period_data = self.name_data[time_period.value]
-        names_data = period_data['names']
-
-        names = []
-        weights = []
-        for name, info in names_data.items():
-            names.append(name)
-            weights.append(info['percentage'])
-
-        first_name = random.choices(names, weights=weights, k=1)[0]
+        first_name = self._sample_first_name(time_period)
         first_name = first_name.upper() if raw else first_name
 
         # Handle middle name
@@ -212,36 +295,186 @@ class BrazilianNameSampler:
         Get random surname(s), optionally from top 40 only.
         Preserves original accents unless raw=True
         """
-        source = self.top_40_surnames if top_40 else self.surname_data
-        surnames = []
-        weights = []
+        index = self.surname_index(top_40)
 
-        for surname, info in source.items():
-            if surname != 'top_40':  # Skip the top_40 nested dictionary
-                surnames.append(surname)
-                weights.append(info['percentage'])
+        # Draw both surnames in a single call
+        drawn = index.alias_table.sample_many(1 if with_only_one_surname else 2, self.rng)
 
         # Get first surname
-        surname1 = random.choices(surnames, weights=weights, k=1)[0]
-        surname1 = surname1.upper() if raw else surname1
-        surname1 = self._apply_prefix(surname1, allow_prefix=True)
+        first = drawn[0]
+        surname1 = index.surnames_upper[first] if raw else index.surnames[first]
+        if first in index.prefixed:
+            surname1 = self._apply_prefix(surname1, allow_prefix=True)
 
         if with_only_one_surname:
             return surname1
 
         # Get second surname
-        surname2 = random.choices(surnames, weights=weights, k=1)[0]
-        surname2 = surname2.upper() if raw else surname2
-
         # Don't apply prefix to the last surname to avoid ending with a prefix
         # Exception: "Jr." is allowed at the end
-        if surname2.upper() == 'JUNIOR' or surname2.upper() == 'JR':
+        second = drawn[1]
+        if second in index.junior:
             surname2 = 'Jr.' if not raw else 'JR'
         else:
-            surname2 = self._apply_prefix(surname2, allow_prefix=False)
+            surname2 = index.surnames_upper[second] if raw else index.surnames[second]
 
         return f'{surname1} {surname2}'
 
+    def _build_surname_index(self, source: dict[str, Any]) -> SurnameIndex | None:
+        """Build a surname index from a surnames dictionary.
+
+        Args:
+            source: Mapping of surname to info with a 'percentage' key
+
+        Returns:
+            SurnameIndex for the source, or None if it has no surnames
+        """
+        surnames = []
+        weights = []
+
+        for surname, info in source.items():
+            if surname != 'top_40':  # Skip the top_40 nested dictionary
+                surnames.append(surname)
+                weights.append(info['percentage'])
+
+        if not surnames:
+            return None
+
+        surnames_upper = [surname.upper() for surname in surnames]
+        return SurnameIndex(
+            surnames=surnames,
+            surnames_upper=surnames_upper,
+            alias_table=AliasTable(weights),
+            prefixed=frozenset(i for i, surname in enumerate(surnames_upper) if surname in self.SURNAME_PREFIXES),
+            junior=frozenset(i for i, surname in enumerate(surnames_upper) if surname in ('JUNIOR', 'JR')),
+        )
+
+    def surname_index(self, top_40: bool = False) -> SurnameIndex:
+        """Get the precomputed surname index.
+
+        Args:
+            top_40: Return the index for the top 40 surnames only
+
+        Raises:
+            ValueError: If there is no surname data for the requested table
+        """
+        index = self._top_40_surname_index if top_40 else self._surname_index
+        if index is None:
+            raise ValueError('No top 40 surname data available' if top_40 else 'No surname data available')
+        return index
+
+    def sample_surname_indices(self, k: int, top_40: bool = False) -> list[int]:
+        """Draw k weighted surname indices into surname_index(top_40).surnames.
+
+        Args:
+            k: Number of draws
+            top_40: Draw from the top 40 surnames only
+
+        Returns:
+            List of k surname indices
+        """
+        return self.surname_index(top_40).alias_table.sample_many(k, self.rng)
+
+    def sample_names(
+        self,
+        n: int,
+        time_period: TimePeriod = TimePeriod.UNTIL_2010,
+        raw: bool = False,
+        include_surname: bool = True,
+        top_40: bool = False,
+        with_only_one_surname: bool = False,
+        always_middle: bool = False,
+    ) -> dict[str, list[str | None]]:
+        """
+        Draw n names at once and return them as parallel columns.
+
+        Every component is drawn for the whole batch in a single pass instead of
+        building n NameComponents objects, which makes this the preferred API for
+        bulk generation.
+
+        Args:
+            n: Number of names to generate
+            time_period: Time period for first name sampling
+            raw: Return names in raw format (all caps)
+            include_surname: Whether to draw surnames
+            top_40: Use only the top 40 surnames
+            with_only_one_surname: Draw a single surname instead of two
+            always_middle: Always include a middle name
+
+        Returns:
+            Dictionary with 'first_name', 'middle_name' and 'surname' lists of length n.
+            Rows without a middle name hold None; surnames are '' when include_surname is False.
+        """
+        # First names
+        table = self._first_name_tables[time_period.value]
+        if table is None:
+            raise ValueError(f'No names available for time period: {time_period.value}')
+        names, alias_table = table
+        if raw:
+            names = [name.upper() for name in names]
+        first_names = [names[i] for i in alias_table.sample_many(n, self.rng)]
+
+        # Middle names: decide presence for every row, then draw only for the rows that need one
+        middle_names: list[str | None] = [None] * n
+        middle_table = self.middle_name_table
+        if middle_table.names:
+            if always_middle:
+                rows = range(n)
+            else:
+                threshold = self.middle_names_data['percentage_with_second'] / 100
+                rows = [row for row in range(n) if self.rng.random() < threshold]
+            middle_choices = [name.upper() for name in middle_table.names] if raw else middle_table.names
+            for row, name in zip(rows, self.rng.choices(middle_choices, cum_weights=middle_table.cum_weights, k=len(rows))):
+                middle_names[row] = name
+        elif always_middle:
+            middle_names = [''] * n
+
+        if not include_surname:
+            return {'first_name': first_names, 'middle_name': middle_names, 'surname': [''] * n}
+
+        # Surnames: draw index arrays, then resolve prefixes in one vectorized pass
+        index = self.surname_index(top_40)
+        surname_column = self._surname_column(index, self.sample_surname_indices(n, top_40), raw, last=False)
+
+        if not with_only_one_surname:
+            second_column = self._surname_column(index, self.sample_surname_indices(n, top_40), raw, last=True)
+            surname_column = [f'{first} {second}' for first, second in zip(surname_column, second_column)]
+
+        return {'first_name': first_names, 'middle_name': middle_names, 'surname': surname_column}
+
+    def _surname_column(self, index: SurnameIndex, indices: list[int], raw: bool, last: bool) -> list[str]:
+        """
+        Resolve drawn surname indices into display strings for a whole batch.
+
+        Only rows whose surname carries a prefix rule (or the Jr. rule, for the
+        last surname) need per-row work; every other row is a plain lookup.
+
+        Args:
+            index: Surname index the indices refer to
+            indices: Drawn surname indices, one per row
+            raw: Return surnames in raw format (all caps)
+            last: Whether this is the last surname (no prefix, Jr. allowed)
+
+        Returns:
+            List of surname strings, one per row
+        """
+        display = index.surnames_upper if raw else index.surnames
+        column = [display[i] for i in indices]
+
+        if last:
+            if index.junior:
+                suffix = 'JR' if raw else 'Jr.'
+                for row, i in enumerate(indices):
+                    if i in index.junior:
+                        column[row] = suffix
+            return column
+
+        if index.prefixed:
+            for row, i in enumerate(indices):
+                if i in index.prefixed:
+                    column[row] = self._apply_prefix(column[row], allow_prefix=True)
+        return column
+
     def _validate_data(self) -> None:
         """
         Validate the name data structure has all required time periods and correct format.
@@ -307,7 +540,7 @@ class BrazilianNameSampler:
         if surname_upper in self.SURNAME_PREFIXES:
             # Handle compound surname patterns first
             if surname_upper in ['SANTOS', 'SILVA']:
-                compound_chance = random.random()
+                compound_chance = self.rng.random()
                 compound_prefix = None  # Using a different variable name to avoid shadowing
 
                 if compound_chance < 0.05:  # 5% chance for compound with "e"
@@ -315,13 +548,13 @@ class BrazilianNameSampler:
                     return f'{surname} {compound_prefix}'
 
                 if compound_chance < 0.15:  # Additional 10% chance for compound with "da/do"
-                    compound_prefix = ('DA' if random.random() < 0.7 else 'DO') if is_raw else ('da' if random.random() < 0.7 else 'do')
+                    compound_prefix = ('DA' if self.rng.random() < 0.7 else 'DO') if is_raw else ('da' if self.rng.random() < 0.7 else 'do')
                     return f'{surname} {compound_prefix}'
 
             # Regular prefix handling with multiple options
             prefix_options = self.SURNAME_PREFIXES[surname_upper]
             total_weight = sum(weight for _, weight in prefix_options)
-            rand = random.random() * total_weight
+            rand = self.rng.random() * total_weight
 
             cumulative = 0
             for candidate_prefix, weight in prefix_options:  # Renamed loop variable to avoid shadowing
@@ -330,9 +563,9 @@ class BrazilianNameSampler:
                     final_prefix = candidate_prefix  # Store the selected prefix in a new variable
 
                     # Handle special cases for the selected prefix
-                    if final_prefix in ['da', 'do'] and random.random() < 0.08:
+                    if final_prefix in ['da', 'do'] and self.rng.random() < 0.08:
                         final_prefix = ('DOS' if final_prefix == 'do' else 'DAS') if is_raw else ('dos' if final_prefix == 'do' else 'das')
-                    elif final_prefix == 'de' and surname[0].lower() in 'aeiou' and random.random() < 0.7:
+                    elif final_prefix == 'de' and surname[0].lower() in 'aeiou' and self.rng.random() < 0.7:
                         final_prefix = "D'" if is_raw else "d'"
                         # No space for D' prefix
                         return f'{final_prefix}{surname}'
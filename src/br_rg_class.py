@@ -76,7 +76,14 @@ class BrazilianRG:
         'TO': 'SSP-TO',
     }
 
-    def __init__(self, state: str | None = 'SP', include_issuer: bool = False, include_state_prefix: bool = False, only_rg: bool = False):
+    def __init__(
+        self,
+        state: str | None = 'SP',
+        include_issuer: bool = False,
+        include_state_prefix: bool = False,
+        only_rg: bool = False,
+        rng: random.Random | None = None,
+    ):
         """
         Initialize the RG generator.
 
@@ -86,6 +93,7 @@ class BrazilianRG:
             include_state_prefix (bool): If True (for non-MG states), the state code will be prefixed.
                                          For MG, this flag is ignored in favor of a random decision.
             only_rg (bool): If True, the final output will be a string of 10 digits representing the RG number.
+            rng (random.Random | None): Random number source. Defaults to the global random module.
         Raises:
             ValueError: If the state code is not recognized.
         """
@@ -95,43 +103,67 @@ class BrazilianRG:
         self.include_issuer = include_issuer
         self.include_state_prefix = include_state_prefix
         self.only_rg = only_rg
+        self.rng = rng if rng is not None else random
 
     def _generate_from_pattern(self, pattern):
         """
         Generate a string by replacing each '#' in the pattern with a random digit (0-9).
         """
-        return ''.join(str(random.randint(0, 9)) if char == '#' else char for char in pattern)
+        return ''.join(str(self.rng.randint(0, 9)) if char == '#' else char for char in pattern)
 
-    def generate(self, state: str | None = None, include_issuer: bool = True, include_state_prefix: bool = False, only_rg: bool = False):
+    def generate(
+        self,
+        state: str | None = None,
+        include_issuer: bool | None = None,
+        include_state_prefix: bool | None = None,
+        only_rg: bool | None = None,
+    ):
         """
         Generate a complete, realistic RG number string according to the state-specific pattern.
 
         For Minas Gerais (MG), a random decision is made whether to include the state prefix.
         For other states, the include_state_prefix flag controls this behavior.
 
+        Parameters:
+            state (str | None): State code for this RG. Defaults to the state given at initialization.
+            include_issuer (bool | None): If True, the issuer's abbreviation is included. Defaults to the value given at initialization.
+            include_state_prefix (bool | None): If True (for non-MG states), the state code is prefixed.
+                                                Defaults to the value given at initialization.
+            only_rg (bool | None): If True, only the RG number is returned. Defaults to the value given at initialization.
+
         Returns:
             A string representing the final RG number, optionally prefixed with the issuer and/or state code.
+
+        Raises:
+            ValueError: If the state code is not recognized.
         """
-        pattern = BrazilianRG.STATE_PATTERNS[self.state]
+        state = state.upper().strip() if state else self.state
+        include_issuer = self.include_issuer if include_issuer is None else include_issuer
+        include_state_prefix = self.include_state_prefix if include_state_prefix is None else include_state_prefix
+        only_rg = self.only_rg if only_rg is None else only_rg
+        if state not in BrazilianRG.STATE_PATTERNS:
+            raise ValueError(f'Unknown or unsupported state code: {state}')
+
+        pattern = BrazilianRG.STATE_PATTERNS[state]
         rg_number = self._generate_from_pattern(pattern)
 
-        if self.only_rg:
+        if only_rg:
             return rg_number
 
         parts = []
         # Include issuer if required.
-        if self.include_issuer:
-            parts.append(BrazilianRG.ISSUERS[self.state])
+        if include_issuer:
+            parts.append(BrazilianRG.ISSUERS[state])
 
         # For MG, randomly decide to include the "MG" prefix (state code).
-        if self.state == 'MG':
+        if state == 'MG':
             # Randomly choose True or False
-            mg_prefix = random.choice([True, False])
+            mg_prefix = self.rng.choice([True, False])
             if mg_prefix:
                 parts.append('MG')
         else:
-            if self.include_state_prefix:
-                parts.append(self.state)
+            if include_state_prefix:
+                parts.append(state)
 
         parts.append(rg_number)
         return ' '.join(parts)
@@ -0,0 +1,154 @@
+"""
+Compiled Sampler Bundle
+
+Loading the samplers from their JSON sources means parsing several megabytes of
+JSON and rebuilding every weight list, alias table and index. A bundle stores
+the fully built location and name samplers in one pickle file so later runs
+restore them instead.
+
+Each bundle records the size, mtime and SHA-256 of the source files it was
+built from and is only used while they are unchanged. Bundles are named after
+their source paths, so differently configured runs never overwrite each
+other's bundle. Bundles are a local cache: only load bundles you built yourself.
+"""
+
+import gc
+import hashlib
+import os
+import pickle
+import random
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# Bump whenever the pickled sampler layout changes so old bundles are rebuilt
+BUNDLE_FORMAT_VERSION = 5
+
+DEFAULT_BUNDLE_DIR = '.cache/bundles'
+
+
+@dataclass(frozen=True)
+class SourceStamp:
+    """Identity of a source file when a bundle was built."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    sha256: str
+
+    @classmethod
+    def of(cls, path: str | Path) -> 'SourceStamp':
+        """Stamp a source file. A missing file gets size -1, so the bundle goes stale once it appears."""
+        path = Path(path).resolve()
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return cls(str(path), -1, 0, '')
+        return cls(str(path), stat.st_size, stat.st_mtime_ns, _sha256(path))
+
+    def is_current(self) -> bool:
+        """Return whether the file is unchanged; its content is only hashed if size or mtime moved."""
+        path = Path(self.path)
+        try:
+            stat = path.stat()
+        except OSError:
+            return self.size == -1
+        if stat.st_size != self.size:
+            return False
+        return stat.st_mtime_ns == self.mtime_ns or _sha256(path) == self.sha256
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open('rb') as f:
+        while block := f.read(1 << 20):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def bundle_path(sources: tuple[str | Path | None, ...], bundle_dir: str | Path = DEFAULT_BUNDLE_DIR) -> Path:
+    """Return the bundle file for a set of source files.
+
+    Args:
+        sources: Source file paths (None for an unused optional source), in a fixed order
+        bundle_dir: Directory holding the bundles
+
+    Returns:
+        Path of the bundle, named after the resolved source paths
+    """
+    key = '\n'.join(str(Path(source).resolve()) if source else '' for source in sources)
+    return Path(bundle_dir) / f'samplers-{hashlib.sha256(key.encode()).hexdigest()[:16]}.pickle'
+
+
+def _sampler_state(sampler: Any) -> dict[str, Any]:
+    # The RNG is chosen by whoever loads the bundle (and the random module can't be pickled)
+    return {key: value for key, value in vars(sampler).items() if key != 'rng'}
+
+
+def _restore_sampler(cls: type, state: dict[str, Any], rng: random.Random | None) -> Any:
+    sampler = cls.__new__(cls)
+    sampler.__dict__.update(state)
+    sampler.rng = rng if rng is not None else random
+    return sampler
+
+
+def write_bundle(path: str | Path, sources: tuple[str | Path | None, ...], *samplers: Any) -> Path:
+    """Write built samplers to a bundle, atomically replacing any previous one.
+
+    Args:
+        path: Bundle file (see bundle_path)
+        sources: Source files the samplers were built from
+        *samplers: Sampler instances to store
+
+    Returns:
+        The bundle path
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    bundle = {
+        'version': BUNDLE_FORMAT_VERSION,
+        'sources': [SourceStamp.of(source) if source else None for source in sources],
+        'samplers': [(type(sampler), _sampler_state(sampler)) for sampler in samplers],
+    }
+
+    # Write to a temporary file first so concurrent readers (e.g. sharded workers) never see a partial bundle
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(bundle, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return path
+
+
+def read_bundle(path: str | Path, rng: random.Random | None = None) -> list[Any] | None:
+    """Restore the samplers stored in a bundle.
+
+    Args:
+        path: Bundle file
+        rng: Random number source given to every restored sampler (defaults to the global random module)
+
+    Returns:
+        The samplers in the order they were written, or None if the bundle is missing,
+        unreadable, of another format version or built from sources that changed since
+    """
+    # Unpickling allocates a great many containers; keep the cyclic GC from scanning them over and over
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with Path(path).open('rb') as f:
+            bundle = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    if bundle.get('version') != BUNDLE_FORMAT_VERSION:
+        return None
+    if not all(stamp is None or stamp.is_current() for stamp in bundle['sources']):
+        return None
+    return [_restore_sampler(cls, state, rng) for cls, state in bundle['samplers']]
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 from datetime import timedelta, timezone
@@ -6,8 +7,19 @@ from typing import Any
 
 import typer
 from loguru import logger
+from ptbr_sampler.data_build import DEFAULT_CEPS_SOURCE, DEFAULT_LOCATIONS_SOURCE, DEFAULT_OUTPUT, build_location_data
 from ptbr_sampler.name_generator import NameComponents, TimePeriod
-from ptbr_sampler.sampler import sample as sampler_sample
+from ptbr_sampler.sampler import (
+    DEFAULT_BUNDLE_DIR,
+    DEFAULT_CEP_CACHE_ERROR_TTL,
+    DEFAULT_CEP_CACHE_PATH,
+    DEFAULT_CEP_CACHE_TTL,
+    DEFAULT_CHUNK_SIZE,
+    build_bundle,
+    iter_sample_chunks,
+    save_to_jsonl_file,
+)
+from ptbr_sampler.sharded_sampler import DEFAULT_SHARD_SIZE, iter_sharded_chunks, write_sharded_jsonl
 from rich.console import Console
 from rich.progress import BarColumn, Progress, SpinnerColumn, TaskProgressColumn, TextColumn
 from rich.table import Table
@@ -50,6 +62,17 @@ BATCH = typer.Option(
 EASY = typer.Option(
     None, '--easy', '-e', help='Easy mode with integer qty (enables API calls, all data, and auto-saves)', rich_help_panel='Basic Options'
 )
+WORKERS = typer.Option(1, '--workers', '-w', help='Number of worker processes generating samples in parallel', rich_help_panel='Basic Options')
+SEED = typer.Option(
+    None, '--seed', help='Base seed for reproducible output (same seed, same samples for any --workers)', rich_help_panel='Basic Options'
+)
+SHARD_FILES = typer.Option(
+    False,
+    '--shard-files',
+    '-shf',
+    help='With --workers, write each shard to its own JSONL file next to --save-to-jsonl instead of merging',
+    rich_help_panel='Basic Options',
+)
 
 # Location options
 CITY_ONLY = typer.Option(False, '--city-only', '-c', help='Return only city names', rich_help_panel='Location Options')
@@ -66,6 +89,41 @@ MAKE_API_CALL = typer.Option(
     help='Make API calls to retrieve real CEP data instead of generating synthetic address data',
     rich_help_panel='Location Options',
 )
+CEP_BACKEND = typer.Option(
+    'node',
+    '--cep-backend',
+    help="CEP lookup backend: 'node' (cep-promise worker processes), or 'brasilapi' / 'viacep' over pooled HTTP",
+    rich_help_panel='Location Options',
+)
+CEP_PIPELINE_DEPTH = typer.Option(
+    1,
+    '--cep-pipeline-depth',
+    min=1,
+    help='With an HTTP --cep-backend, requests pipelined on each connection before reading the responses',
+    rich_help_panel='Location Options',
+)
+PIPELINED = typer.Option(
+    False,
+    '--pipelined',
+    '-pl',
+    help='With --make-api-call, resolve CEPs while the next records are generated instead of after each batch',
+    rich_help_panel='Location Options',
+)
+CEP_CACHE = typer.Option(
+    DEFAULT_CEP_CACHE_PATH,
+    '--cep-cache',
+    help='SQLite file caching CEP API responses between runs (empty string disables the cache)',
+    rich_help_panel='Location Options',
+)
+CEP_CACHE_TTL = typer.Option(
+    DEFAULT_CEP_CACHE_TTL, '--cep-cache-ttl', help='Seconds a cached CEP response stays valid', rich_help_panel='Location Options'
+)
+CEP_CACHE_ERROR_TTL = typer.Option(
+    DEFAULT_CEP_CACHE_ERROR_TTL,
+    '--cep-cache-error-ttl',
+    help='Seconds a cached failed CEP lookup stays valid before it is retried',
+    rich_help_panel='Location Options',
+)
 
 # Name options
 TIME_PERIOD = typer.Option(
@@ -129,6 +187,18 @@ LOCATIONS_PATH = typer.Option(
     help='Path to the locations data JSON file',
     rich_help_panel='Data Source Options',
 )
+BUNDLE_DIR = typer.Option(
+    DEFAULT_BUNDLE_DIR,
+    '--bundle-dir',
+    help='Directory of compiled data bundles (see build-bundle); empty string always loads the JSON files',
+    rich_help_panel='Data Source Options',
+)
+
+# Data build options
+LOCATIONS_SOURCE = typer.Option(DEFAULT_LOCATIONS_SOURCE, '--locations-source', help='Cities/states population data JSON file')
+CEPS_SOURCE = typer.Option(DEFAULT_CEPS_SOURCE, '--ceps-source', help='Per-city CEP/DDD data JSON file; empty string skips the CEP join')
+DATA_OUTPUT = typer.Option(DEFAULT_OUTPUT, '--output', '-o', help='Normalized locations JSON file to write')
+BUILD_REPORT = typer.Option(None, '--report', help='Also write the build report to this JSON file')
 
 
 def _format_document_lines(doc: dict[str, str]) -> list[str]:
@@ -299,6 +369,12 @@ def sample(
     only_cep: bool = ONLY_CEP,
     cep_without_dash: bool = CEP_WITHOUT_DASH,
     make_api_call: bool = MAKE_API_CALL,
+    cep_backend: str = CEP_BACKEND,
+    cep_pipeline_depth: int = CEP_PIPELINE_DEPTH,
+    pipelined: bool = PIPELINED,
+    cep_cache: str = CEP_CACHE,
+    cep_cache_ttl: int = CEP_CACHE_TTL,
+    cep_cache_error_ttl: int = CEP_CACHE_ERROR_TTL,
     time_period: TimePeriod = TIME_PERIOD,
     return_only_name: bool = RETURN_ONLY_NAME,
     name_raw: bool = NAME_RAW,
@@ -326,11 +402,15 @@ def sample(
     only_document: bool = ONLY_DOCUMENT,
     surnames_path: Path = SURNAMES_PATH,
     locations_path: Path = LOCATIONS_PATH,
+    bundle_dir: str = BUNDLE_DIR,
     save_to_jsonl: str = SAVE_TO_JSONL,
     all_data: bool = ALL_DATA,
     batch: int = BATCH,
     easy: int = EASY,
     append_to_jsonl: bool = APPEND_TO_JSONL,
+    workers: int = WORKERS,
+    seed: int = SEED,
+    shard_files: bool = SHARD_FILES,
 ) -> None:
     """Generate random Brazilian samples with comprehensive information.
 
@@ -345,6 +425,13 @@ def sample(
         state_full_only: Return only full state names
         only_cep: Return only CEP
         cep_without_dash: Format CEP without dash
+        make_api_call: Make API calls to retrieve real CEP data
+        cep_backend: CEP lookup backend ('node', 'brasilapi' or 'viacep')
+        cep_pipeline_depth: Requests pipelined per connection by HTTP backends
+        pipelined: Overlap CEP lookups with record generation
+        cep_cache: SQLite file caching CEP API responses (empty string disables it)
+        cep_cache_ttl: Seconds a cached CEP response stays valid
+        cep_cache_error_ttl: Seconds a cached failed CEP lookup stays valid
         time_period: Time period for name sampling
         return_only_name: Return only names without location
         name_raw: Return names in raw format (all caps)
@@ -370,11 +457,15 @@ def sample(
         only_document: Return only documents
         surnames_path: Path to surnames data file
         locations_path: Path to locations data JSON file
+        bundle_dir: Directory of compiled data bundles (empty string disables them)
         save_to_jsonl: Path to save generated samples as JSONL
         all_data: Include all possible data in the generated samples
         batch: Maximum number of samples per batch before saving to file
         easy: Easy mode with integer qty (enables API calls, all data, and auto-saves)
         append_to_jsonl: Append to JSONL file instead of overwriting
+        workers: Number of worker processes generating samples in parallel
+        seed: Base seed for reproducible output
+        shard_files: Write each shard to its own JSONL file instead of merging them
 
     Raises:
         typer.Exit: If an error occurs during execution
@@ -435,264 +526,250 @@ def sample(
                 console.print(f'  [cyan]•[/cyan] {item}')
             console.print()
 
-        # Process in batches or as a single run
-        all_results = []
+        # Stream the samples chunk by chunk so memory stays bounded regardless of qty
+        if use_batches:
+            chunk_size = batch_size
+        else:
+            chunk_size = DEFAULT_SHARD_SIZE if workers > 1 or seed is not None else DEFAULT_CHUNK_SIZE
+        total_batches = (qty + chunk_size - 1) // chunk_size
+        options = {
+            'city_only': city_only,
+            'state_abbr_only': state_abbr_only,
+            'state_full_only': state_full_only,
+            'only_cep': only_cep,
+            'cep_without_dash': cep_without_dash,
+            'make_api_call': make_api_call,
+            'time_period': time_period,
+            'return_only_name': return_only_name,
+            'name_raw': name_raw,
+            'json_path': json_path,
+            'names_path': names_path,
+            'middle_names_path': middle_names_path,
+            'only_surname': only_surname,
+            'top_40': top_40,
+            'with_only_one_surname': with_only_one_surname,
+            'always_middle': always_middle,
+            'only_middle': only_middle,
+            'always_cpf': always_cpf,
+            'always_pis': always_pis,
+            'always_cnpj': always_cnpj,
+            'always_cei': always_cei,
+            'always_rg': always_rg,
+            'always_phone': always_phone,
+            'only_cpf': only_cpf,
+            'only_pis': only_pis,
+            'only_cnpj': only_cnpj,
+            'only_cei': only_cei,
+            'only_rg': only_rg,
+            'only_fone': only_fone,
+            'include_issuer': include_issuer,
+            'only_document': only_document,
+            'surnames_path': surnames_path,
+            'locations_path': locations_path,
+            'all_data': all_data,
+            'bundle_dir': bundle_dir or None,
+            'cep_cache_path': cep_cache or None,
+            'cep_cache_ttl': cep_cache_ttl,
+            'cep_cache_error_ttl': cep_cache_error_ttl,
+            'cep_backend': cep_backend,
+            'cep_pipeline_depth': cep_pipeline_depth,
+            'pipelined': pipelined,
+        }
 
         if use_batches:
-            # Use batched processing with progress display
             logger.info(f'Starting batch processing of {qty} samples')
-            with Progress(
-                SpinnerColumn(),
-                TextColumn('[bold blue]{task.description}'),
-                BarColumn(complete_style='green', finished_style='green'),
-                TaskProgressColumn(),
-                TextColumn('{task.fields[status]}'),
-                console=console,
-            ) as progress:
-                main_task = progress.add_task('[green]Generating samples...', total=qty, status='')
-                api_task = None
-                if make_api_call:
-                    api_task = progress.add_task('[yellow]API calls...', visible=False, total=1.0, status='')
+        else:
+            logger.info(f'Starting standard (non-batched) processing of {qty} samples')
+
+        with Progress(
+            SpinnerColumn(),
+            TextColumn('[bold blue]{task.description}'),
+            BarColumn(complete_style='green', finished_style='green'),
+            TaskProgressColumn(),
+            TextColumn('{task.fields[status]}'),
+            console=console,
+        ) as progress:
+            main_task = progress.add_task('[green]Generating samples...', total=qty, status='')
+
+            # Create a task for API calls if make_api_call is true
+            api_task = None
+            if make_api_call:
+                api_task = progress.add_task('[yellow]API calls...', visible=False, total=1.0, status='')
+            batch_task = None
+            if use_batches:
                 batch_task = progress.add_task('[cyan]Batch progress...', total=batch_size, visible=False, status='')
 
-                # Keep track of total progress across batches
-                samples_completed = 0
-
-                # Process each batch
-                first_batch = True
-                while samples_completed < qty:
-                    # Calculate batch size for this iteration
-                    current_batch_size = min(batch_size, qty - samples_completed)
-                    batch_num = samples_completed // batch_size + 1
-                    total_batches = (qty + batch_size - 1) // batch_size
-
-                    logger.info(f'Processing batch {batch_num}/{total_batches} with {current_batch_size} samples')
-
-                    # Update progress displays
-                    progress.update(
-                        batch_task,
-                        description=f'[cyan]Batch {batch_num}/{total_batches}...',
-                        total=current_batch_size,
-                        completed=0,
-                        visible=True,
+            # Keep track of total progress across batches
+            samples_completed = 0
+            batch_num = 1
+
+            def progress_callback(completed: int, stage: str = None) -> None:
+                # Log significant progress stages
+                if stage and completed % max(1, qty // 10) == 0:
+                    logger.debug(f'Progress: {completed}/{qty} samples - {stage}')
+                if stage and stage.startswith('CEP cache'):
+                    logger.info(stage)
+
+                # Update the main task
+                status = f'{stage or ""} (Batch {batch_num})' if use_batches else stage or ''
+                progress.update(main_task, completed=min(completed, qty), status=f'[dim cyan]{status}[/]')
+
+                # Update batch progress
+                if batch_task is not None:
+                    progress.update(batch_task, completed=min(completed - samples_completed, batch_size))
+
+                # Update API task if relevant
+                if api_task is not None and stage and 'API' in stage:
+                    progress.update(api_task, visible=True)
+                    if 'starting' in stage.lower():
+                        logger.info(f'API calls starting for batch {batch_num}')
+                        progress.update(api_task, completed=0.2, status='[yellow]Connecting...[/]')
+                    elif 'processing' in stage.lower():
+                        logger.info(f'Processing API responses for batch {batch_num}')
+                        progress.update(api_task, completed=0.6, status='[yellow]Processing...[/]')
+                    elif 'completed' in stage.lower():
+                        logger.info(f'API calls completed for batch {batch_num}')
+                        progress.update(api_task, completed=1.0, status='[green]Done[/]')
+
+            if batch_task is not None:
+                progress.update(batch_task, description=f'[cyan]Batch 1/{total_batches}...', visible=True)
+
+            try:
+                if workers > 1:
+                    logger.info(f'Generating {qty} samples with {workers} worker processes')
+                if shard_files and save_to_jsonl:
+                    shard_paths = write_sharded_jsonl(
+                        save_to_jsonl, qty, workers, seed, shard_size=chunk_size, progress_callback=progress_callback, **options
                     )
-
-                    # Create a progress callback that updates both total and batch progress
-                    def progress_callback(completed: int, stage: str = None) -> None:
-                        # Calculate total progress
-                        total_completed = min(samples_completed + completed, qty)
-
-                        # Log significant progress stages
-                        if stage and completed % max(1, current_batch_size // 5) == 0:
-                            logger.debug(f'Batch {batch_num}: {completed}/{current_batch_size} samples - {stage}')
-
-                        # Update total progress
+                    logger.info(f'{len(shard_paths)} shard files written next to {save_to_jsonl}')
+                    save_to_jsonl = str(Path(save_to_jsonl).with_name(f'{Path(save_to_jsonl).stem}-*.jsonl'))
+                    chunks = []
+                elif workers > 1 or seed is not None:
+                    chunks = iter_sharded_chunks(qty, workers, seed, shard_size=chunk_size, progress_callback=progress_callback, **options)
+                else:
+                    chunks = iter_sample_chunks(qty, chunk_size, progress_callback, **options)
+
+                for chunk in chunks:
+                    # Save this chunk right away; force append for every chunk after the first
+                    if save_to_jsonl:
+                        asyncio.run(save_to_jsonl_file(chunk, save_to_jsonl, append=append_to_jsonl or samples_completed > 0))
+
+                    samples_completed += len(chunk)
+
+                    if batch_task is not None:
+                        logger.info(f'Batch {batch_num}/{total_batches} saved to {save_to_jsonl}')
+                        batch_num += 1
+                        next_size = min(batch_size, qty - samples_completed)
                         progress.update(
-                            main_task,
-                            completed=total_completed,
-                            status=f'[dim cyan]{stage or ""} (Batch {batch_num})[/]',
+                            batch_task,
+                            description=f'[cyan]Batch {batch_num}/{total_batches}...',
+                            total=max(next_size, 1),
+                            completed=0,
+                            status=f'[green]Completed - Saved to {save_to_jsonl}[/]',
                         )
+                logger.info(f'All {qty} samples processed successfully')
+            except Exception as e:
+                logger.error(f'Error processing samples: {e}')
+                raise
+
+            # Ensure progress is complete
+            progress.update(main_task, completed=qty, status='[bold green]Completed![/]')
+            if batch_task is not None:
+                progress.update(batch_task, visible=False)
+            if api_task is not None:
+                progress.update(api_task, visible=False)
 
-                        # Update batch progress
-                        progress.update(batch_task, completed=min(completed, current_batch_size))
-
-                        # Update API task if relevant
-                        if api_task and stage:
-                            if 'API' in stage:
-                                progress.update(api_task, visible=True)
-                                if 'starting' in stage.lower():
-                                    logger.info(f'API calls starting for batch {batch_num}')
-                                    progress.update(api_task, completed=0.2, status='[yellow]Connecting...[/]')
-                                elif 'processing' in stage.lower():
-                                    logger.info(f'Processing API responses for batch {batch_num}')
-                                    progress.update(api_task, completed=0.6, status='[yellow]Processing...[/]')
-                                elif 'completed' in stage.lower():
-                                    logger.info(f'API calls completed for batch {batch_num}')
-                                    progress.update(api_task, completed=1.0, status='[green]Done[/]')
-
-                    # Process the current batch
-                    try:
-                        batch_results = sampler_sample(
-                            qty=current_batch_size,
-                            q=None,
-                            city_only=city_only,
-                            state_abbr_only=state_abbr_only,
-                            state_full_only=state_full_only,
-                            only_cep=only_cep,
-                            cep_without_dash=cep_without_dash,
-                            make_api_call=make_api_call,
-                            time_period=time_period,
-                            return_only_name=return_only_name,
-                            name_raw=name_raw,
-                            json_path=json_path,
-                            names_path=names_path,
-                            middle_names_path=middle_names_path,
-                            only_surname=only_surname,
-                            top_40=top_40,
-                            with_only_one_surname=with_only_one_surname,
-                            always_middle=always_middle,
-                            only_middle=only_middle,
-                            always_cpf=always_cpf,
-                            always_pis=always_pis,
-                            always_cnpj=always_cnpj,
-                            always_cei=always_cei,
-                            always_rg=always_rg,
-                            always_phone=always_phone,
-                            only_cpf=only_cpf,
-                            only_pis=only_pis,
-                            only_cnpj=only_cnpj,
-                            only_cei=only_cei,
-                            only_rg=only_rg,
-                            only_fone=only_fone,
-                            include_issuer=include_issuer,
-                            only_document=only_document,
-                            surnames_path=surnames_path,
-                            locations_path=locations_path,
-                            save_to_jsonl=save_to_jsonl,
-                            all_data=all_data,
-                            progress_callback=progress_callback,
-                            append_to_jsonl=(append_to_jsonl or not first_batch),  # Force append for all batches after the first
-                        )
-                        logger.info(f'Batch {batch_num} processed successfully')
-                    except Exception as e:
-                        logger.error(f'Error processing batch {batch_num}: {e}')
-                        raise
+        # Show completion message
+        if use_batches:
+            logger.info(f'All {total_batches} batches completed successfully. Total samples: {qty}')
+            console.print(f'\n[bold green]✓[/] {qty} samples generated successfully in {total_batches} batches!')
+        else:
+            logger.info(f'Sample generation completed. Total samples: {qty}')
+            console.print('\n[bold green]✓[/] Sample generation completed successfully!')
+        if save_to_jsonl:
+            console.print(f'[bold green]✓[/] Results saved to [cyan]{save_to_jsonl}[/]')
+            logger.info(f'Results saved to {save_to_jsonl}')
+    except Exception as e:
+        logger.error(f'Error in sample generation: {e}')
+        console.print(f'[red]Error: {e!s}[/red]')
+        raise typer.Exit(code=1) from e
 
-                    # Force append mode after the first batch
-                    first_batch = False
 
-                    # Save this batch's results
-                    if isinstance(batch_results, list):
-                        all_results.extend(batch_results)
-                    else:
-                        all_results.append(batch_results)
+@app.command('build-bundle')
+def build_bundle_command(
+    json_path: Path = JSON_PATH,
+    names_path: Path = NAMES_PATH,
+    middle_names_path: Path = MIDDLE_NAMES_PATH,
+    surnames_path: Path = SURNAMES_PATH,
+    locations_path: Path = LOCATIONS_PATH,
+    bundle_dir: str = BUNDLE_DIR,
+) -> None:
+    """Compile the data files into a bundle so later runs start without parsing them.
 
-                    # Update completed count
-                    samples_completed += current_batch_size
+    The bundle is used by every run with the same data files and rebuilt
+    automatically when one of them changes.
 
-                    # Mark the batch as completed
-                    progress.update(batch_task, completed=current_batch_size, status=f'[green]Completed - Saved to {save_to_jsonl}[/]')
+    Args:
+        json_path: Path to the cities and CEPs data JSON file
+        names_path: Path to the first names data JSON file
+        middle_names_path: Path to the middle names JSON file
+        surnames_path: Path to the surnames JSON file
+        locations_path: Path to the locations data JSON file
+        bundle_dir: Directory to write the bundle to
+    """
+    try:
+        path = build_bundle(json_path, names_path, middle_names_path, surnames_path, locations_path, bundle_dir or DEFAULT_BUNDLE_DIR)
+    except Exception as e:
+        logger.error(f'Error building bundle: {e}')
+        console.print(f'[red]Error: {e!s}[/red]')
+        raise typer.Exit(code=1) from e
+    logger.info(f'Bundle written to {path}')
+    console.print(f'[bold green]✓[/] Bundle written to [cyan]{path}[/]')
 
-                    logger.info(f'Batch {batch_num} saved to {save_to_jsonl}')
 
-                # All batches are complete
-                progress.update(main_task, completed=qty, status='[bold green]All batches completed![/]')
-                progress.update(batch_task, visible=False)
-                if api_task:
-                    progress.update(api_task, visible=False)
+@app.command('build-data')
+def build_data_command(
+    locations_source: Path = LOCATIONS_SOURCE,
+    ceps_source: str = CEPS_SOURCE,
+    output: Path = DATA_OUTPUT,
+    report: Path | None = BUILD_REPORT,
+) -> None:
+    """Rebuild the normalized locations file from its source data.
 
-                # Show completion message
-                total_batches = (qty + batch_size - 1) // batch_size
-                logger.info(f'All {total_batches} batches completed successfully. Total samples: {qty}')
-                console.print(f'\n[bold green]✓[/] {qty} samples generated successfully in {total_batches} batches!')
-                if save_to_jsonl:
-                    console.print(f'[bold green]✓[/] All results saved to [cyan]{save_to_jsonl}[/]')
+    Joins the per-city CEP data onto the cities (by IBGE code, else by city
+    name and state) and recomputes the city and state population percentages.
 
-        else:
-            # Standard processing (non-batched) with progress display for larger quantities
-            logger.info(f'Starting standard (non-batched) processing of {qty} samples')
-            with Progress(
-                SpinnerColumn(),
-                TextColumn('[bold blue]{task.description}'),
-                BarColumn(complete_style='green', finished_style='green'),
-                TaskProgressColumn(),
-                TextColumn('{task.fields[status]}'),
-                console=console,
-            ) as progress:
-                main_task = progress.add_task('[green]Generating samples...', total=qty, status='')
-
-                # Create a task for API calls if make_api_call is true
-                api_task = None
-                if make_api_call:
-                    api_task = progress.add_task('[yellow]API calls...', visible=False, total=1.0, status='')
-
-                # Call the sample function with progress updates
-                def progress_callback(completed: int, stage: str = None) -> None:
-                    # Log significant progress stages
-                    if stage and completed % max(1, qty // 10) == 0:
-                        logger.debug(f'Progress: {completed}/{qty} samples - {stage}')
-
-                    # Update the main task
-                    progress.update(main_task, completed=completed, status=f'[dim cyan]{stage or ""}[/]')
-
-                    # Update API task if relevant
-                    if api_task and stage:
-                        if 'API' in stage:
-                            progress.update(api_task, visible=True)
-                            if 'starting' in stage.lower():
-                                logger.info('API calls starting')
-                                progress.update(api_task, completed=0.2, status='[yellow]Connecting...[/]')
-                            elif 'processing' in stage.lower():
-                                logger.info('Processing API responses')
-                                progress.update(api_task, completed=0.6, status='[yellow]Processing...[/]')
-                            elif 'completed' in stage.lower():
-                                logger.info('API calls completed')
-                                progress.update(api_task, completed=1.0, status='[green]Done[/]')
-
-                # Call the sample function from the sampler module with all parameters
-                try:
-                    all_results = sampler_sample(
-                        qty=qty,
-                        q=None,  # We don't use this alias in the CLI
-                        city_only=city_only,
-                        state_abbr_only=state_abbr_only,
-                        state_full_only=state_full_only,
-                        only_cep=only_cep,
-                        cep_without_dash=cep_without_dash,
-                        make_api_call=make_api_call,
-                        time_period=time_period,
-                        return_only_name=return_only_name,
-                        name_raw=name_raw,
-                        json_path=json_path,
-                        names_path=names_path,
-                        middle_names_path=middle_names_path,
-                        only_surname=only_surname,
-                        top_40=top_40,
-                        with_only_one_surname=with_only_one_surname,
-                        always_middle=always_middle,
-                        only_middle=only_middle,
-                        always_cpf=always_cpf,
-                        always_pis=always_pis,
-                        always_cnpj=always_cnpj,
-                        always_cei=always_cei,
-                        always_rg=always_rg,
-                        always_phone=always_phone,
-                        only_cpf=only_cpf,
-                        only_pis=only_pis,
-                        only_cnpj=only_cnpj,
-                        only_cei=only_cei,
-                        only_rg=only_rg,
-                        only_fone=only_fone,
-                        include_issuer=include_issuer,
-                        only_document=only_document,
-                        surnames_path=surnames_path,
-                        locations_path=locations_path,
-                        save_to_jsonl=save_to_jsonl,
-                        all_data=all_data,
-                        progress_callback=progress_callback,
-                        append_to_jsonl=append_to_jsonl,
-                    )
-                    logger.info(f'All {qty} samples processed successfully')
-                except Exception as e:
-                    logger.error(f'Error processing samples: {e}')
-                    raise
-
-                # Ensure progress is complete
-                progress.update(main_task, completed=qty, status='[bold green]Completed![/]')
-                if api_task:
-                    progress.update(api_task, visible=False)
-
-                # Show completion message
-                logger.info(f'Sample generation completed. Total samples: {qty}')
-                console.print('\n[bold green]✓[/] Sample generation completed successfully!')
-                if save_to_jsonl:
-                    console.print(f'[bold green]✓[/] Results saved to [cyan]{save_to_jsonl}[/]')
-                    logger.info(f'Results saved to {save_to_jsonl}')
+    Args:
+        locations_source: Cities/states population data JSON file
+        ceps_source: Per-city CEP/DDD data JSON file, or empty to skip the join
+        output: Normalized locations JSON file to write
+        report: Optional JSON file for the build report
+    """
+    try:
+        result = build_location_data(locations_source, ceps_source or None, output, report)
     except Exception as e:
-        logger.error(f'Error in sample generation: {e}')
+        logger.error(f'Error building location data: {e}')
         console.print(f'[red]Error: {e!s}[/red]')
         raise typer.Exit(code=1) from e
 
+    table = Table(title='Location data build', show_header=False)
+    table.add_row('Cities', str(result.cities))
+    table.add_row('Matched by IBGE code', str(result.matched_by_ibge_code))
+    table.add_row('Matched by name and state', str(result.matched_by_name))
+    table.add_row('Without CEP data', str(len(result.unmatched)))
+    table.add_row('Unused CEP data entries', str(result.unused_cep_entries))
+    table.add_row('States', str(result.states))
+    table.add_row('Total population', f'{result.total_population:,}')
+    table.add_row('Sum of state / city percentages', f'{result.state_percentage_sum:.6f} / {result.city_percentage_sum:.6f}')
+    table.add_row('Time', f'{result.seconds:.3f}s')
+    console.print(table)
+    if result.states_without_cities:
+        console.print(f'[yellow]States without cities: {", ".join(result.states_without_cities)}[/]')
+    if result.cities_without_uf:
+        console.print(f'[yellow]Cities without a UF (left out): {", ".join(result.cities_without_uf)}[/]')
+    logger.info(f'Location data written to {output}')
+    console.print(f'[bold green]✓[/] Location data written to [cyan]{output}[/]')
+
 
 def main() -> None:
     """Entry point for the CLI application.
@@ -0,0 +1,201 @@
+"""
+Location Data Build
+
+Builds the normalized locations file the samplers load from the raw sources:
+the cities/states population data (locations_data.json) and the per-city CEP,
+DDD and alternative-name data (cities_with_ceps.json).
+
+The CEP data is joined onto the cities through hash indexes on the IBGE code
+(uf_code + city_code) and on (city_name, city_uf), so every city is matched in
+a single pass. Population percentages of cities (nationwide and within their
+state) and of states are then recomputed from the city populations.
+"""
+
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+DEFAULT_LOCATIONS_SOURCE = 'src/data/locations_data.json'
+DEFAULT_CEPS_SOURCE = 'src/data/cities_with_ceps.json'
+DEFAULT_OUTPUT = 'src/data/locations_data_normalized.json'
+
+# Fields copied from the matching cities_with_ceps.json entry
+JOINED_FIELDS = ('ddd', 'ceps', 'aka')
+
+
+@dataclass
+class BuildReport:
+    """Summary of a location data build."""
+
+    cities: int = 0
+    states: int = 0
+    matched_by_ibge_code: int = 0
+    matched_by_name: int = 0
+    unmatched: list[str] = field(default_factory=list)
+    unused_cep_entries: int = 0
+    total_population: int = 0
+    states_without_cities: list[str] = field(default_factory=list)
+    cities_without_uf: list[str] = field(default_factory=list)
+    state_percentage_sum: float = 0.0
+    city_percentage_sum: float = 0.0
+    seconds: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _ibge_code(city_data: dict) -> str:
+    return f'{city_data.get("uf_code", "")}{city_data.get("city_code", "")}' if city_data.get('city_code') else ''
+
+
+def join_cep_data(cities: dict[str, dict], cep_cities: dict[str, dict]) -> BuildReport:
+    """Copy the CEP data fields onto the matching cities, in place.
+
+    Each city is matched by IBGE code when both sides have one, else by (city_name, city_uf).
+
+    Args:
+        cities: Locations 'cities' table; a city without city_name is named after its key
+        cep_cities: cities_with_ceps.json entries, each with city_name and city_uf
+
+    Returns:
+        BuildReport with the match counts filled in
+    """
+    by_ibge_code: dict[str, str] = {}
+    by_name: dict[tuple[str, str], str] = {}
+    for key, cep_city in cep_cities.items():
+        if ibge_code := _ibge_code(cep_city):
+            by_ibge_code.setdefault(ibge_code, key)
+        by_name.setdefault((cep_city.get('city_name', key), cep_city.get('city_uf')), key)
+
+    report = BuildReport(cities=len(cities))
+    used = set()
+    for key, city_data in cities.items():
+        city_data.setdefault('city_name', key)
+        match = by_ibge_code.get(_ibge_code(city_data))
+        if match is not None:
+            report.matched_by_ibge_code += 1
+        else:
+            match = by_name.get((city_data['city_name'], city_data.get('city_uf')))
+            if match is None:
+                report.unmatched.append(f'{city_data["city_name"]} ({city_data.get("city_uf", "")})')
+                continue
+            report.matched_by_name += 1
+
+        used.add(match)
+        cep_city = cep_cities[match]
+        for name in JOINED_FIELDS:
+            if name in cep_city:
+                city_data[name] = cep_city[name]
+
+    report.unused_cep_entries = len(cep_cities) - len(used)
+    return report
+
+
+def normalize_percentages(data: dict, report: BuildReport | None = None) -> BuildReport:
+    """Recompute the city and state population percentages from the city populations, in place.
+
+    Sets population_percentage_total and population_percentage_state on every city with a
+    population, and state_population and population_percentage on every state with cities.
+    Cities without a population get zero percentages, so the samplers never draw them.
+    Cities without a UF can't be sampled at all: they are removed and listed in the report.
+
+    Args:
+        data: Locations data with 'cities' and 'states' tables
+        report: Report to fill in (a new one by default)
+
+    Returns:
+        The report with the population totals and percentage sums filled in
+    """
+    report = report if report is not None else BuildReport(cities=len(data['cities']))
+    for key in [key for key, city in data['cities'].items() if not city.get('city_uf')]:
+        report.cities_without_uf.append(data['cities'].pop(key).get('city_name', key))
+
+    cities = []
+    for city in data['cities'].values():
+        if (city.get('city_population') or 0) > 0:
+            cities.append(city)
+        else:
+            city['population_percentage_total'] = 0.0
+            city['population_percentage_state'] = 0.0
+
+    state_populations: dict[str, int] = {}
+    for city in cities:
+        state_populations[city['city_uf']] = state_populations.get(city['city_uf'], 0) + city['city_population']
+    total_population = sum(state_populations.values())
+
+    city_percentage_sum = 0.0
+    for city in cities:
+        city['population_percentage_total'] = city['city_population'] / total_population
+        city['population_percentage_state'] = city['city_population'] / state_populations[city['city_uf']]
+        city_percentage_sum += city['population_percentage_total']
+
+        # The samplers read CEP ranges from cep_range_begins/cep_range_ends
+        if 'cep_starts' in city and 'cep_range_begins' not in city:
+            city['cep_range_begins'] = city['cep_starts']
+            city['cep_range_ends'] = city['cep_ends']
+
+    state_percentage_sum = 0.0
+    for state_name, state_data in data['states'].items():
+        state_population = state_populations.get(state_data['state_abbr'])
+        if not state_population:
+            report.states_without_cities.append(state_name)
+            continue
+        state_data['state_population'] = state_population
+        state_data['population_percentage'] = state_population / total_population
+        state_percentage_sum += state_data['population_percentage']
+
+    report.states = len(data['states'])
+    report.total_population = total_population
+    report.state_percentage_sum = state_percentage_sum
+    report.city_percentage_sum = city_percentage_sum
+    return report
+
+
+def build_location_data(
+    locations_path: str | Path = DEFAULT_LOCATIONS_SOURCE,
+    ceps_path: str | Path | None = DEFAULT_CEPS_SOURCE,
+    output_path: str | Path = DEFAULT_OUTPUT,
+    report_path: str | Path | None = None,
+) -> BuildReport:
+    """Build the normalized locations file from its sources.
+
+    Args:
+        locations_path: Cities/states population data
+        ceps_path: Per-city CEP data (a {'cities': {...}} file or the cities table itself), or None to skip the join
+        output_path: Normalized locations file to write
+        report_path: Optional JSON file to write the build report to
+
+    Returns:
+        The build report
+
+    Raises:
+        ValueError: If the locations data has no 'cities' or 'states' table
+    """
+    start = time.perf_counter()
+    with Path(locations_path).open(encoding='utf-8') as f:
+        data = json.load(f)
+    if not data.get('cities') or not data.get('states'):
+        raise ValueError(f"Missing 'cities' or 'states' data in {locations_path}")
+
+    if ceps_path is not None:
+        with Path(ceps_path).open(encoding='utf-8') as f:
+            cep_data = json.load(f)
+        report = join_cep_data(data['cities'], cep_data.get('cities', cep_data))
+    else:
+        report = BuildReport(cities=len(data['cities']))
+        for key, city_data in data['cities'].items():
+            city_data.setdefault('city_name', key)
+    normalize_percentages(data, report)
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with output_path.open('w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+    report.seconds = time.perf_counter() - start
+    if report_path is not None:
+        with Path(report_path).open('w', encoding='utf-8') as f:
+            json.dump(report.to_dict(), f, ensure_ascii=False, indent=2)
+    return report
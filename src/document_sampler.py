@@ -1,18 +1,26 @@
 """Brazilian document number generator using utility functions."""
 
+import random
+
 from src.br_rg_class import BrazilianRG
 from src.utils.cei import random_cei
 from src.utils.cnpj import random_cnpj
-from src.utils.cpf import random_cpf
+from src.utils.cpf import random_cpf, random_cpfs
 from src.utils.pis import random_pis
 
 
 class DocumentSampler:
     """Class for generating various Brazilian documents."""
 
-    def __init__(self, only_rg: bool = False):
-        """Initialize the document sampler."""
-        self.rg_generator = BrazilianRG(only_rg=only_rg)
+    def __init__(self, only_rg: bool = False, rng: random.Random | None = None):
+        """Initialize the document sampler.
+
+        Args:
+            only_rg: If True, RGs are generated without issuer or state prefix
+            rng: Random number source shared by every generator (defaults to the global random module)
+        """
+        self.rng = rng if rng is not None else random
+        self.rg_generator = BrazilianRG(only_rg=only_rg, rng=self.rng)
 
     def generate_cpf(self, formatted: bool = True) -> str:
         """Generate a valid CPF number.
@@ -20,7 +28,16 @@ class DocumentSampler:
         Args:
             formatted: If True, returns CPF in XXX.XXX.XXX-XX format
         """
-        return random_cpf(formatted=formatted)
+        return random_cpf(formatted=formatted, rng=self.rng)
+
+    def generate_cpfs(self, n: int, formatted: bool = True) -> list[str]:
+        """Generate n valid CPF numbers at once.
+
+        Args:
+            n: Number of CPFs to generate
+            formatted: If True, returns CPFs in XXX.XXX.XXX-XX format
+        """
+        return random_cpfs(n, formatted=formatted, rng=self.rng)
 
     def generate_pis(self, formatted: bool = True) -> str:
         """Generate a valid PIS number.
@@ -28,7 +45,7 @@ class DocumentSampler:
         Args:
             formatted: If True, returns PIS in XXX.XXXXX.XX-X format
         """
-        return random_pis(formatted=formatted)
+        return random_pis(formatted=formatted, rng=self.rng)
 
     def generate_cnpj(self, formatted: bool = True) -> str:
         """Generate a valid CNPJ number.
@@ -36,7 +53,7 @@ class DocumentSampler:
         Args:
             formatted: If True, returns CNPJ in XX.XXX.XXX/XXXX-XX format
         """
-        return random_cnpj(formatted=formatted)
+        return random_cnpj(formatted=formatted, rng=self.rng)
 
     def generate_cei(self, formatted: bool = True) -> str:
         """Generate a valid CEI number.
@@ -44,14 +61,14 @@ class DocumentSampler:
         Args:
             formatted: If True, returns CEI in XX.XXX.XXXXX/XX format
         """
-        return random_cei(formatted=formatted)
+        return random_cei(formatted=formatted, rng=self.rng)
 
-    def generate_rg(self, state: str | None = None, include_issuer: bool = True, only_rg: bool = False) -> str:
+    def generate_rg(self, state: str | None = None, include_issuer: bool = True, only_rg: bool | None = None) -> str:
         """Generate a valid RG number for the given state.
 
         Args:
             state: Two-letter state abbreviation (e.g., 'SP', 'RJ')
             formatted: If True, returns RG in XX.XXX.XXX-X format
-            only_rg: If True, returns only the RG number
+            only_rg: If True, returns only the RG number (defaults to the only_rg given at initialization)
         """
         return self.rg_generator.generate(state=state, include_issuer=include_issuer, only_rg=only_rg)
@@ -6,17 +6,28 @@ Core functionality for generating Brazilian name, location, and document samples
 
 import asyncio
 import json
+import random
+import threading
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterator
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import aiofiles
 
+from src.bundle import DEFAULT_BUNDLE_DIR, bundle_path, read_bundle, write_bundle
 from src.utils.address_for_offline import AddressProvider_for_offline
+from src.utils.cep_cache import DEFAULT_CEP_CACHE_ERROR_TTL, DEFAULT_CEP_CACHE_PATH, DEFAULT_CEP_CACHE_TTL, CepCache
+from src.utils.cep_index import CepIndex
 from src.utils.phone import generate_phone_number
 
 from .br_location_class import BrazilianLocationSampler
 from .br_name_class import BrazilianNameSampler, NameComponents, TimePeriod
 from .document_sampler import DocumentSampler
 
+if TYPE_CHECKING:
+    from src.utils.cep_wrapper import CepBackend
+
 
 def parse_result(
     location: str,
@@ -93,6 +104,43 @@ def parse_result(
     return result
 
 
+def _selected_documents(cpf: bool, pis: bool, cnpj: bool, cei: bool, rg: bool, phone: bool) -> tuple[str, ...]:
+    """Return the document kinds enabled by the given flags, in output order."""
+    flags = {'cpf': cpf, 'pis': pis, 'cnpj': cnpj, 'cei': cei, 'rg': rg, 'phone': phone}
+    return tuple(kind for kind, enabled in flags.items() if enabled)
+
+
+def generate_documents(
+    doc_sampler: DocumentSampler, kinds: tuple[str, ...], state_abbr: str, ddd: str | None, include_issuer: bool
+) -> dict[str, str]:
+    """Generate the requested documents for a row located in the given state.
+
+    Args:
+        doc_sampler: Document sampler instance
+        kinds: Document kinds to generate ('cpf', 'pis', 'cnpj', 'cei', 'rg', 'phone')
+        state_abbr: State abbreviation of the row, used for the RG issuer
+        ddd: Area code of the row's city, used for the phone number
+        include_issuer: Include issuing state in RG
+
+    Returns:
+        Dictionary of document numbers
+    """
+    documents = {}
+    if 'cpf' in kinds:
+        documents['cpf'] = doc_sampler.generate_cpf()
+    if 'pis' in kinds:
+        documents['pis'] = doc_sampler.generate_pis()
+    if 'cnpj' in kinds:
+        documents['cnpj'] = doc_sampler.generate_cnpj()
+    if 'cei' in kinds:
+        documents['cei'] = doc_sampler.generate_cei()
+    if 'rg' in kinds:
+        documents['rg'] = f'{doc_sampler.generate_rg(state_abbr, include_issuer)}'
+    if 'phone' in kinds:
+        documents['phone'] = generate_phone_number(ddd, rng=doc_sampler.rng)
+    return documents
+
+
 async def save_to_jsonl_file(data: list[dict], filename: str, append: bool = True) -> None:
     """Save generated samples to a JSONL file asynchronously.
 
@@ -112,7 +160,17 @@ async def save_to_jsonl_file(data: list[dict], filename: str, append: bool = Tru
             await f.write(json.dumps(item, ensure_ascii=False) + '\n')
 
 
-async def get_address_data_batch(ceps: list[str], make_api_call: bool = False, progress_callback: callable = None) -> list[dict]:
+async def get_address_data_batch(
+    ceps: list[str],
+    make_api_call: bool = False,
+    progress_callback: Callable[[int, str], None] | None = None,
+    rng: random.Random | None = None,
+    cep_cache: CepCache | None = None,
+    cep_backend: str = 'node',
+    cep_pool: 'CepBackend | None' = None,
+    cep_index: CepIndex | None = None,
+    cep_pipeline_depth: int = 1,
+) -> list[dict]:
     """
     Get address data for multiple CEPs, either from API or generated.
 
@@ -120,6 +178,13 @@ async def get_address_data_batch(ceps: list[str], make_api_call: bool = False, p
         ceps: List of CEPs to get address data for
         make_api_call: Whether to make API calls or generate data
         progress_callback: Optional callback function to report progress
+        rng: Random number source for generated address data (defaults to the global random module)
+        cep_cache: Optional persistent cache answering repeated CEPs without an API call
+        cep_backend: CEP lookup backend: 'node' (cep_worker.js processes) or an HTTP provider ('brasilapi', 'viacep')
+        cep_pool: Already started backend to reuse instead of starting one for this batch
+        cep_index: Offline CEP index filling in the city/state missing from API answers. API answers
+            placing a CEP in another state than the index does are discarded in favour of generated data
+        cep_pipeline_depth: Requests pipelined per connection by an HTTP backend started for this batch
 
     Returns:
         List of dictionaries with address data (street, neighborhood, building_number)
@@ -138,14 +203,18 @@ async def get_address_data_batch(ceps: list[str], make_api_call: bool = False, p
             progress_callback(0, 'API calls: Connecting to service')
 
         # Get data from API
-        cep_data_list = await workers_for_multiple_cep(formatted_ceps)
+        cep_data_list = await workers_for_multiple_cep(
+            formatted_ceps, pool=cep_pool, cache=cep_cache, backend=cep_backend, pipeline_depth=cep_pipeline_depth
+        )
 
         # Update progress if callback is provided
         if progress_callback:
             progress_callback(0, 'API calls: Processing responses')
 
+        expected_locations = cep_index.lookup_many(formatted_ceps) if cep_index is not None else [None] * len(ceps)
+
         # Process each CEP result
-        for i, cep_data in enumerate(cep_data_list):
+        for i, (cep_data, location) in enumerate(zip(cep_data_list, expected_locations)):
             address_data = {
                 'street': '',
                 'neighborhood': '',
@@ -160,45 +229,37 @@ async def get_address_data_batch(ceps: list[str], make_api_call: bool = False, p
                 address_data['street'] = cep_data.get('street', '')
                 address_data['neighborhood'] = cep_data.get('neighborhood', '')
 
-            # If neighborhood is empty, use address_for_offline
-            if not address_data['neighborhood']:
-                address_provider = AddressProvider_for_offline()
-                address_data['neighborhood'] = address_provider.bairro()
-
-            # If street is empty, use address_for_offline
-            if not address_data['street']:
-                address_provider = AddressProvider_for_offline()
-                address_data['street'] = address_provider.street_prefix() + ' ' + address_provider.last_name()
-
-            # Always get building number from address_for_offline
-            address_provider = AddressProvider_for_offline()
-            address_data['building_number'] = address_provider.building_number()
+            # Check the answer against the offline index and fill in what the API left out
+            if location is not None:
+                if address_data['state'] and address_data['state'] != location.state_abbr:
+                    address_data.update(street='', neighborhood='', cep=ceps[i], state='', city='')
+                address_data['city'] = address_data['city'] or location.city_name
+                address_data['state'] = address_data['state'] or location.state_abbr
 
             address_data_list.append(address_data)
 
             # Update progress occasionally if callback is provided
             if progress_callback and i % max(1, len(cep_data_list) // 10) == 0:
                 progress_callback(0, f'API calls: Processed {i + 1}/{len(cep_data_list)} addresses')
+
+        # Generate the streets and neighborhoods the API left empty, and every building number
+        columns = AddressProvider_for_offline(rng).generate_addresses(ceps, existing=address_data_list)
+        for address_data, street, neighborhood, building_number in zip(
+            address_data_list, columns['street'], columns['neighborhood'], columns['building_number']
+        ):
+            address_data.update(street=street, neighborhood=neighborhood, building_number=building_number)
     else:
-        # Use address_for_offline to generate all data for each CEP
-        for i, cep in enumerate(ceps):
-            # Ensure CEP has dash format
-            formatted_cep = cep
-            if '-' not in formatted_cep and len(formatted_cep) == 8:
-                formatted_cep = f'{formatted_cep[:5]}-{formatted_cep[5:]}'
-
-            address_provider = AddressProvider_for_offline()
-            address_data = {
-                'street': address_provider.street_prefix() + ' ' + address_provider.last_name(),
-                'neighborhood': address_provider.bairro(),
-                'building_number': address_provider.building_number(),
-                'cep': formatted_cep,
-            }
-            address_data_list.append(address_data)
+        # Generate all address data for the batch in bulk
+        columns = AddressProvider_for_offline(rng).generate_addresses(ceps)
+        address_data_list = [
+            {'street': street, 'neighborhood': neighborhood, 'building_number': building_number, 'cep': cep}
+            for street, neighborhood, building_number, cep in zip(
+                columns['street'], columns['neighborhood'], columns['building_number'], columns['cep']
+            )
+        ]
 
-            # Update progress occasionally if callback is provided
-            if progress_callback and i % max(1, len(ceps) // 10) == 0:
-                progress_callback(0, f'Generating address data: {i + 1}/{len(ceps)}')
+        if progress_callback:
+            progress_callback(0, f'Generating address data: {len(ceps)}/{len(ceps)}')
 
     # Final update for API calls completion
     if progress_callback and make_api_call:
@@ -222,6 +283,751 @@ async def get_address_data(cep: str, make_api_call: bool = False) -> dict:
     return result[0] if result else {}
 
 
+# Default option values for the streaming API. The keys mirror the parameters of sample().
+DEFAULT_OPTIONS = {
+    'city_only': False,
+    'state_abbr_only': False,
+    'state_full_only': False,
+    'only_cep': False,
+    'cep_without_dash': False,
+    'make_api_call': False,
+    'time_period': TimePeriod.UNTIL_2010,
+    'return_only_name': False,
+    'name_raw': False,
+    'json_path': 'src/data/cities_with_ceps.json',
+    'names_path': 'src/data/names_data.json',
+    'middle_names_path': 'src/data/middle_names.json',
+    'only_surname': False,
+    'top_40': False,
+    'with_only_one_surname': False,
+    'always_middle': False,
+    'only_middle': False,
+    'always_cpf': True,
+    'always_pis': False,
+    'always_cnpj': False,
+    'always_cei': False,
+    'always_rg': True,
+    'always_phone': True,
+    'only_cpf': False,
+    'only_pis': False,
+    'only_cnpj': False,
+    'only_cei': False,
+    'only_rg': False,
+    'only_fone': False,
+    'include_issuer': True,
+    'only_document': False,
+    'surnames_path': 'src/data/surnames_data.json',
+    'locations_path': 'src/data/locations_data.json',
+    'all_data': False,
+    'cep_cache_path': DEFAULT_CEP_CACHE_PATH,
+    'cep_cache_ttl': DEFAULT_CEP_CACHE_TTL,
+    'cep_cache_error_ttl': DEFAULT_CEP_CACHE_ERROR_TTL,
+    'cep_backend': 'node',
+    'cep_pipeline_depth': 1,
+    'pipelined': False,
+    'bundle_dir': DEFAULT_BUNDLE_DIR,
+}
+
+# Flags forced on and off by all_data
+_ALL_DATA_ENABLED = ('always_cpf', 'always_pis', 'always_cnpj', 'always_cei', 'always_rg', 'always_phone', 'always_middle')
+_ALL_DATA_DISABLED = (
+    'only_cpf',
+    'only_pis',
+    'only_cnpj',
+    'only_cei',
+    'only_rg',
+    'only_fone',
+    'only_surname',
+    'only_middle',
+    'only_cep',
+    'city_only',
+    'state_abbr_only',
+    'state_full_only',
+    'return_only_name',
+    'only_document',
+)
+
+# Number of rows generated (and resolved to addresses) per chunk by the streaming API
+DEFAULT_CHUNK_SIZE = 1000
+
+# Pipelined API mode: rows per CEP lookup batch, and how many batches may be resolving at once
+PIPELINE_BATCH_SIZE = 100
+PIPELINE_MAX_PENDING = 16
+
+
+def _resolve_options(options: dict) -> dict:
+    """Merge options with DEFAULT_OPTIONS and apply the all_data overrides.
+
+    Raises:
+        TypeError: If an unknown option is given
+    """
+    unknown = set(options) - set(DEFAULT_OPTIONS)
+    if unknown:
+        raise TypeError(f'Unknown sample option(s): {", ".join(sorted(unknown))}')
+
+    resolved = {**DEFAULT_OPTIONS, **options}
+
+    # If all_data is True, override other flags to include everything
+    if resolved['all_data']:
+        resolved.update(dict.fromkeys(_ALL_DATA_ENABLED, True))
+        resolved.update(dict.fromkeys(_ALL_DATA_DISABLED, False))
+    return resolved
+
+
+def load_samplers(
+    json_path: str | Path,
+    names_path: str | Path,
+    middle_names_path: str | Path,
+    surnames_path: str | Path,
+    locations_path: str | Path | None,
+    rng: random.Random | None = None,
+    bundle_dir: str | Path | None = DEFAULT_BUNDLE_DIR,
+) -> tuple[BrazilianLocationSampler, DocumentSampler, BrazilianNameSampler]:
+    """Load the location, document and name samplers from their data files.
+
+    If a bundle for these data files exists in bundle_dir (see build_bundle), the
+    samplers are restored from it. A bundle whose data files changed since it was
+    built is rebuilt on the spot.
+
+    Args:
+        json_path: Path to city/state data JSON file
+        names_path: Path to first names data file
+        middle_names_path: Path to middle names data file
+        surnames_path: Path to surnames data file
+        locations_path: Optional path to locations data JSON file with extra cities/states
+        rng: Random number source shared by all three samplers (defaults to the global random module)
+        bundle_dir: Directory holding compiled bundles, or None to always load from the data files
+
+    Returns:
+        Tuple of (location_sampler, doc_sampler, name_sampler)
+    """
+    sources = (json_path, names_path, middle_names_path, surnames_path, locations_path)
+    path = bundle_path(sources, bundle_dir) if bundle_dir else None
+    if path is not None and path.exists():
+        bundled = read_bundle(path, rng)
+        if bundled is not None:
+            location_sampler, name_sampler = bundled
+            return location_sampler, DocumentSampler(rng=rng), name_sampler
+
+    location_sampler, name_sampler = _load_samplers_from_json(*sources, rng)
+    if path is not None and path.exists():
+        _write_samplers_bundle(path, sources, location_sampler, name_sampler)
+    return location_sampler, DocumentSampler(rng=rng), name_sampler
+
+
+def build_bundle(
+    json_path: str | Path,
+    names_path: str | Path,
+    middle_names_path: str | Path,
+    surnames_path: str | Path,
+    locations_path: str | Path | None,
+    bundle_dir: str | Path = DEFAULT_BUNDLE_DIR,
+) -> Path:
+    """Compile the data files into a bundle that load_samplers restores instead of parsing them.
+
+    Args:
+        json_path: Path to city/state data JSON file
+        names_path: Path to first names data file
+        middle_names_path: Path to middle names data file
+        surnames_path: Path to surnames data file
+        locations_path: Optional path to locations data JSON file with extra cities/states
+        bundle_dir: Directory to write the bundle to
+
+    Returns:
+        Path of the written bundle
+    """
+    sources = (json_path, names_path, middle_names_path, surnames_path, locations_path)
+    location_sampler, name_sampler = _load_samplers_from_json(*sources)
+    return _write_samplers_bundle(bundle_path(sources, bundle_dir), sources, location_sampler, name_sampler)
+
+
+def _write_samplers_bundle(
+    path: Path,
+    sources: tuple[str | Path | None, ...],
+    location_sampler: BrazilianLocationSampler,
+    name_sampler: BrazilianNameSampler,
+) -> Path:
+    # Build the lazily created tables too, so every bundle user gets them for free
+    location_sampler.cep_index  # noqa: B018
+    name_sampler.middle_name_table  # noqa: B018
+    return write_bundle(path, sources, location_sampler, name_sampler)
+
+
+def _load_samplers_from_json(
+    json_path: str | Path,
+    names_path: str | Path,
+    middle_names_path: str | Path,
+    surnames_path: str | Path,
+    locations_path: str | Path | None,
+    rng: random.Random | None = None,
+) -> tuple[BrazilianLocationSampler, BrazilianNameSampler]:
+    """Build the location and name samplers from their JSON data files."""
+    location_sampler = BrazilianLocationSampler(json_path, rng=rng)
+
+    # Load location data if provided - do this only once
+    if locations_path:
+        try:
+            with Path(locations_path).open(encoding='utf-8') as f:
+                locations_data = json.load(f)
+                # Use locations data if available
+                if 'cities' in locations_data:
+                    location_sampler.update_cities(locations_data['cities'])
+                if 'states' in locations_data:
+                    location_sampler.update_states(locations_data['states'])
+        except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
+            # Log but continue with default data
+            print(f'Warning: Could not use locations_path data: {e}')
+
+    # Load surnames data for name sampler
+    with Path(surnames_path).open(encoding='utf-8') as f:
+        surnames_data = json.load(f)
+
+    # Create complete data for name sampler
+    name_data = {'surnames': surnames_data['surnames']}
+    if names_path:
+        with Path(names_path).open(encoding='utf-8') as f:
+            names_data = json.load(f)
+            name_data.update(names_data)
+
+    name_sampler = BrazilianNameSampler(
+        name_data,  # Pass the combined data
+        middle_names_path,
+        None,  # No need for names_path as we've already loaded it
+        rng=rng,
+    )
+    return location_sampler, name_sampler
+
+
+def _generation_plan(options: dict) -> tuple[tuple[str, ...], str | None, str]:
+    """Decide once which documents each row gets and how names are drawn for the selected mode.
+
+    Returns:
+        Tuple of (document_kinds, name_mode, progress_stage). name_mode is 'full', 'surname', 'middle' or None.
+    """
+    o = options
+    all_requested_documents = _selected_documents(
+        cpf=o['always_cpf'] or o['only_cpf'],
+        pis=o['always_pis'] or o['only_pis'],
+        cnpj=o['always_cnpj'] or o['only_cnpj'],
+        cei=o['always_cei'] or o['only_cei'],
+        rg=o['always_rg'] or o['only_rg'],
+        phone=o['always_phone'] or o['only_fone'],
+    )
+    if o['only_document']:
+        return all_requested_documents, None, 'Generating documents'
+    if any(o[flag] for flag in ('only_cpf', 'only_pis', 'only_cnpj', 'only_cei', 'only_rg', 'only_fone')):
+        document_kinds = _selected_documents(
+            cpf=o['only_cpf'], pis=o['only_pis'], cnpj=o['only_cnpj'], cei=o['only_cei'], rg=o['only_rg'], phone=o['only_fone']
+        )
+        return document_kinds, None, 'Generating specific documents'
+    if o['only_surname'] or o['only_middle']:
+        return (), 'surname' if o['only_surname'] else 'middle', 'Generating names'
+    if o['return_only_name']:
+        return all_requested_documents, 'full', 'Generating names'
+    return all_requested_documents, 'full', 'Generating complete profiles'
+
+
+def _generate_rows(
+    samplers: tuple[BrazilianLocationSampler, DocumentSampler, BrazilianNameSampler],
+    options: dict,
+    n: int,
+    offset: int = 0,
+    total: int | None = None,
+    progress_callback: Callable[[int, str], None] | None = None,
+) -> tuple[list[tuple[str, NameComponents | None, dict[str, str]]], list[str]]:
+    """Generate n rows in a single pass.
+
+    Each row's location is drawn once and feeds its documents, phone DDD, CEP and address.
+
+    Returns:
+        Tuple of (rows, ceps) where rows are (location_str, name_components, documents) tuples
+    """
+    location_sampler, doc_sampler, name_sampler = samplers
+    document_kinds, name_mode, stage = _generation_plan(options)
+    total = total or n
+    cep_with_dash = not options['cep_without_dash']
+
+    rows: list[tuple[str, NameComponents | None, dict[str, str]]] = []
+
+    # Draw every row's city and CEP up front; the rest of the row reads the city table by index.
+    # The indices are resolved against the tables they were drawn from, even if an update comes in.
+    tables = location_sampler.tables
+    state_indices, city_indices = location_sampler.get_state_and_city_batch(n, tables)
+    ceps = location_sampler.random_ceps(city_indices, cep_with_dash, tables)
+    state_names, state_abbrs = tables.state_names, tables.state_abbrs
+    city_names, city_records = tables.city_names, tables.city_records
+
+    for i, (state_idx, city_idx, formatted_cep) in enumerate(zip(state_indices, city_indices, ceps)):
+        state_name, state_abbr, city_name = state_names[state_idx], state_abbrs[state_idx], city_names[city_idx]
+
+        ddd = city_records[city_idx].get('ddd')
+        documents = generate_documents(doc_sampler, document_kinds, state_abbr, ddd, options['include_issuer'])
+
+        name_components = None
+        if name_mode == 'surname':
+            name_components = NameComponents(
+                '',
+                None,
+                name_sampler.get_random_surname(
+                    top_40=options['top_40'], raw=options['name_raw'], with_only_one_surname=options['with_only_one_surname']
+                ),
+            )
+        elif name_mode == 'middle':
+            name_components = name_sampler.get_random_name(raw=options['name_raw'], only_middle=True, return_components=True)
+        elif name_mode == 'full':
+            name_components = name_sampler.get_random_name(
+                time_period=options['time_period'],
+                raw=options['name_raw'],
+                include_surname=True,
+                top_40=options['top_40'],
+                with_only_one_surname=options['with_only_one_surname'],
+                always_middle=options['always_middle'],
+                return_components=True,
+            )
+
+        # The parse_result function expects the format: "city - cep, state (abbr)"
+        location_str = f'{city_name} - {formatted_cep}, {state_name} ({state_abbr})'
+        rows.append((location_str, name_components, documents))
+
+        # Report progress if callback is provided
+        if progress_callback and (offset + i) % max(1, total // 100) == 0:
+            progress_callback(offset + i + 1, stage)
+
+    return rows, ceps
+
+
+def _parse_rows(rows: list[tuple[str, NameComponents | None, dict[str, str]]], address_data_list: list[dict]) -> list[dict]:
+    """Convert generated rows and their address data to dictionary format."""
+    parsed_results = []
+    for i, (location, name_components, documents) in enumerate(rows):
+        # Get the corresponding address data
+        address_data = address_data_list[i] if i < len(address_data_list) else {}
+
+        # Parse the location string to extract city, state, and CEP
+        parsed_results.append(parse_result(location, name_components, documents, state_info=None, address_data=address_data))
+    return parsed_results
+
+
+def _chunk_sizes(qty: int, chunk_size: int) -> Iterator[int]:
+    """Yield the sizes of consecutive chunks covering qty rows."""
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be a positive integer')
+    for start in range(0, qty, chunk_size):
+        yield min(chunk_size, qty - start)
+
+
+def _load_samplers_from_options(
+    options: dict, rng: random.Random | None = None
+) -> tuple[BrazilianLocationSampler, DocumentSampler, BrazilianNameSampler]:
+    """Load the samplers for a resolved options dictionary."""
+    return load_samplers(
+        options['json_path'],
+        options['names_path'],
+        options['middle_names_path'],
+        options['surnames_path'],
+        options['locations_path'],
+        rng,
+        options['bundle_dir'],
+    )
+
+
+# Options naming the data files the samplers are loaded from
+_DATA_PATH_OPTIONS = ('json_path', 'names_path', 'middle_names_path', 'surnames_path', 'locations_path')
+
+# Process-wide sessions by resolved data file paths, with the files' mtimes when loaded (see get_session)
+_SESSION_CACHE: dict[tuple[str | None, ...], tuple[tuple[int | None, ...], 'SamplerSession']] = {}
+_SESSION_CACHE_LOCK = threading.Lock()
+
+
+class SamplerSession:
+    """Samplers loaded once for a set of data files, reused by every generate() call.
+
+    sample(), iter_sample_chunks() and the CLI share sessions through get_session(),
+    so repeated calls in one process don't parse the data files again.
+
+        session = get_session()
+        first = session.generate(10_000, all_data=True)
+        second = session.generate(10_000, only_cpf=True)
+    """
+
+    def __init__(
+        self,
+        json_path: str | Path = DEFAULT_OPTIONS['json_path'],
+        names_path: str | Path = DEFAULT_OPTIONS['names_path'],
+        middle_names_path: str | Path = DEFAULT_OPTIONS['middle_names_path'],
+        surnames_path: str | Path = DEFAULT_OPTIONS['surnames_path'],
+        locations_path: str | Path | None = DEFAULT_OPTIONS['locations_path'],
+        rng: random.Random | None = None,
+        bundle_dir: str | Path | None = DEFAULT_BUNDLE_DIR,
+    ):
+        """
+        Args:
+            json_path: Path to city/state data JSON file
+            names_path: Path to first names data file
+            middle_names_path: Path to middle names data file
+            surnames_path: Path to surnames data file
+            locations_path: Optional path to locations data JSON file with extra cities/states
+            rng: Random number source shared by the samplers (defaults to the global random module)
+            bundle_dir: Directory holding compiled bundles, or None to always load from the data files
+        """
+        self.data_paths = dict(zip(_DATA_PATH_OPTIONS, (json_path, names_path, middle_names_path, surnames_path, locations_path)))
+        self.samplers = load_samplers(json_path, names_path, middle_names_path, surnames_path, locations_path, rng, bundle_dir)
+
+    def _resolve_options(self, options: dict) -> dict:
+        """Resolve generation options, which may only repeat the session's own data files.
+
+        Raises:
+            ValueError: If an option names another data file than the session's
+            TypeError: If an unknown option is given
+        """
+        for key, path in self.data_paths.items():
+            if key in options and _resolved_path(options[key]) != _resolved_path(path):
+                raise ValueError(f'{key} {options[key]} differs from the session data file {path}')
+        return _resolve_options({**options, **self.data_paths})
+
+    def iter_chunks(
+        self, qty: int, chunk_size: int = DEFAULT_CHUNK_SIZE, progress_callback: Callable[[int, str], None] | None = None, **options: Any
+    ) -> Iterator[list[dict]]:
+        """Generate samples lazily, yielding chunks of up to chunk_size parsed records (see iter_sample_chunks)."""
+        options = self._resolve_options(options)
+        yield from _generate_chunks(self.samplers, options, qty, chunk_size, progress_callback)
+
+    def generate(
+        self, n: int, chunk_size: int = DEFAULT_CHUNK_SIZE, progress_callback: Callable[[int, str], None] | None = None, **options: Any
+    ) -> list[dict]:
+        """Generate n samples.
+
+        Args:
+            n: Number of samples to generate
+            chunk_size: Number of rows generated and resolved to addresses together
+            progress_callback: Optional callback function to report progress (takes completed count and stage)
+            **options: Any of the sample() options (see DEFAULT_OPTIONS) except other data files
+
+        Returns:
+            List of parsed sample dictionaries
+        """
+        return [record for chunk in self.iter_chunks(n, chunk_size, progress_callback, **options) for record in chunk]
+
+
+def _resolved_path(path: str | Path | None) -> str | None:
+    return str(Path(path).resolve()) if path else None
+
+
+def _mtime_ns(path: str | None) -> int | None:
+    try:
+        return Path(path).stat().st_mtime_ns if path else None
+    except OSError:
+        return None
+
+
+def get_session(
+    json_path: str | Path = DEFAULT_OPTIONS['json_path'],
+    names_path: str | Path = DEFAULT_OPTIONS['names_path'],
+    middle_names_path: str | Path = DEFAULT_OPTIONS['middle_names_path'],
+    surnames_path: str | Path = DEFAULT_OPTIONS['surnames_path'],
+    locations_path: str | Path | None = DEFAULT_OPTIONS['locations_path'],
+    bundle_dir: str | Path | None = DEFAULT_BUNDLE_DIR,
+) -> SamplerSession:
+    """Return the process-wide session for a set of data files, loading it on first use.
+
+    The session is reloaded when one of the files was modified since it was loaded.
+    Cached sessions draw from the global random module; create a SamplerSession
+    directly for a dedicated RNG.
+
+    Args:
+        json_path: Path to city/state data JSON file
+        names_path: Path to first names data file
+        middle_names_path: Path to middle names data file
+        surnames_path: Path to surnames data file
+        locations_path: Optional path to locations data JSON file with extra cities/states
+        bundle_dir: Directory holding compiled bundles, used when the session is loaded
+
+    Returns:
+        The shared SamplerSession
+    """
+    paths = (json_path, names_path, middle_names_path, surnames_path, locations_path)
+    key = tuple(_resolved_path(path) for path in paths)
+    mtimes = tuple(_mtime_ns(path) for path in key)
+    with _SESSION_CACHE_LOCK:
+        cached = _SESSION_CACHE.get(key)
+        if cached is None or cached[0] != mtimes:
+            cached = (mtimes, SamplerSession(*paths, bundle_dir=bundle_dir))
+            _SESSION_CACHE[key] = cached
+        return cached[1]
+
+
+def clear_session_cache() -> None:
+    """Drop every cached session, releasing their samplers."""
+    with _SESSION_CACHE_LOCK:
+        _SESSION_CACHE.clear()
+
+
+def _samplers_for_options(
+    options: dict, rng: random.Random | None = None
+) -> tuple[BrazilianLocationSampler, DocumentSampler, BrazilianNameSampler]:
+    """Return the shared session's samplers for a resolved options dictionary, or fresh ones bound to rng."""
+    if rng is not None:
+        return _load_samplers_from_options(options, rng)
+    return get_session(*(options[key] for key in _DATA_PATH_OPTIONS), bundle_dir=options['bundle_dir']).samplers
+
+
+def _open_cep_cache(options: dict) -> CepCache | None:
+    """Open the persistent CEP cache for API mode, or return None if API calls or caching are off."""
+    if not options['make_api_call'] or not options['cep_cache_path']:
+        return None
+    return CepCache(options['cep_cache_path'], options['cep_cache_ttl'], options['cep_cache_error_ttl'])
+
+
+async def _apipelined_chunks(
+    samplers: tuple[BrazilianLocationSampler, DocumentSampler, BrazilianNameSampler],
+    options: dict,
+    qty: int,
+    chunk_size: int,
+    progress_callback: Callable[[int, str], None] | None = None,
+    cep_cache: CepCache | None = None,
+) -> AsyncIterator[list[dict]]:
+    """Generate qty parsed records in API mode, overlapping row generation with the CEP lookups.
+
+    Rows are generated in batches of PIPELINE_BATCH_SIZE and each batch's lookups
+    start as a task while the next batch is generated, with at most
+    PIPELINE_MAX_PENDING batches outstanding. Chunks of chunk_size records are
+    yielded in order as soon as all their rows have an address, so the run takes
+    about max(generation, lookups) instead of their sum.
+
+    The offline fill-ins for incomplete API answers draw from a per-batch RNG
+    seeded from the samplers' RNG when the batch is generated, so seeded runs stay
+    reproducible whatever order the lookups finish in.
+    """
+    from .utils.cep_wrapper import DEFAULT_POOL_SIZE, _new_backend
+
+    rng = samplers[1].rng
+    cep_index = samplers[0].cep_index
+    batch_size = min(chunk_size, PIPELINE_BATCH_SIZE)
+    remaining_chunks = deque(_chunk_sizes(qty, chunk_size))
+    pending: deque[tuple[list, asyncio.Task]] = deque()
+    ready: list[dict] = []
+    yielded = 0
+
+    if progress_callback:
+        progress_callback(0, 'API calls starting')
+    async with _new_backend(options['cep_backend'], DEFAULT_POOL_SIZE, options['cep_pipeline_depth']) as cep_pool:
+        try:
+            offset = 0
+            for n in _chunk_sizes(qty, batch_size):
+                rows, ceps = _generate_rows(samplers, options, n, offset, qty, progress_callback)
+                batch_rng = random.Random(rng.getrandbits(64))
+                lookup = get_address_data_batch(ceps, True, None, batch_rng, cep_cache, options['cep_backend'], cep_pool, cep_index)
+                pending.append((rows, asyncio.ensure_future(lookup)))
+                offset += n
+
+                # Let the lookups send requests and read answers before generating the next batch
+                await asyncio.sleep(0)
+                while pending and (pending[0][1].done() or len(pending) >= PIPELINE_MAX_PENDING or offset == qty):
+                    rows, task = pending.popleft()
+                    ready.extend(_parse_rows(rows, await task))
+                    while remaining_chunks and len(ready) >= remaining_chunks[0]:
+                        size = remaining_chunks.popleft()
+                        chunk, ready = ready[:size], ready[size:]
+                        yielded += size
+                        if progress_callback:
+                            progress_callback(yielded, 'API calls completed')
+                        yield chunk
+        finally:
+            for _, task in pending:
+                task.cancel()
+            await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
+
+
+async def _aserial_chunks(
+    samplers: tuple[BrazilianLocationSampler, DocumentSampler, BrazilianNameSampler],
+    options: dict,
+    qty: int,
+    chunk_size: int,
+    progress_callback: Callable[[int, str], None] | None = None,
+    cep_cache: CepCache | None = None,
+) -> AsyncIterator[list[dict]]:
+    """Generate qty parsed records one chunk at a time, resolving each chunk's addresses before the next.
+
+    In API mode a single CEP backend is started for the run and shared by every
+    chunk, so the worker processes or connections outlive the chunks.
+    """
+    from .utils.cep_wrapper import DEFAULT_POOL_SIZE, _new_backend
+
+    rng = samplers[1].rng
+    cep_index = samplers[0].cep_index if options['make_api_call'] else None
+    cep_pool = _new_backend(options['cep_backend'], DEFAULT_POOL_SIZE, options['cep_pipeline_depth']) if options['make_api_call'] else None
+    try:
+        offset = 0
+        for n in _chunk_sizes(qty, chunk_size):
+            rows, ceps = _generate_rows(samplers, options, n, offset, qty, progress_callback)
+            if progress_callback and options['make_api_call']:
+                progress_callback(offset + n, 'API calls starting')
+            address_data_list = await get_address_data_batch(
+                ceps, options['make_api_call'], progress_callback, rng, cep_cache, options['cep_backend'], cep_pool, cep_index
+            )
+            if progress_callback and options['make_api_call']:
+                progress_callback(offset + n, 'API calls completed')
+            yield _parse_rows(rows, address_data_list)
+            offset += n
+    finally:
+        if cep_pool is not None:
+            await cep_pool.close()
+
+
+def _iter_async_chunks(chunks: AsyncIterator[list[dict]]) -> Iterator[list[dict]]:
+    """Drive an async chunk iterator from synchronous code, keeping one event loop for all chunks."""
+
+    async def next_chunk() -> list[dict] | None:
+        return await anext(chunks, None)
+
+    async def close() -> None:
+        await chunks.aclose()
+
+    with asyncio.Runner() as runner:
+        try:
+            while (chunk := runner.run(next_chunk())) is not None:
+                yield chunk
+        finally:
+            runner.run(close())
+
+
+def _generate_chunks(
+    samplers: tuple[BrazilianLocationSampler, DocumentSampler, BrazilianNameSampler],
+    options: dict,
+    qty: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress_callback: Callable[[int, str], None] | None = None,
+) -> Iterator[list[dict]]:
+    """Generate qty parsed records with already loaded samplers, one chunk at a time."""
+    cep_cache = _open_cep_cache(options)
+    try:
+        if options['pipelined'] and options['make_api_call']:
+            yield from _iter_async_chunks(_apipelined_chunks(samplers, options, qty, chunk_size, progress_callback, cep_cache))
+        else:
+            yield from _iter_async_chunks(_aserial_chunks(samplers, options, qty, chunk_size, progress_callback, cep_cache))
+        if progress_callback and cep_cache is not None:
+            progress_callback(qty, f'CEP cache: {cep_cache.stats}')
+    finally:
+        if cep_cache is not None:
+            cep_cache.close()
+
+
+def iter_sample_chunks(
+    qty: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress_callback: Callable[[int, str], None] | None = None,
+    rng: random.Random | None = None,
+    **options: Any,
+) -> Iterator[list[dict]]:
+    """Generate samples lazily, yielding fixed-size chunks of parsed records.
+
+    Only one chunk is held in memory at a time, so memory use is bounded by
+    chunk_size regardless of qty. Address data is resolved per chunk.
+
+    Args:
+        qty: Number of samples to generate
+        chunk_size: Number of records per yielded chunk
+        progress_callback: Optional callback function to report progress (takes completed count and stage)
+        rng: Random number source for every draw, e.g. random.Random(seed) for a reproducible
+            stream (defaults to the global random module, drawing from the shared session's
+            samplers for the data files, see get_session)
+        **options: Any of the sample() options (see DEFAULT_OPTIONS)
+
+    Yields:
+        Lists of up to chunk_size parsed sample dictionaries
+    """
+    options = _resolve_options(options)
+    yield from _generate_chunks(_samplers_for_options(options, rng), options, qty, chunk_size, progress_callback)
+
+
+def iter_samples(
+    qty: int, chunk_size: int = DEFAULT_CHUNK_SIZE, progress_callback: Callable[[int, str], None] | None = None, **options: Any
+) -> Iterator[dict]:
+    """Generate samples lazily, yielding one parsed record at a time.
+
+    See iter_sample_chunks for the arguments; chunk_size only controls how many
+    rows are generated and resolved to addresses together.
+
+    Yields:
+        Parsed sample dictionaries
+    """
+    for chunk in iter_sample_chunks(qty, chunk_size, progress_callback, **options):
+        yield from chunk
+
+
+async def aiter_sample_chunks(
+    qty: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress_callback: Callable[[int, str], None] | None = None,
+    rng: random.Random | None = None,
+    **options: Any,
+) -> AsyncIterator[list[dict]]:
+    """Async variant of iter_sample_chunks for use inside a running event loop.
+
+    Yields:
+        Lists of up to chunk_size parsed sample dictionaries
+    """
+    options = _resolve_options(options)
+    samplers = _samplers_for_options(options, rng)
+    cep_cache = _open_cep_cache(options)
+    if options['pipelined'] and options['make_api_call']:
+        chunks = _apipelined_chunks(samplers, options, qty, chunk_size, progress_callback, cep_cache)
+    else:
+        chunks = _aserial_chunks(samplers, options, qty, chunk_size, progress_callback, cep_cache)
+
+    try:
+        async for chunk in chunks:
+            yield chunk
+        if progress_callback and cep_cache is not None:
+            progress_callback(qty, f'CEP cache: {cep_cache.stats}')
+    finally:
+        # Stop the chunk generator (and its CEP backend) before closing the cache it writes to
+        await chunks.aclose()
+        if cep_cache is not None:
+            cep_cache.close()
+
+
+async def aiter_samples(
+    qty: int, chunk_size: int = DEFAULT_CHUNK_SIZE, progress_callback: Callable[[int, str], None] | None = None, **options: Any
+) -> AsyncIterator[dict]:
+    """Async variant of iter_samples for use inside a running event loop.
+
+    Yields:
+        Parsed sample dictionaries
+    """
+    async for chunk in aiter_sample_chunks(qty, chunk_size, progress_callback, **options):
+        for record in chunk:
+            yield record
+
+
+def save_samples_to_jsonl(
+    filename: str,
+    qty: int,
+    append: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress_callback: Callable[[int, str], None] | None = None,
+    **options: Any,
+) -> int:
+    """Stream generated samples into a JSONL file chunk by chunk.
+
+    Args:
+        filename: Path to the output JSONL file
+        qty: Number of samples to generate
+        append: If True, append to existing file instead of overwriting
+        chunk_size: Number of records generated and written at a time
+        progress_callback: Optional callback function to report progress
+        **options: Any of the sample() options (see DEFAULT_OPTIONS)
+
+    Returns:
+        Number of records written
+    """
+    written = 0
+    for chunk in iter_sample_chunks(qty, chunk_size, progress_callback, **options):
+        asyncio.run(save_to_jsonl_file(chunk, filename, append=append or written > 0))
+        written += len(chunk)
+    return written
+
+
 def sample(
     qty: int,
     q: int | None,
@@ -260,8 +1066,11 @@ def sample(
     locations_path: str | Path,
     save_to_jsonl: str | None,
     all_data: bool,
-    progress_callback: callable = None,
+    progress_callback: Callable[[int, str], None] | None = None,
     append_to_jsonl: bool = False,
+    workers: int = 1,
+    seed: int | None = None,
+    pipelined: bool = False,
 ) -> dict | list[dict]:
     """Generate random Brazilian samples with comprehensive information.
 
@@ -269,6 +1078,9 @@ def sample(
     based on the provided parameters. It handles various combinations of output
     formats and ensures proper state handling for document generation.
 
+    It collects the output of iter_sample_chunks; use that (or iter_samples) directly
+    when the records don't all need to be held in memory.
+
     Args:
         qty: Number of samples to generate
         q: Alias for qty parameter (takes precedence if provided)
@@ -307,6 +1119,10 @@ def sample(
         all_data: Include all possible data in the generated samples
         progress_callback: Optional callback function to report progress (takes completed count as parameter)
         append_to_jsonl: If True, append to existing JSONL file instead of overwriting
+        workers: Number of worker processes. Above 1 the samples are generated in shards over a process pool
+        seed: Base seed for reproducible output; the same seed gives the same samples for any number of workers
+        pipelined: With make_api_call, overlap the CEP lookups with record generation instead of
+            generating a whole chunk before resolving its addresses
 
     Returns:
         Dictionary or list of dictionaries containing the generated samples
@@ -314,324 +1130,58 @@ def sample(
     # Handle q parameter alias (takes precedence over qty)
     actual_qty = q if q is not None else qty
 
-    # If all_data is True, override other flags to include everything
-    if all_data:
-        always_cpf = True
-        always_pis = True
-        always_cnpj = True
-        always_cei = True
-        always_rg = True
-        always_phone = True
-        always_middle = True
-        only_cpf = False
-        only_pis = False
-        only_cnpj = False
-        only_cei = False
-        only_rg = False
-        only_fone = False
-        only_surname = False
-        only_middle = False
-        only_cep = False
-        city_only = False
-        state_abbr_only = False
-        state_full_only = False
-        return_only_name = False
-        only_document = False
+    options = {
+        'city_only': city_only,
+        'state_abbr_only': state_abbr_only,
+        'state_full_only': state_full_only,
+        'only_cep': only_cep,
+        'cep_without_dash': cep_without_dash,
+        'make_api_call': make_api_call,
+        'time_period': time_period,
+        'return_only_name': return_only_name,
+        'name_raw': name_raw,
+        'json_path': json_path,
+        'names_path': names_path,
+        'middle_names_path': middle_names_path,
+        'only_surname': only_surname,
+        'top_40': top_40,
+        'with_only_one_surname': with_only_one_surname,
+        'always_middle': always_middle,
+        'only_middle': only_middle,
+        'always_cpf': always_cpf,
+        'always_pis': always_pis,
+        'always_cnpj': always_cnpj,
+        'always_cei': always_cei,
+        'always_rg': always_rg,
+        'always_phone': always_phone,
+        'only_cpf': only_cpf,
+        'only_pis': only_pis,
+        'only_cnpj': only_cnpj,
+        'only_cei': only_cei,
+        'only_rg': only_rg,
+        'only_fone': only_fone,
+        'include_issuer': include_issuer,
+        'only_document': only_document,
+        'surnames_path': surnames_path,
+        'locations_path': locations_path,
+        'all_data': all_data,
+        'pipelined': pipelined,
+    }
 
     try:
-        # Initialize samplers only once
-        location_sampler = BrazilianLocationSampler(json_path)
-        doc_sampler = DocumentSampler()
-
-        # Load location data if provided - do this only once
-        if locations_path:
-            try:
-                with Path(locations_path).open(encoding='utf-8') as f:
-                    locations_data = json.load(f)
-                    # Use locations data if available
-                    if 'cities' in locations_data:
-                        location_sampler.update_cities(locations_data['cities'])
-                    if 'states' in locations_data:
-                        location_sampler.update_states(locations_data['states'])
-            except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
-                # Log but continue with default data
-                print(f'Warning: Could not use locations_path data: {e}')
-
-        # Load surnames data for name sampler
-        with Path(surnames_path).open(encoding='utf-8') as f:
-            surnames_data = json.load(f)
-
-        # Create complete data for name sampler
-        name_data = {'surnames': surnames_data['surnames']}
-        if names_path:
-            with Path(names_path).open(encoding='utf-8') as f:
-                names_data = json.load(f)
-                name_data.update(names_data)
-
-        name_sampler = BrazilianNameSampler(
-            name_data,  # Pass the combined data
-            middle_names_path,
-            None,  # No need for names_path as we've already loaded it
-        )
+        if workers > 1 or seed is not None:
+            from .sharded_sampler import iter_sharded_chunks
 
-        # Initialize results list
-        results: list[tuple[str, NameComponents, dict[str, str]]] = []
-
-        if only_document:
-            # Document-only generation with proper state handling
-            for i in range(actual_qty):
-                documents = {}
-
-                # Generate location first to get proper state for RG
-                state_name, state_abbr, city_name = location_sampler.get_state_and_city()
-
-                # Generate all requested documents
-                if always_cpf or only_cpf:
-                    documents['cpf'] = doc_sampler.generate_cpf()
-                if always_pis or only_pis:
-                    documents['pis'] = doc_sampler.generate_pis()
-                if always_cnpj or only_cnpj:
-                    documents['cnpj'] = doc_sampler.generate_cnpj()
-                if always_cei or only_cei:
-                    documents['cei'] = doc_sampler.generate_cei()
-                if always_rg or only_rg:
-                    documents['rg'] = f'{doc_sampler.generate_rg(state_abbr, include_issuer)}'
-                if always_phone or only_fone:
-                    # Get the DDD from the city data
-                    city_data = location_sampler.city_data_by_name.get(city_name, {})
-                    ddd = city_data.get('ddd', None)
-                    documents['phone'] = generate_phone_number(ddd)
-
-                results.append((None, None, documents))
-
-                # Report progress if callback is provided
-                if progress_callback and i % max(1, actual_qty // 100) == 0:
-                    progress_callback(i + 1, 'Generating documents')
-
-        elif any([only_cpf, only_pis, only_cnpj, only_cei, only_rg, only_fone]):
-            # Handle document-only generation with proper state handling
-            for i in range(actual_qty):
-                documents = {}
-
-                # No need to reload location data - already loaded once at the beginning
-
-                # Generate location first to get proper state for RG
-                state_name, state_abbr, city_name = location_sampler.get_state_and_city()
-                if only_cpf:
-                    documents['cpf'] = doc_sampler.generate_cpf()
-                if only_pis:
-                    documents['pis'] = doc_sampler.generate_pis()
-                if only_cnpj:
-                    documents['cnpj'] = doc_sampler.generate_cnpj()
-                if only_cei:
-                    documents['cei'] = doc_sampler.generate_cei()
-                if only_rg:
-                    documents['rg'] = f'{doc_sampler.generate_rg(state_abbr, include_issuer)}'
-                if only_fone:
-                    # Get the DDD from the city data
-                    city_data = location_sampler.city_data_by_name.get(city_name, {})
-                    ddd = city_data.get('ddd', None)
-                    documents['phone'] = generate_phone_number(ddd)
-
-                results.append((None, None, documents))
-
-                # Report progress if callback is provided
-                if progress_callback and i % max(1, actual_qty // 100) == 0:
-                    progress_callback(i + 1, 'Generating specific documents')
-
-        elif return_only_name or only_surname or only_middle:
-            # Name-only generation
-            for i in range(actual_qty):
-                documents = {}
-                name_components = None
-
-                # No need to reload location data - already loaded once at the beginning
-
-                # Generate location first to get proper state and DDD
-                state_name, state_abbr, city_name = location_sampler.get_state_and_city()
-
-                if only_surname:
-                    name_components = NameComponents(
-                        '', None, name_sampler.get_random_surname(top_40=top_40, raw=name_raw, with_only_one_surname=with_only_one_surname)
-                    )
-                elif only_middle:
-                    name_components = name_sampler.get_random_name(raw=name_raw, only_middle=True, return_components=True)
-                else:
-                    name_components = name_sampler.get_random_name(
-                        time_period=time_period,
-                        raw=name_raw,
-                        include_surname=True,
-                        top_40=top_40,
-                        with_only_one_surname=with_only_one_surname,
-                        always_middle=always_middle,
-                        return_components=True,
-                    )
-
-                    # Add documents for full names
-                    if always_cpf:
-                        documents['cpf'] = doc_sampler.generate_cpf()
-                    if always_pis:
-                        documents['pis'] = doc_sampler.generate_pis()
-                    if always_cnpj:
-                        documents['cnpj'] = doc_sampler.generate_cnpj()
-                    if always_cei:
-                        documents['cei'] = doc_sampler.generate_cei()
-                    if always_rg:
-                        # Use the generated state for RG
-                        documents['rg'] = f'{doc_sampler.generate_rg(state_abbr, include_issuer)}'
-                    if always_phone:
-                        # Get the DDD from the city data
-                        city_data = location_sampler.city_data_by_name.get(city_name, {})
-                        ddd = city_data.get('ddd', None)
-                        documents['phone'] = generate_phone_number(ddd)
-
-                # Add the location string for name-only results
-                location_str = f'{city_name} - , {state_name} ({state_abbr})'
-                results.append((location_str, name_components, documents))
-
-                # Report progress if callback is provided
-                if progress_callback and i % max(1, actual_qty // 100) == 0:
-                    progress_callback(i + 1, 'Generating names')
+            chunks = iter_sharded_chunks(actual_qty, workers, seed, progress_callback=progress_callback, **options)
         else:
-            # Full sample generation with location, name, and documents
-            for i in range(actual_qty):
-                documents = {}
-
-                # No need to reload location data - already loaded once at the beginning
-
-                # Generate location first to ensure proper state handling
-                state_name, state_abbr, city_name = location_sampler.get_state_and_city()
-
-                # Format location string
-                if city_only:
-                    location = city_name
-                elif state_abbr_only:
-                    location = state_abbr
-                elif state_full_only:
-                    location = state_name
-                elif only_cep:
-                    location = location_sampler._get_random_cep_for_city(city_name)
-                    location = location_sampler._format_cep(location, not cep_without_dash)
-                else:
-                    location = location_sampler.format_full_location(
-                        city_name, state_name, state_abbr, include_cep=True, cep_without_dash=cep_without_dash
-                    )
-
-                # Generate documents using the correct state
-                if always_cpf or only_cpf:
-                    documents['cpf'] = doc_sampler.generate_cpf()
-                if always_pis or only_pis:
-                    documents['pis'] = doc_sampler.generate_pis()
-                if always_cnpj or only_cnpj:
-                    documents['cnpj'] = doc_sampler.generate_cnpj()
-                if always_cei or only_cei:
-                    documents['cei'] = doc_sampler.generate_cei()
-                if always_rg or only_rg:
-                    # Always use the state from our location for RG generation
-                    documents['rg'] = f'{doc_sampler.generate_rg(state_abbr, include_issuer)}'
-                if always_phone or only_fone:
-                    # Get the DDD from the city data
-                    city_data = location_sampler.city_data_by_name.get(city_name, {})
-                    ddd = city_data.get('ddd', None)
-                    documents['phone'] = generate_phone_number(ddd)
-
-                # Generate name components if needed
-                name_components = None
-
-                name_components = name_sampler.get_random_name(
-                    time_period=time_period,
-                    raw=name_raw,
-                    include_surname=True,
-                    top_40=top_40,
-                    with_only_one_surname=with_only_one_surname,
-                    always_middle=always_middle,
-                    return_components=True,
-                )
-
-                results.append((location, name_components, documents))
-
-                # Report progress if callback is provided
-                if progress_callback and i % max(1, actual_qty // 100) == 0:
-                    progress_callback(i + 1, 'Generating complete profiles')
-
-        # Collect all CEPs that will be used
-        all_ceps = []
-        all_state_city_info = []
-
-        # Update progress to indicate we're starting address generation
-        if progress_callback:
-            progress_callback(actual_qty // 2, 'Preparing address data')  # Show approximately half-way progress
-
-        # For all types of generation
-        for i in range(actual_qty):
-            # Generate a new state and city
-            state_name, state_abbr, city_name = location_sampler.get_state_and_city()
-
-            all_state_city_info.append((state_name, state_abbr, city_name))
-
-            # Get a random CEP for the city
-            cep = location_sampler._get_random_cep_for_city(city_name)
-            formatted_cep = location_sampler._format_cep(cep, not cep_without_dash)
-            all_ceps.append(formatted_cep)
-
-        # Update progress to indicate we're making API calls if applicable
-        if progress_callback and make_api_call:
-            progress_callback(actual_qty * 3 // 4, 'API calls starting')  # Show approximately 75% progress
-
-        # Get address data for all CEPs at once
-        address_data_list = asyncio.run(get_address_data_batch(all_ceps, make_api_call, progress_callback))
-
-        # Update progress to indicate API calls are complete
-        if progress_callback and make_api_call:
-            progress_callback(actual_qty * 4 // 5, 'API calls completed')
-
-        # Update progress to indicate we're finalizing results
-        if progress_callback:
-            progress_callback(actual_qty * 9 // 10, 'Finalizing results')  # Show approximately 90% progress
-
-        # Modify the results to include state_info and address data
-        results_with_state_info = []
+            chunks = iter_sample_chunks(actual_qty, progress_callback=progress_callback, **options)
 
-        for i in range(actual_qty):
-            state_name, state_abbr, city_name = all_state_city_info[i]
-            formatted_cep = all_ceps[i]
-
-            # Format the full location string with CEP
-            # The parse_result function expects the format: "city - cep, state (abbr)"
-            location_str = f'{city_name} - {formatted_cep}, {state_name} ({state_abbr})'
-
-            # Get the corresponding result
-            location, name_components, documents = results[i]
-
-            # Update the phone number to use the correct DDD
-            if 'phone' in documents:
-                # Get the DDD from the city data
-                city_data = location_sampler.city_data_by_name.get(city_name, {})
-                ddd = city_data.get('ddd', None)
-                documents['phone'] = generate_phone_number(ddd)
-
-            # Add to the new results list with state_info
-            results_with_state_info.append((location_str, name_components, documents))
-
-        # Convert results to dictionary format
         parsed_results = []
-        for i, (location, name_components, documents) in enumerate(results_with_state_info):
-            # Get the corresponding address data
-            address_data = address_data_list[i] if i < len(address_data_list) else {}
-
-            # Parse the location string to extract city, state, and CEP
-            result_dict = parse_result(location, name_components, documents, state_info=None, address_data=address_data)
-            parsed_results.append(result_dict)
-
-        # Save to JSONL if requested
-        if save_to_jsonl:
-            if progress_callback:
-                progress_callback(actual_qty * 95 // 100, 'Saving to JSONL file')
-
-            if isinstance(parsed_results, list):
-                asyncio.run(save_to_jsonl_file(parsed_results, save_to_jsonl, append=append_to_jsonl))
-            else:
-                asyncio.run(save_to_jsonl_file([parsed_results], save_to_jsonl, append=append_to_jsonl))
+        for chunk in chunks:
+            # Save each chunk to JSONL as soon as it's ready
+            if save_to_jsonl:
+                asyncio.run(save_to_jsonl_file(chunk, save_to_jsonl, append=append_to_jsonl or bool(parsed_results)))
+            parsed_results.extend(chunk)
 
         # Final progress update to indicate completion
         if progress_callback:
@@ -0,0 +1,189 @@
+"""
+Sharded Sample Generator
+
+Parallel generation of Brazilian samples over a process pool. The requested
+quantity is split into fixed-size shards, each generated from its own seed
+derived from a base seed, so the output only depends on the base seed and the
+shard size - not on the number of workers.
+"""
+
+import asyncio
+import hashlib
+import random
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from .sampler import _chunk_sizes, _generate_chunks, _load_samplers_from_options, _resolve_options, save_to_jsonl_file
+
+# Default number of rows per shard
+DEFAULT_SHARD_SIZE = 10_000
+
+# Samplers, options and the RNG they share, loaded once per worker process by _init_worker
+_worker_samplers = None
+_worker_options = None
+_worker_rng = None
+
+
+def derive_shard_seed(base_seed: int, shard_index: int) -> int:
+    """Derive a stable 64-bit seed for a shard from the base seed.
+
+    Args:
+        base_seed: Seed of the whole run
+        shard_index: Zero-based shard index
+
+    Returns:
+        Seed for the shard
+    """
+    digest = hashlib.sha256(f'{base_seed}:{shard_index}'.encode()).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+def shard_path(filename: str | Path, shard_index: int) -> Path:
+    """Return the per-shard JSONL path for a base output filename (e.g. out.jsonl -> out-00003.jsonl)."""
+    path = Path(filename)
+    return path.with_name(f'{path.stem}-{shard_index:05d}{path.suffix or ".jsonl"}')
+
+
+def _init_worker(options: dict) -> None:
+    """Load the samplers once for the current (worker) process."""
+    global _worker_samplers, _worker_options, _worker_rng  # noqa: PLW0603
+    _worker_options = options
+    _worker_rng = random.Random()
+    _worker_samplers = _load_samplers_from_options(options, _worker_rng)
+
+
+def _run_shard(size: int, seed: int, output_path: str | None = None) -> list[dict] | int:
+    """Generate one shard with the worker's samplers.
+
+    Args:
+        size: Number of rows in the shard
+        seed: Shard seed
+        output_path: If given, write the shard to this JSONL file instead of returning it
+
+    Returns:
+        The shard's records, or the number of records written when output_path is given
+    """
+    _worker_rng.seed(seed)
+    chunks = _generate_chunks(_worker_samplers, _worker_options, size)
+
+    if output_path is None:
+        return [record for chunk in chunks for record in chunk]
+
+    written = 0
+    for chunk in chunks:
+        asyncio.run(save_to_jsonl_file(chunk, output_path, append=written > 0))
+        written += len(chunk)
+    return written
+
+
+def _run_shards(
+    options: dict,
+    sizes: list[int],
+    seeds: list[int],
+    output_paths: list[str | None],
+    workers: int,
+) -> Iterator[list[dict] | int]:
+    """Run the shards in order, in-process or over a bounded window of pool tasks."""
+    if workers <= 1:
+        _init_worker(options)
+        for size, seed, output_path in zip(sizes, seeds, output_paths):
+            yield _run_shard(size, seed, output_path)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(options,)) as executor:
+        # Keep at most two shards per worker in flight so finished shards don't pile up in memory
+        pending: deque[Future] = deque()
+        tasks = iter(zip(sizes, seeds, output_paths))
+        for size, seed, output_path in tasks:
+            pending.append(executor.submit(_run_shard, size, seed, output_path))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            result = pending.popleft().result()
+            next_task = next(tasks, None)
+            if next_task is not None:
+                pending.append(executor.submit(_run_shard, *next_task))
+            yield result
+
+
+def iter_sharded_chunks(
+    qty: int,
+    workers: int = 1,
+    seed: int | None = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    progress_callback: Callable | None = None,
+    **options: Any,
+) -> Iterator[list[dict]]:
+    """Generate samples over a process pool, yielding one chunk per shard in shard order.
+
+    Args:
+        qty: Number of samples to generate
+        workers: Number of worker processes (1 runs the shards in-process)
+        seed: Base seed. Shard seeds are derived from it; a random one is used if None
+        shard_size: Number of rows per shard
+        progress_callback: Optional callback function to report progress (takes completed count and stage)
+        **options: Any of the sample() options (see DEFAULT_OPTIONS)
+
+    Yields:
+        Lists of parsed sample dictionaries, one per shard
+    """
+    options = _resolve_options(options)
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+
+    sizes = list(_chunk_sizes(qty, shard_size))
+    seeds = [derive_shard_seed(seed, i) for i in range(len(sizes))]
+
+    completed = 0
+    for records in _run_shards(options, sizes, seeds, [None] * len(sizes), workers):
+        completed += len(records)
+        if progress_callback:
+            progress_callback(completed, 'Generating shards')
+        yield records
+
+
+def write_sharded_jsonl(
+    filename: str | Path,
+    qty: int,
+    workers: int = 1,
+    seed: int | None = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    progress_callback: Callable | None = None,
+    **options: Any,
+) -> list[Path]:
+    """Generate samples over a process pool, each worker writing its shards to their own JSONL file.
+
+    Shard files are named after filename with the shard index appended (see shard_path)
+    and are always overwritten.
+
+    Args:
+        filename: Base output filename
+        qty: Number of samples to generate
+        workers: Number of worker processes (1 runs the shards in-process)
+        seed: Base seed. Shard seeds are derived from it; a random one is used if None
+        shard_size: Number of rows per shard
+        progress_callback: Optional callback function to report progress (takes completed count and stage)
+        **options: Any of the sample() options (see DEFAULT_OPTIONS)
+
+    Returns:
+        Paths of the written shard files, in shard order
+    """
+    options = _resolve_options(options)
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+
+    sizes = list(_chunk_sizes(qty, shard_size))
+    seeds = [derive_shard_seed(seed, i) for i in range(len(sizes))]
+    paths = [shard_path(filename, i) for i in range(len(sizes))]
+    if paths:
+        paths[0].parent.mkdir(parents=True, exist_ok=True)
+
+    completed = 0
+    for written in _run_shards(options, sizes, seeds, [str(path) for path in paths], workers):
+        completed += written
+        if progress_callback:
+            progress_callback(completed, 'Writing shards')
+    return paths
@@ -1,12 +1,14 @@
 """Test configuration and fixtures."""
 
 import json
+import sys
+import textwrap
 from pathlib import Path
 from typing import Any
 
 import pytest
 
-from src.time_period import TimePeriod
+from src.br_name_class import TimePeriod
 
 
 @pytest.fixture
@@ -32,3 +34,40 @@ def minimal_test_data() -> dict[str, Any]:
             'top_40': {'TEST': {'percentage': 1.0}},
         },
     }
+
+
+# Stand-in for cep_worker.js speaking the same JSON-lines protocol. CEP 99999999
+# kills the first worker spawned so retries can be exercised, CEPs starting with 8
+# answer slowly, 77777777 kills every worker and 66666666 reports that every
+# upstream provider failed.
+FAKE_WORKER = textwrap.dedent(
+    """
+    import json, os, sys, time
+    spawns = sys.argv[1]
+    with open(spawns, 'a') as f:
+        f.write('x')
+    for line in sys.stdin:
+        request = json.loads(line)
+        if request['cep'] == '99999999' and len(open(spawns).read()) == 1:
+            sys.exit(1)
+        if request['cep'] == '77777777':
+            sys.exit(1)
+        if request['cep'].startswith('8'):
+            time.sleep(0.2)
+        result = {'cep': request['cep'][:5] + '-' + request['cep'][5:], 'state': 'SP', 'city': 'São Paulo', 'pid': os.getpid()}
+        if request['cep'] == '00000000':
+            result = {'error': 'CEP não encontrado', 'cep': request['cep']}
+        if request['cep'] == '66666666':
+            result = {'error': 'Todos os serviços de CEP retornaram erro.', 'cep': request['cep'], 'retryable': True}
+        print(json.dumps({'id': request['id'], 'result': result}), flush=True)
+    """
+)
+
+
+@pytest.fixture
+def worker_command(tmp_path) -> tuple[list[str], Path]:
+    """Command starting a fake worker, plus the file counting how many were spawned."""
+    script = tmp_path / 'fake_worker.py'
+    script.write_text(FAKE_WORKER, encoding='utf-8')
+    spawns = tmp_path / 'spawns'
+    return [sys.executable, str(script), str(spawns)], spawns
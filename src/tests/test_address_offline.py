@@ -0,0 +1,57 @@
+"""Tests for the offline address provider."""
+
+import json
+import random
+
+from src.br_name_class import TimePeriod
+from src.utils.address_for_offline import AddressProvider_for_offline
+
+
+def test_name_pool_is_loaded_once(monkeypatch, tmp_path) -> None:
+    """Test that the names file is read once and its pool shared by every provider."""
+    names = {'Maria': {'percentage': 0.6}, 'José': {'percentage': 0.4}}
+    names_path = tmp_path / 'names_data.json'
+    names_data = {'common_names_percentage': {period.value: {'names': names} for period in TimePeriod}}
+    names_path.write_text(json.dumps(names_data), encoding='utf-8')
+
+    reads = []
+    read_name_pool = AddressProvider_for_offline._read_name_pool
+    counting_read = staticmethod(lambda path: reads.append(path) or read_name_pool(path))
+    monkeypatch.setattr(AddressProvider_for_offline, '_read_name_pool', counting_read)
+
+    pool = AddressProvider_for_offline.load_name_pool(names_path)
+    assert set(pool) == {'Maria', 'José'} and len(pool) == 2 * len(TimePeriod)
+    assert AddressProvider_for_offline.load_name_pool(str(names_path)) is pool
+    drawn = {AddressProvider_for_offline(random.Random(i)).non_weighted_random_name(str(names_path)) for i in range(20)}
+    assert drawn == {'Maria', 'José'}
+    assert len(reads) == 1
+
+
+def test_first_names_batch() -> None:
+    """Test batched first names drawn from an injected pool."""
+    provider = AddressProvider_for_offline(random.Random(1), name_pool=['Ana', 'Bia'])
+    names = provider.first_names(50)
+    assert len(names) == 50 and set(names) == {'Ana', 'Bia'}
+    assert provider.first_name() in ('Ana', 'Bia')
+    assert AddressProvider_for_offline(random.Random(1), name_pool=['Ana', 'Bia']).first_names(50) == names
+
+
+def test_unreadable_names_file_falls_back(tmp_path) -> None:
+    """Test that a missing names file yields the default name."""
+    assert AddressProvider_for_offline.load_name_pool(tmp_path / 'missing.json') == ('Maria',)
+
+
+def test_generate_addresses_fills_only_empty_fields() -> None:
+    """Test the bulk address columns, with and without API answers to keep."""
+    provider = AddressProvider_for_offline(random.Random(3))
+    columns = provider.generate_addresses(['01001000', '20040-002'])
+    assert columns['cep'] == ['01001-000', '20040-002']
+    assert all(street.split(' ')[0] in provider.street_prefixes for street in columns['street'])
+    assert all(neighborhood in provider.bairros for neighborhood in columns['neighborhood'])
+    assert all(1 <= int(number) <= 999 for number in columns['building_number'])
+
+    existing = [{'street': 'Praça da Sé', 'neighborhood': '', 'cep': '01001-000'}, {'street': '', 'neighborhood': 'Centro'}]
+    columns = provider.generate_addresses(['01001-000', '20040002'], existing=existing)
+    assert columns['street'][0] == 'Praça da Sé' and columns['street'][1]
+    assert columns['neighborhood'][0] in provider.bairros and columns['neighborhood'][1] == 'Centro'
+    assert all(columns['building_number']) and columns['cep'] == ['01001-000', '20040-002']
@@ -0,0 +1,42 @@
+"""Tests for the AliasTable weighted sampler."""
+
+import random
+from collections import Counter
+
+import pytest
+
+from src.br_name_class import BrazilianNameSampler, TimePeriod
+from src.utils.alias_table import AliasTable
+
+
+def test_alias_table_matches_weights() -> None:
+    """Test that draw frequencies follow the configured weights."""
+    table = AliasTable([0.1, 0.2, 0.7])
+    counts = Counter(table.sample_many(100_000, rng=random.Random(42)))
+    assert counts[0] / 100_000 == pytest.approx(0.1, abs=0.01)
+    assert counts[1] / 100_000 == pytest.approx(0.2, abs=0.01)
+    assert counts[2] / 100_000 == pytest.approx(0.7, abs=0.01)
+
+
+def test_alias_table_never_draws_zero_weight() -> None:
+    """Test that outcomes with zero weight are never selected."""
+    table = AliasTable([0.0, 1.0, 0.0, 3.0])
+    rng = random.Random(7)
+    assert {table.sample(rng) for _ in range(10_000)} == {1, 3}
+
+
+def test_alias_table_invalid_weights() -> None:
+    """Test that invalid weight lists are rejected."""
+    with pytest.raises(ValueError):
+        AliasTable([])
+    with pytest.raises(ValueError):
+        AliasTable([0.0, 0.0])
+    with pytest.raises(ValueError):
+        AliasTable([1.0, -0.5])
+
+
+def test_first_name_tables_built_per_period(minimal_test_data) -> None:
+    """Test that the name sampler precomputes one table per time period."""
+    sampler = BrazilianNameSampler(minimal_test_data)
+    assert set(sampler._first_name_tables) == {period.value for period in TimePeriod}
+    assert sampler.get_random_name(include_surname=False) == 'TEST'
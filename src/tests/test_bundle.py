@@ -0,0 +1,99 @@
+"""Tests for the compiled sampler bundle in src.bundle."""
+
+import json
+import os
+import random
+from pathlib import Path
+
+import pytest
+
+from src.br_name_class import TimePeriod
+from src.bundle import bundle_path, read_bundle
+from src.sampler import build_bundle, load_samplers
+
+DATA_DIR = Path(__file__).parents[1] / 'data'
+
+
+@pytest.fixture
+def sources(tmp_path) -> tuple[Path, Path, Path, Path, None]:
+    """Small data files in load_samplers argument order."""
+    names = {'Maria': {'percentage': 0.6}, 'José': {'percentage': 0.4}}
+    names_path = tmp_path / 'names_data.json'
+    names_path.write_text(
+        json.dumps({'common_names_percentage': {period.value: {'names': names, 'total': 2} for period in TimePeriod}}), encoding='utf-8'
+    )
+    surnames_path = tmp_path / 'surnames_data.json'
+    surnames_path.write_text(json.dumps({'surnames': {'SILVA': {'percentage': 0.6}, 'ALVES': {'percentage': 0.4}}}), encoding='utf-8')
+    locations_path = tmp_path / 'locations.json'
+    locations_path.write_text(
+        json.dumps(
+            {
+                'states': {'São Paulo': {'state_abbr': 'SP', 'population_percentage': 1.0}},
+                'cities': {
+                    'São Paulo': {
+                        'city_name': 'São Paulo',
+                        'city_uf': 'SP',
+                        'population_percentage_state': 1.0,
+                        'cep_range_begins': '01000-000',
+                        'cep_range_ends': '05999-999',
+                    }
+                },
+            }
+        ),
+        encoding='utf-8',
+    )
+    return locations_path, names_path, DATA_DIR / 'middle_names.json', surnames_path, None
+
+
+def draws(samplers: tuple) -> list:
+    location_sampler, doc_sampler, name_sampler = samplers
+    return [(location_sampler.get_state_and_city(), name_sampler.get_random_name(), doc_sampler.generate_cpf()) for _ in range(20)]
+
+
+def test_bundle_matches_json(tmp_path, sources) -> None:
+    """Test that samplers restored from a bundle draw exactly what freshly loaded ones do."""
+    path = build_bundle(*sources, bundle_dir=tmp_path / 'bundles')
+    assert path == bundle_path(sources, tmp_path / 'bundles')
+
+    restored = load_samplers(*sources, rng=random.Random(3), bundle_dir=tmp_path / 'bundles')
+    assert restored[0].rng is restored[2].rng
+    assert restored[0]._cep_index is not None
+    assert draws(restored) == draws(load_samplers(*sources, rng=random.Random(3), bundle_dir=None))
+
+
+def test_bundle_is_only_used_for_its_sources(tmp_path, sources) -> None:
+    """Test that no bundle is created implicitly and that other data files don't use it."""
+    bundles = tmp_path / 'bundles'
+    load_samplers(*sources, bundle_dir=bundles)
+    assert not bundles.exists()
+
+    build_bundle(*sources, bundle_dir=bundles)
+    other = (sources[0], sources[1], sources[2], sources[3], sources[0])
+    assert bundle_path(other, bundles) != bundle_path(sources, bundles)
+    assert not bundle_path(other, bundles).exists()
+
+
+def test_stale_bundle_is_rebuilt(tmp_path, sources) -> None:
+    """Test that a changed source invalidates the bundle and load_samplers rebuilds it."""
+    path = build_bundle(*sources, bundle_dir=tmp_path / 'bundles')
+    assert read_bundle(path) is not None
+
+    surnames_path = sources[3]
+    surnames_path.write_text(json.dumps({'surnames': {'ALMEIDA': {'percentage': 1.0}}}), encoding='utf-8')
+    os.utime(surnames_path, ns=(0, 0))
+    assert read_bundle(path) is None
+
+    location_sampler, _, name_sampler = load_samplers(*sources, bundle_dir=tmp_path / 'bundles')
+    assert name_sampler.get_random_surname(with_only_one_surname=True) == 'ALMEIDA'
+    restored = read_bundle(path)
+    assert restored is not None
+    assert restored[1].get_random_surname(with_only_one_surname=True) == 'ALMEIDA'
+
+
+def test_corrupt_bundle_is_ignored(tmp_path, sources) -> None:
+    """Test that an unreadable bundle falls back to the data files and gets replaced."""
+    path = build_bundle(*sources, bundle_dir=tmp_path / 'bundles')
+    path.write_bytes(b'not a pickle')
+    assert read_bundle(path) is None
+    assert load_samplers(*sources, bundle_dir=tmp_path / 'bundles')[0].get_state_and_city() == ('São Paulo', 'SP', 'São Paulo')
+    assert read_bundle(path) is not None
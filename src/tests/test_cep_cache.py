@@ -0,0 +1,69 @@
+"""Tests for the persistent CEP response cache in src.utils.cep_cache."""
+
+import asyncio
+
+import pytest
+
+from src.utils.cep_cache import CepCache
+from src.utils.cep_wrapper import CepWorkerPool, workers_for_multiple_cep
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_and_negative_caching(tmp_path) -> None:
+    """Test that answers and failures expire after their own TTLs and retryable failures aren't stored."""
+    clock = FakeClock()
+    with CepCache(tmp_path / 'cache.sqlite3', ttl=100, error_ttl=10, clock=clock) as cache:
+        cache.put('01001-000', {'cep': '01001-000', 'city': 'São Paulo'})
+        cache.put('00000000', {'error': 'CEP não encontrado', 'cep': '00000000'})
+        cache.put('11111111', {'error': 'worker failed', 'cep': '11111111', 'retryable': True})
+
+        assert cache.get('01001000') == {'cep': '01001-000', 'city': 'São Paulo'}
+        assert cache.get('00000-000')['error'] == 'CEP não encontrado'
+        assert cache.get('11111111') is None
+
+        clock.now += 50
+        assert cache.get('00000000') is None
+        assert cache.get('01001-000') is not None
+        clock.now += 51
+        assert cache.get('01001-000') is None
+        assert cache.purge_expired() == 2
+
+        assert (cache.stats.hits, cache.stats.misses, cache.stats.writes) == (3, 3, 2)
+
+
+def test_invalid_ttl(tmp_path) -> None:
+    """Test that negative TTLs are rejected."""
+    with pytest.raises(ValueError, match='non-negative'):
+        CepCache(tmp_path / 'cache.sqlite3', ttl=-1)
+
+
+def test_second_run_needs_no_lookups(tmp_path, worker_command) -> None:
+    """Test that a repeated batch is answered entirely from the cache, across cache instances."""
+    command, spawns = worker_command
+    ceps = ['01001000', '20040002', '00000000', '30130010']
+    path = tmp_path / 'cache.sqlite3'
+
+    async def run(pool: CepWorkerPool) -> list[dict]:
+        with CepCache(path) as cache:
+            results = await workers_for_multiple_cep(ceps, pool=pool, cache=cache)
+            await pool.close()
+            return results, cache.stats
+
+    first, first_stats = asyncio.run(run(CepWorkerPool(size=2, command=command)))
+    assert first_stats.misses == 4 and first_stats.hits == 0
+    assert len(spawns.read_text()) >= 1
+
+    # A pool that cannot start any worker: any lookup would come back as an error
+    second, second_stats = asyncio.run(run(CepWorkerPool(size=1, command=['/nonexistent/cep-worker'])))
+    assert second == first
+    assert second_stats.hits == 4 and second_stats.misses == 0
+    assert first[2]['error'] == 'CEP não encontrado'
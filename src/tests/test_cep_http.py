@@ -0,0 +1,160 @@
+"""Tests for the asyncio HTTP CEP backend in src.utils.cep_http, against a local stand-in server."""
+
+import asyncio
+import json
+
+import pytest
+
+from src.utils.cep_http import HttpCepClient
+from src.utils.cep_limiter import AdaptiveLimiter, CircuitBreaker
+from src.utils.cep_wrapper import CepWorkerPool, _new_backend
+
+CANNED = {
+    '01001000': {'cep': '01001000', 'state': 'SP', 'city': 'São Paulo', 'neighborhood': 'Sé', 'street': 'Praça da Sé', 'service': 'correios'},
+    '20040002': {'cep': '20040002', 'state': 'RJ', 'city': 'Rio de Janeiro', 'neighborhood': 'Centro', 'street': 'Rua da Assembleia'},
+}
+
+
+class StandInServer:
+    """Minimal keep-alive HTTP/1.1 server answering /api/cep/v1/<cep> and /ws/<cep>/json/ from CANNED."""
+
+    def __init__(self) -> None:
+        self.connections = 0
+        self.requests = 0
+        self.flaky: set[str] = set()  # CEPs answered with 503 once
+        self.server: asyncio.Server | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f'http://{host}:{port}'
+
+    async def __aenter__(self) -> 'StandInServer':
+        self.server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    def _respond(self, path: str) -> tuple[int, bytes, bool]:
+        cep = [segment for segment in path.split('/') if segment.isdigit()][0]
+        if cep in self.flaky:
+            self.flaky.discard(cep)
+            return 503, b'busy', False
+        data = CANNED.get(cep)
+        if path.startswith('/ws/'):
+            data = {'cep': f'{cep[:5]}-{cep[5:]}', 'uf': data['state'], 'localidade': data['city'], 'bairro': data['neighborhood'],
+                    'logradouro': data['street']} if data else {'erro': True}  # fmt: skip
+            return 200, json.dumps(data).encode(), True
+        if data is None:
+            return 404, json.dumps({'message': 'CEP não encontrado'}).encode(), False
+        return 200, json.dumps(data).encode(), True
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            await self._serve(reader, writer)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        writer.close()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        while request_line := await reader.readline():
+            while (await reader.readline()) not in (b'\r\n', b''):
+                pass
+            self.requests += 1
+            status, body, chunked = self._respond(request_line.split()[1].decode())
+            if chunked:
+                half = len(body) // 2
+                payload = b''.join(f'{len(part):x}\r\n'.encode() + part + b'\r\n' for part in (body[:half], body[half:])) + b'0\r\n\r\n'
+                writer.write(f'HTTP/1.1 {status} OK\r\nTransfer-Encoding: chunked\r\n\r\n'.encode() + payload)
+            else:
+                writer.write(f'HTTP/1.1 {status} X\r\nContent-Length: {len(body)}\r\n\r\n'.encode() + body)
+            await writer.drain()
+
+
+@pytest.mark.parametrize('pipeline_depth', [1, 4])
+def test_pooled_keep_alive_lookups(pipeline_depth) -> None:
+    """Test that many lookups share a few keep-alive connections, with and without pipelining."""
+    ceps = ['01001000', '20040002', '99999999'] * 10
+
+    async def run() -> tuple[list[dict], int, int]:
+        async with StandInServer() as server:
+            async with HttpCepClient(base_url=server.url, pool_size=2, pipeline_depth=pipeline_depth) as client:
+                results = await client.lookup_many(ceps)
+                return results, server.connections, client.connections_opened
+
+    results, server_connections, opened = asyncio.run(run())
+    assert results[0]['street'] == 'Praça da Sé' and results[0]['state'] == 'SP'
+    assert results[1]['city'] == 'Rio de Janeiro'
+    assert results[2] == {'error': 'CEP não encontrado', 'cep': '99999999'}
+    assert results == results[:3] * 10
+    assert server_connections == opened <= 2
+
+
+def test_pipelined_lookups_honour_max_in_flight() -> None:
+    """Test that pipelined batches respect max_in_flight, feed the limiter latencies and are all closed."""
+    ceps = ['01001000', '20040002', '99999999'] * 10
+    limiter = AdaptiveLimiter()
+
+    async def run() -> tuple[list[dict], int, list]:
+        async with StandInServer() as server:
+            client = HttpCepClient(base_url=server.url, pool_size=4, pipeline_depth=4, limiter=limiter)
+            async with client:
+                results = await client.lookup_many(ceps, max_in_flight=3)
+                connections = list(client._idle)
+            return results, client.connections_opened, connections
+
+    results, opened, connections = asyncio.run(run())
+    assert results == results[:3] * 10
+    assert opened == 1
+    assert limiter.metrics()['latency_ewma'] is not None
+    assert connections and all(connection.writer.is_closing() for connection in connections)
+
+
+def test_viacep_format_and_retry_on_503() -> None:
+    """Test ViaCEP-style responses and that a 503 is retried."""
+
+    async def run() -> tuple[list[dict], int]:
+        async with StandInServer() as server:
+            server.flaky.add('01001000')
+            async with HttpCepClient('viacep', base_url=server.url, pool_size=1) as client:
+                return await client.lookup_many(['01001-000', '00000000']), server.requests
+
+    results, requests = asyncio.run(run())
+    assert results[0] == {
+        'cep': '01001-000', 'state': 'SP', 'city': 'São Paulo', 'neighborhood': 'Sé', 'street': 'Praça da Sé', 'service': 'viacep'
+    }  # fmt: skip
+    assert results[1]['error'] == 'CEP não encontrado'
+    assert requests == 3
+
+
+def test_unreachable_service_trips_breaker() -> None:
+    """Test that connection failures are retried, then reported as retryable errors."""
+    breaker = CircuitBreaker(failure_threshold=2)
+
+    async def run() -> dict:
+        async with StandInServer() as server:
+            url = server.url
+        async with HttpCepClient(base_url=url, max_retries=1, breaker=breaker) as client:
+            return await client.lookup('01001000')
+
+    result = asyncio.run(run())
+    assert result['retryable']
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_backend_factory_passes_pipeline_depth() -> None:
+    """Test that the pipeline depth chosen for a run reaches HTTP backends and is ignored by the worker pool."""
+    client = _new_backend('viacep', 2, pipeline_depth=4)
+    assert isinstance(client, HttpCepClient) and client.pipeline_depth == 4 and client.pool_size == 2
+    assert isinstance(_new_backend('node', 2, pipeline_depth=4), CepWorkerPool)
+
+
+def test_invalid_provider() -> None:
+    """Test that unknown providers and URL schemes are rejected."""
+    with pytest.raises(ValueError, match='Unknown CEP provider'):
+        HttpCepClient('correios')
+    with pytest.raises(ValueError, match='scheme'):
+        HttpCepClient(base_url='ftp://example.com')
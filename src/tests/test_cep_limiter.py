@@ -0,0 +1,178 @@
+"""Tests for adaptive concurrency control of CEP lookups."""
+
+import asyncio
+import json
+
+import pytest
+
+from src.sampler import get_address_data_batch
+from src.utils import cep_wrapper
+from src.utils.cep_limiter import AdaptiveLimiter, CircuitBreaker, backoff_delay
+from src.utils.cep_wrapper import CepWorkerPool
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_aimd_limit() -> None:
+    """Test additive increase on fast successes and multiplicative decrease on failures and slow answers."""
+
+    async def run() -> AdaptiveLimiter:
+        limiter = AdaptiveLimiter(initial_limit=4, min_limit=2, max_limit=6, latency_target=1.0)
+        for _ in range(8):
+            await limiter.acquire()
+            await limiter.release(ok=True, latency=0.1)
+        assert limiter.limit == 5
+        await limiter.acquire()
+        await limiter.release(ok=False)
+        assert limiter.limit == 2
+        for _ in range(50):
+            await limiter.acquire()
+            await limiter.release(ok=True, latency=0.1)
+        assert limiter.limit == 6
+        await limiter.acquire()
+        await limiter.release(ok=True, latency=5.0)
+        assert limiter.limit == 5
+        return limiter
+
+    metrics = asyncio.run(run()).metrics()
+    assert metrics['successes'] == 59 and metrics['failures'] == 1 and metrics['in_flight'] == 0
+
+
+def test_limiter_bounds_concurrency() -> None:
+    """Test that no more than limit holders run at once."""
+    limiter = AdaptiveLimiter(initial_limit=2, min_limit=2, max_limit=2)
+    running = peak = 0
+
+    async def task() -> None:
+        nonlocal running, peak
+        await limiter.acquire()
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        await limiter.release(ok=True, latency=0.01)
+
+    async def run() -> None:
+        await asyncio.gather(*(task() for _ in range(10)))
+
+    asyncio.run(run())
+    assert peak == 2
+
+
+def test_invalid_limits() -> None:
+    """Test that inconsistent limits are rejected."""
+    with pytest.raises(ValueError, match='min_limit'):
+        AdaptiveLimiter(initial_limit=1, min_limit=2)
+
+
+def test_backoff_delay_is_jittered_and_capped() -> None:
+    """Test that delays stay within the exponential ceiling and the cap."""
+    delays = [backoff_delay(attempt, base=0.1, cap=1.0) for attempt in range(10) for _ in range(20)]
+    assert all(0 <= delay <= 1.0 for delay in delays)
+    assert max(backoff_delay(0, base=0.1) for _ in range(50)) <= 0.1
+    assert len(set(delays)) > 100
+
+
+def test_circuit_breaker_states() -> None:
+    """Test closed -> open -> half-open probe -> open -> half-open probe -> closed."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=clock)
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    clock.now += 10
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # Only one probe at a time
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock.now += 10
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.metrics() == {'state': 'closed', 'consecutive_failures': 0, 'rejections': 2, 'times_opened': 2}
+
+
+def test_pool_opens_breaker_on_failing_service(worker_command) -> None:
+    """Test that a service that keeps dying trips the breaker and later lookups are short-circuited."""
+    command, spawns = worker_command
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+
+    async def run() -> list[dict]:
+        async with CepWorkerPool(size=1, command=command, max_retries=1, breaker=breaker) as pool:
+            return [await pool.lookup('77777777') for _ in range(5)]
+
+    results = asyncio.run(run())
+    assert all(result.get('retryable') for result in results)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert results[-1]['error'] == 'CEP lookups suspended: circuit breaker open'
+    assert len(spawns.read_text()) == 3
+
+
+def test_pool_backs_off_slow_service(worker_command) -> None:
+    """Test that slow answers shrink the adaptive limit."""
+    command, _ = worker_command
+    limiter = AdaptiveLimiter(initial_limit=8, latency_target=0.1)
+
+    async def run() -> list[dict]:
+        async with CepWorkerPool(size=2, command=command, limiter=limiter) as pool:
+            return await pool.lookup_many(['80000000', '80000001', '80000002', '80000003'])
+
+    results = asyncio.run(run())
+    assert [result['cep'] for result in results] == ['80000-000', '80000-001', '80000-002', '80000-003']
+    assert limiter.limit < 8
+    assert limiter.metrics()['latency_ewma'] > 0.1
+
+
+def test_open_breaker_falls_back_to_offline_addresses(monkeypatch) -> None:
+    """Test that API mode still yields complete addresses without any lookup while the breaker is open."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    monkeypatch.setattr(cep_wrapper, 'SHARED_BREAKER', breaker)
+    monkeypatch.setattr(cep_wrapper, 'DEFAULT_POOL_SIZE', 1)
+
+    addresses = asyncio.run(get_address_data_batch(['01001-000', '20040-002'], make_api_call=True))
+    assert all(address['street'] and address['neighborhood'] and address['building_number'] for address in addresses)
+    assert breaker.metrics()['rejections'] == 2
+
+
+def test_one_shot_lookup_retries_provider_failures(monkeypatch) -> None:
+    """Test that get_cep_data records retryable payloads as failures and only real answers as successes."""
+    answers = [
+        [{'error': 'Todos os serviços de CEP retornaram erro.', 'cep': '01001000', 'retryable': True}],
+        [{'cep': '01001-000', 'state': 'SP', 'city': 'São Paulo'}],
+    ]
+
+    class FinishedProcess:
+        returncode = 0
+
+        async def communicate(self) -> tuple[bytes, bytes]:
+            return json.dumps(answers.pop(0)).encode('utf-8'), b''
+
+    async def spawn(*args, **kwargs) -> FinishedProcess:
+        return FinishedProcess()
+
+    breaker = CircuitBreaker(failure_threshold=5)
+    monkeypatch.setattr(cep_wrapper, 'SHARED_BREAKER', breaker)
+    monkeypatch.setattr(cep_wrapper, 'backoff_delay', lambda attempt: 0)
+    monkeypatch.setattr(cep_wrapper.asyncio, 'create_subprocess_exec', spawn)
+
+    result = asyncio.run(cep_wrapper.get_cep_data('01001000'))
+    assert result['city'] == 'São Paulo' and not answers
+    assert breaker.metrics()['consecutive_failures'] == 0
+
+    answers.extend([[{'error': 'Todos os serviços de CEP retornaram erro.', 'cep': '01001000', 'retryable': True}]] * 5)
+    result = asyncio.run(cep_wrapper.get_cep_data('01001000'))
+    assert result['retryable'] and breaker.state == CircuitBreaker.OPEN
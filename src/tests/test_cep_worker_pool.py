@@ -0,0 +1,103 @@
+"""Tests for the long-lived CEP worker pool in src.utils.cep_wrapper."""
+
+import asyncio
+
+import pytest
+
+from src.utils.cep_cache import CepCache
+from src.utils.cep_limiter import AdaptiveLimiter, CircuitBreaker
+from src.utils.cep_wrapper import CepBackend, CepWorkerPool, workers_for_multiple_cep
+
+
+def test_pool_reuses_workers(worker_command) -> None:
+    """Test that many CEPs are answered in order by at most size worker processes."""
+    command, spawns = worker_command
+    ceps = [f'{i:08d}' for i in range(1000, 1100)] + ['00000000']
+
+    async def run() -> list[dict]:
+        async with CepWorkerPool(size=3, command=command) as pool:
+            return await workers_for_multiple_cep(ceps, max_workers=20, pool=pool)
+
+    results = asyncio.run(run())
+    assert [result['cep'].replace('-', '') for result in results] == ceps
+    assert results[-1]['error'] == 'CEP não encontrado'
+    assert len({result['pid'] for result in results[:-1]}) <= 3
+    assert len(spawns.read_text()) == 3
+
+
+def test_pool_replaces_dead_worker(worker_command) -> None:
+    """Test that a lookup in flight on a crashed worker is retried on a fresh one."""
+    command, spawns = worker_command
+
+    async def run() -> dict:
+        async with CepWorkerPool(size=1, command=command) as pool:
+            return await pool.lookup('99999999')
+
+    result = asyncio.run(run())
+    assert result['cep'] == '99999-999'
+    assert len(spawns.read_text()) == 2
+
+
+def test_pool_gives_up_without_worker() -> None:
+    """Test that an unusable worker command yields an error dictionary instead of raising."""
+    result = asyncio.run(CepWorkerPool(size=1, command=['/nonexistent/cep-worker'], max_retries=1).lookup('01001000'))
+    assert 'error' in result and result['cep'] == '01001000'
+
+
+def test_backend_requires_lookup_once() -> None:
+    """Test that a backend without _lookup_once cannot be created."""
+
+    class IncompleteBackend(CepBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteBackend()
+
+
+def test_provider_failures_are_retryable(worker_command, tmp_path) -> None:
+    """Test that upstream failures shrink the limiter, open the breaker and are not cached, unlike not-found answers."""
+    command, _ = worker_command
+    limiter = AdaptiveLimiter(initial_limit=8)
+    breaker = CircuitBreaker(failure_threshold=2)
+
+    async def run(cache: CepCache) -> list[dict]:
+        async with CepWorkerPool(size=1, command=command, max_retries=1, limiter=limiter, breaker=breaker) as pool:
+            not_found = await workers_for_multiple_cep(['00000000'], pool=pool, cache=cache)
+            return await workers_for_multiple_cep(['66666666'], pool=pool, cache=cache) + not_found
+
+    with CepCache(tmp_path / 'cache.sqlite3') as cache:
+        failed, not_found = asyncio.run(run(cache))
+        assert failed['retryable'] and failed['cep'] == '66666666'
+        assert not_found == {'error': 'CEP não encontrado', 'cep': '00000000'}
+        assert limiter.limit < 8
+        assert breaker.state == CircuitBreaker.OPEN
+        assert cache.get('66666666') is None
+        assert cache.get('00000000') == not_found
+
+
+def test_duplicates_and_concurrent_callers_share_lookups(worker_command) -> None:
+    """Test that each distinct CEP is looked up once, across duplicates and concurrent callers."""
+    command, _ = worker_command
+
+    async def run() -> tuple[list[dict], list[dict]]:
+        async with CepWorkerPool(size=2, command=command) as pool:
+            requests = 0
+            lookup = pool.lookup
+
+            async def counting_lookup(cep: str) -> dict:
+                nonlocal requests
+                requests += 1
+                return await lookup(cep)
+
+            pool.lookup = counting_lookup
+            first, second = await asyncio.gather(
+                workers_for_multiple_cep(['01001000', '01001-000', '20040002', '01001000'], pool=pool),
+                workers_for_multiple_cep(['20040002', '30130010', '01001000'], pool=pool),
+            )
+            assert requests == 3
+            return first, second
+
+    first, second = asyncio.run(run())
+    assert first[0] is first[1] is first[3] is second[2]
+    assert first[2] is second[0]
+    assert second[1]['cep'] == '30130-010'
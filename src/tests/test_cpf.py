@@ -0,0 +1,54 @@
+"""Tests for the CPF batch generator in src.utils.cpf."""
+
+import random
+
+import pytest
+
+from src.document_sampler import DocumentSampler
+from src.utils import cpf as cpf_module
+from src.utils.cpf import cpf_check_digits, random_cpfs, validate_cpf
+
+
+def test_random_cpfs_are_valid() -> None:
+    """Test that batch CPFs carry the check digits of their stems, formatted or not."""
+    formatted = random_cpfs(2000, rng=random.Random(1))
+    assert all(len(cpf) == 14 and cpf[3] == cpf[7] == '.' and cpf[11] == '-' and validate_cpf(cpf) for cpf in formatted)
+
+    raw = random_cpfs(2000, formatted=False, rng=random.Random(2))
+    assert all(len(cpf) == 11 and cpf[0] != '0' for cpf in raw)
+    assert all(cpf_check_digits(cpf[:9]) == (int(cpf[9]), int(cpf[10])) for cpf in raw)
+    assert random_cpfs(0) == []
+    with pytest.raises(ValueError):
+        random_cpfs(-1)
+
+
+def test_random_cpfs_are_reproducible() -> None:
+    """Test that the same RNG state gives the same batch."""
+    assert random_cpfs(50, rng=random.Random(7)) == random_cpfs(50, rng=random.Random(7))
+    assert DocumentSampler(rng=random.Random(7)).generate_cpfs(50) == random_cpfs(50, rng=random.Random(7))
+
+
+def test_random_cpfs_without_numpy(monkeypatch) -> None:
+    """Test the pure-Python path, whether or not numpy is installed."""
+    monkeypatch.setattr(cpf_module, 'np', None)
+    formatted = random_cpfs(2000, rng=random.Random(3))
+    assert all(len(cpf) == 14 and validate_cpf(cpf) for cpf in formatted)
+    raw = random_cpfs(2000, formatted=False, rng=random.Random(4))
+    assert all(len(cpf) == 11 and cpf[0] != '0' and validate_cpf(cpf) for cpf in raw)
+    assert random_cpfs(50, rng=random.Random(5)) == random_cpfs(50, rng=random.Random(5))
+
+
+def test_random_cpfs_with_numpy() -> None:
+    """Test the numpy path with a numpy Generator and with a seeding random.Random."""
+    np = pytest.importorskip('numpy')
+    formatted = random_cpfs(2000, rng=np.random.default_rng(3))
+    assert all(type(cpf) is str and len(cpf) == 14 and cpf[3] == cpf[7] == '.' and cpf[11] == '-' for cpf in formatted)
+    assert all(validate_cpf(cpf) for cpf in formatted)
+
+    raw = random_cpfs(2000, formatted=False, rng=np.random.default_rng(4))
+    assert all(len(cpf) == 11 and cpf[0] != '0' for cpf in raw)
+    assert all(cpf_check_digits(cpf[:9]) == (int(cpf[9]), int(cpf[10])) for cpf in raw)
+
+    assert random_cpfs(50, rng=np.random.default_rng(5)) == random_cpfs(50, rng=np.random.default_rng(5))
+    assert all(validate_cpf(cpf) for cpf in random_cpfs(500, rng=random.Random(6)))
+    assert random_cpfs(0, rng=np.random.default_rng(7)) == []
@@ -0,0 +1,85 @@
+"""Tests for the location data build in src.data_build."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src.br_location_class import BrazilianLocationSampler
+from src.data_build import build_location_data
+
+DATA_DIR = Path(__file__).parents[1] / 'data'
+
+
+@pytest.fixture
+def sources(tmp_path) -> tuple[Path, Path]:
+    """Locations and CEP source files with homonymous cities."""
+    locations = {
+        'states': {
+            'São Paulo': {'state_abbr': 'SP', 'population_percentage': 0.0},
+            'Rio de Janeiro': {'state_abbr': 'RJ', 'population_percentage': 0.0},
+        },
+        'cities': {
+            'Bom Jesus SP': {'city_name': 'Bom Jesus', 'city_uf': 'SP', 'uf_code': '35', 'city_code': '07001', 'city_population': 300},
+            'Bom Jesus RJ': {'city_name': 'Bom Jesus', 'city_uf': 'RJ', 'city_population': 100},
+            'Campinas': {'city_uf': 'SP', 'uf_code': '35', 'city_code': '09502', 'city_population': 100, 'cep_starts': '13000-000'},
+            'Borá': {'city_uf': 'SP', 'city_population': 0, 'population_percentage_total': 0.1, 'population_percentage_state': 0.2},
+            'Serra da Saudade': {'city_population': 800, 'population_percentage_total': 0.1, 'population_percentage_state': 0.2},
+        },
+    }
+    locations['cities']['Campinas']['cep_ends'] = '13139-999'
+    ceps = {
+        'cities': {
+            '1': {'city_name': 'Bom Jesus', 'city_uf': 'RJ', 'ddd': '22', 'ceps': ['28360-000']},
+            '2': {'city_name': 'Bom Jesus', 'city_uf': 'SP', 'ddd': '11', 'ceps': ['01000-000']},
+            '3': {'city_name': 'Bom Jesus', 'city_uf': 'PI', 'uf_code': '35', 'city_code': '07001', 'ddd': '12'},
+            '4': {'city_name': 'Santos', 'city_uf': 'SP', 'ddd': '13'},
+        }
+    }
+    locations_path = tmp_path / 'locations_data.json'
+    locations_path.write_text(json.dumps(locations), encoding='utf-8')
+    ceps_path = tmp_path / 'cities_with_ceps.json'
+    ceps_path.write_text(json.dumps(ceps), encoding='utf-8')
+    return locations_path, ceps_path
+
+
+def test_build_joins_and_normalizes(tmp_path, sources) -> None:
+    """Test the IBGE code / (name, UF) join, the recomputed percentages and the report."""
+    output, report_path = tmp_path / 'out' / 'locations_data_normalized.json', tmp_path / 'report.json'
+    report = build_location_data(*sources, output, report_path)
+    data = json.loads(output.read_text(encoding='utf-8'))
+    cities = data['cities']
+
+    # The IBGE code wins over the name: entry 3 belongs to the SP city despite its wrong state
+    assert cities['Bom Jesus SP']['ddd'] == '12' and 'ceps' not in cities['Bom Jesus SP']
+    assert cities['Bom Jesus RJ']['ddd'] == '22' and cities['Bom Jesus RJ']['ceps'] == ['28360-000']
+    assert 'ddd' not in cities['Campinas'] and cities['Campinas']['city_name'] == 'Campinas'
+    assert (report.matched_by_ibge_code, report.matched_by_name, report.unused_cep_entries) == (1, 1, 2)
+    assert report.unmatched == ['Campinas (SP)', 'Borá (SP)', 'Serra da Saudade ()']
+    assert report.cities_without_uf == ['Serra da Saudade']
+
+    assert cities['Bom Jesus SP']['population_percentage_total'] == pytest.approx(0.6)
+    assert cities['Bom Jesus SP']['population_percentage_state'] == pytest.approx(0.75)
+    assert data['states']['São Paulo']['state_population'] == 400
+    assert data['states']['Rio de Janeiro']['population_percentage'] == pytest.approx(0.2)
+    assert cities['Campinas']['cep_range_begins'] == '13000-000'
+    assert cities['Borá']['population_percentage_total'] == cities['Borá']['population_percentage_state'] == 0
+    assert 'Serra da Saudade' not in cities
+    assert json.loads(report_path.read_text(encoding='utf-8'))['total_population'] == 500
+
+    sampler = BrazilianLocationSampler(output)
+    assert sampler.city_records[sampler.city_index('Bom Jesus', 'RJ')]['ddd'] == '22'
+
+
+def test_rebuild_reproduces_shipped_percentages(tmp_path) -> None:
+    """Test that rebuilding the shipped normalized file leaves its percentages unchanged."""
+    output = tmp_path / 'locations_data_normalized.json'
+    report = build_location_data(DATA_DIR / 'locations_data_normalized.json', None, output)
+    shipped = json.loads((DATA_DIR / 'locations_data_normalized.json').read_text(encoding='utf-8'))
+    rebuilt = json.loads(output.read_text(encoding='utf-8'))
+
+    assert report.cities == len(shipped['cities']) and report.state_percentage_sum == pytest.approx(1.0)
+    for name, city in shipped['cities'].items():
+        assert rebuilt['cities'][name]['population_percentage_state'] == pytest.approx(city['population_percentage_state'])
+    for name, state in shipped['states'].items():
+        assert rebuilt['states'][name]['population_percentage'] == pytest.approx(state['population_percentage'])
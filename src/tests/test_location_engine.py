@@ -0,0 +1,336 @@
+"""Tests for the BrazilianLocationSampler alias-table engine."""
+
+import copy
+import dataclasses
+import json
+from collections import Counter
+
+import pytest
+
+from src.br_location_class import BrazilianLocationSampler, LocationTables
+from src.utils.cep_index import CepIndex
+
+
+@pytest.fixture
+def location_data() -> dict:
+    return {
+        'states': {
+            'São Paulo': {'state_abbr': 'SP', 'population_percentage': 0.75},
+            'Rio de Janeiro': {'state_abbr': 'RJ', 'population_percentage': 0.25},
+        },
+        'cities': {
+            'São Paulo': {
+                'city_name': 'São Paulo',
+                'city_uf': 'SP',
+                'population_percentage_total': 0.5,
+                'population_percentage_state': 2 / 3,
+                'cep_range_begins': '01000-000',
+                'cep_range_ends': '05999-999',
+            },
+            'Campinas': {
+                'city_name': 'Campinas',
+                'city_uf': 'SP',
+                'population_percentage_total': 0.25,
+                'population_percentage_state': 1 / 3,
+                'cep_range_begins': '13000-000',
+                'cep_range_ends': '13139-999',
+            },
+            'Rio de Janeiro': {
+                'city_name': 'Rio de Janeiro',
+                'city_uf': 'RJ',
+                'population_percentage_total': 0.25,
+                'population_percentage_state': 1.0,
+                'cep_range_begins': '20000-000',
+                'cep_range_ends': '23799-999',
+            },
+        },
+    }
+
+
+@pytest.fixture
+def location_sampler(tmp_path, location_data) -> BrazilianLocationSampler:
+    path = tmp_path / 'locations.json'
+    path.write_text(json.dumps(location_data), encoding='utf-8')
+    return BrazilianLocationSampler(path)
+
+
+def test_state_and_city_consistent(location_sampler) -> None:
+    """Test that a single draw returns a city that belongs to the returned state."""
+    expected = {'São Paulo': 'SP', 'Campinas': 'SP', 'Rio de Janeiro': 'RJ'}
+    for _ in range(200):
+        state_name, state_abbr, city_name = location_sampler.get_state_and_city()
+        assert expected[city_name] == state_abbr
+        assert location_sampler.data['states'][state_name]['state_abbr'] == state_abbr
+
+
+def test_state_and_city_batch_distribution(location_sampler) -> None:
+    """Test that batch draws return parallel index arrays following city weights."""
+    state_indices, city_indices = location_sampler.get_state_and_city_batch(50_000)
+    assert len(state_indices) == len(city_indices) == 50_000
+
+    counts = Counter(location_sampler.city_names[i] for i in city_indices)
+    assert counts['São Paulo'] / 50_000 == pytest.approx(0.5, abs=0.02)
+    assert counts['Campinas'] / 50_000 == pytest.approx(0.25, abs=0.02)
+
+    for state_idx, city_idx in zip(state_indices, city_indices):
+        assert location_sampler.city_state_index[city_idx] == state_idx
+
+
+def test_get_city_for_unknown_state(location_sampler) -> None:
+    """Test that per-state draws reject unknown states."""
+    assert location_sampler.get_city('RJ') == ('Rio de Janeiro', 'RJ')
+    with pytest.raises(ValueError, match='No cities found for state: XX'):
+        location_sampler.get_city('XX')
+
+
+def test_national_table_without_total_percentages(tmp_path, location_data) -> None:
+    """Test the fallback to state x city weights when population_percentage_total is missing."""
+    for city in location_data['cities'].values():
+        del city['population_percentage_total']
+    path = tmp_path / 'locations.json'
+    path.write_text(json.dumps(location_data), encoding='utf-8')
+
+    sampler = BrazilianLocationSampler(path)
+    _, city_indices = sampler.get_state_and_city_batch(50_000)
+    counts = Counter(sampler.city_names[i] for i in city_indices)
+    assert counts['São Paulo'] / 50_000 == pytest.approx(0.5, abs=0.02)
+
+
+def test_national_table_follows_state_updates(location_sampler) -> None:
+    """Test that nationwide draws pick states with get_state's weights after update_states."""
+    location_sampler.update_states({'Rio de Janeiro': {'state_abbr': 'RJ', 'population_percentage': 0.75}})
+    assert location_sampler.state_weights == [0.5, 0.5]
+
+    state_indices, city_indices = location_sampler.get_state_and_city_batch(50_000)
+    states = Counter(location_sampler.state_abbrs[i] for i in state_indices)
+    assert states['RJ'] / 50_000 == pytest.approx(0.5, abs=0.02)
+    # Cities keep their population_percentage_total shares within the state
+    cities = Counter(location_sampler.city_names[i] for i in city_indices)
+    assert cities['São Paulo'] / 50_000 == pytest.approx(1 / 3, abs=0.02)
+
+
+def test_lookup_cep(location_sampler) -> None:
+    """Test offline CEP to city resolution, including a range nested in a bigger city's range."""
+    location_sampler.update_cities(
+        {
+            'Centro Histórico': {
+                'city_name': 'Centro Histórico',
+                'city_uf': 'SP',
+                'uf_code': '35',
+                'city_code': '99999',
+                'population_percentage_state': 0.0,
+                'cep_range_begins': '01001-000',
+                'cep_range_ends': '01001-999',
+            },
+        }
+    )
+    assert location_sampler.lookup_cep('01001-500').city_name == 'Centro Histórico'
+    assert location_sampler.lookup_cep('01001-500').ibge_code == '3599999'
+    assert location_sampler.lookup_cep('01002000').city_name == 'São Paulo'
+    assert location_sampler.lookup_cep(1_000_000).city_name == 'São Paulo'
+
+    assert [loc and loc.city_name for loc in location_sampler.lookup_ceps(['20000-000', '23799999', '23800-000', '', 'abc'])] == [
+        'Rio de Janeiro',
+        'Rio de Janeiro',
+        None,
+        None,
+        None,
+    ]
+
+
+def test_cep_index_settles_duplicated_ranges() -> None:
+    """Test that identical ranges of different states go to the state owning the CEP sector."""
+    index = CepIndex(
+        {
+            'Goiana': {'city_uf': 'PE', 'cep_range_begins': '36152-000', 'cep_range_ends': '36154-999'},
+            'Goianá': {'city_uf': 'MG', 'cep_range_begins': '36152-000', 'cep_range_ends': '36154-999'},
+            'Rio Novo': {'city_uf': 'MG', 'cep_range_begins': '36150-000', 'cep_range_ends': '36151-999'},
+        }
+    )
+    assert index.lookup('36153-000').city_name == 'Goianá'
+    assert index.lookup('36150-000').city_name == 'Rio Novo'
+    assert index.lookup('36155-000') is None
+    assert len(index) == 2
+
+
+def test_homonymous_cities_keep_their_own_data(tmp_path, location_data) -> None:
+    """Test that cities sharing a name in different states are told apart by (UF, name) and IBGE code."""
+    location_data['cities'] = {
+        '3507001': {
+            'city_name': 'Bom Jesus',
+            'city_uf': 'SP',
+            'uf_code': '35',
+            'city_code': '07001',
+            'ddd': '11',
+            'population_percentage_total': 0.75,
+            'population_percentage_state': 1.0,
+            'cep_range_begins': '01000-000',
+            'cep_range_ends': '01000-999',
+        },
+        '3307001': {
+            'city_name': 'Bom Jesus',
+            'city_uf': 'RJ',
+            'uf_code': '33',
+            'city_code': '07001',
+            'ddd': '22',
+            'population_percentage_total': 0.25,
+            'population_percentage_state': 1.0,
+            'cep_range_begins': '28360-000',
+            'cep_range_ends': '28369-999',
+        },
+    }
+    path = tmp_path / 'locations.json'
+    path.write_text(json.dumps(location_data), encoding='utf-8')
+    sampler = BrazilianLocationSampler(path)
+
+    rj = sampler.city_index('Bom Jesus', 'RJ')
+    assert sampler.city_index_by_ibge['3307001'] == rj and sampler.city_records[rj]['ddd'] == '22'
+    assert sampler._get_random_cep_for_city('Bom Jesus', 'RJ').startswith('2836')
+    with pytest.raises(ValueError, match='several states'):
+        sampler.city_index('Bom Jesus')
+
+    for _ in range(50):
+        state_abbr = sampler.get_state_and_city()[1]
+        city_idx = sampler.get_city_index(state_abbr)
+        assert sampler.city_records[city_idx]['city_uf'] == state_abbr
+
+
+def test_random_ceps_are_zero_padded(location_sampler) -> None:
+    """Test batch CEP draws from ranges and CEP lists, keeping the leading zero of SP CEPs."""
+    sp = location_sampler.city_index('São Paulo', 'SP')
+    ceps = location_sampler.random_ceps([sp] * 200)
+    assert all(len(cep) == 9 and cep[5] == '-' and '01000-000' <= cep <= '05999-999' for cep in ceps)
+    assert all(len(cep) == 8 and cep.startswith('0') for cep in location_sampler.random_ceps([sp] * 20, with_dash=False))
+    assert location_sampler._get_random_cep_for_city('São Paulo').startswith('0')
+
+    location_sampler.update_cities(
+        {
+            'Campinas': {**location_sampler.data['cities']['Campinas'], 'ceps': ['13010-001', '13010002']},
+            'Sem CEP': {'city_name': 'Sem CEP', 'city_uf': 'RJ', 'population_percentage_state': 0.0},
+        }
+    )
+    campinas = location_sampler.city_index('Campinas', 'SP')
+    assert set(location_sampler.random_ceps([campinas] * 50)) == {'13010-001', '13010-002'}
+    with pytest.raises(ValueError, match='Sem CEP'):
+        location_sampler.random_ceps([location_sampler.city_index('Sem CEP', 'RJ')])
+
+
+def _tables(sampler: BrazilianLocationSampler) -> tuple:
+    return (
+        sampler.state_names,
+        sampler.state_weights,
+        sampler.city_names,
+        sampler.city_state_index,
+        sampler.city_indices_by_state,
+        sampler.city_weights_by_state,
+        sampler.tables.national_weights,
+        list(sampler.city_cep_begins),
+        sampler.city_index_by_uf_name,
+    )
+
+
+@pytest.mark.parametrize('with_totals', [True, False])
+def test_incremental_updates_match_full_rebuild(tmp_path, location_data, with_totals) -> None:
+    """Test that incremental city/state updates leave the same tables as loading the updated data."""
+    if not with_totals:
+        for city in location_data['cities'].values():
+            del city['population_percentage_total']
+    path = tmp_path / 'locations.json'
+    path.write_text(json.dumps(location_data), encoding='utf-8')
+    sampler = BrazilianLocationSampler(path)
+
+    def city(name: str, uf: str, state_share: float, total: float, begins: str) -> dict:
+        data = {'city_name': name, 'city_uf': uf, 'population_percentage_state': state_share, 'cep_range_begins': begins}
+        data['cep_range_ends'] = begins[:2] + '999-999'
+        return {**data, 'population_percentage_total': total} if with_totals else data
+
+    updates = [
+        ('cities', {'Campinas': city('Campinas', 'SP', 0.5, 0.3, '13000-000'), 'Santos': city('Santos', 'SP', 0.25, 0.1, '11000-000')}),
+        ('cities', {'Belo Horizonte': city('Belo Horizonte', 'MG', 1.0, 0.2, '30000-000')}),
+        ('states', {'Minas Gerais': {'state_abbr': 'MG', 'population_percentage': 0.2}}),
+        ('states', {'Rio de Janeiro': {'state_abbr': 'RJ', 'population_percentage': 0.1}}),
+    ]
+    for table, data in updates:
+        getattr(sampler, f'update_{table}')(data)
+        location_data[table].update(data)
+
+    path.write_text(json.dumps(location_data), encoding='utf-8')
+    assert _tables(sampler) == _tables(BrazilianLocationSampler(path))
+    assert sampler.lookup_cep('11500-000').city_name == 'Santos'
+    assert sampler.city_index('Belo Horizonte', 'MG') == 4
+
+
+def test_updates_are_safe_for_concurrent_draws(location_sampler) -> None:
+    """Test that draws running during a stream of updates always get a consistent city and state."""
+    import threading
+
+    errors = []
+    done = threading.Event()
+
+    def draw() -> None:
+        try:
+            while not done.is_set():
+                tables = location_sampler.tables
+                state_indices, city_indices = location_sampler.get_state_and_city_batch(50, tables)
+                for state_idx, city_idx in zip(state_indices, city_indices):
+                    assert tables.city_records[city_idx]['city_uf'] == tables.state_abbrs[state_idx]
+                location_sampler.random_ceps(city_indices, tables=tables)
+                location_sampler.get_city_index('SP')
+        except Exception as e:  # noqa: BLE001
+            errors.append(e)
+
+    readers = [threading.Thread(target=draw) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for i in range(300):
+        location_sampler.update_cities(
+            {
+                f'Cidade {i}': {
+                    'city_name': f'Cidade {i}',
+                    'city_uf': 'SP',
+                    'population_percentage_state': 0.01,
+                    'population_percentage_total': 0.005,
+                    'cep_range_begins': '14000-000',
+                    'cep_range_ends': '14999-999',
+                }
+            }
+        )
+        location_sampler.update_states({'São Paulo': {'state_abbr': 'SP', 'population_percentage': 0.5 + i / 1000}})
+    done.set()
+    for reader in readers:
+        reader.join()
+    assert not errors
+    assert len(location_sampler.city_indices_by_state['SP']) == 302
+
+
+def _contents(tables: LocationTables) -> dict:
+    return {f.name: copy.deepcopy(getattr(tables, f.name)) for f in dataclasses.fields(tables) if 'alias' not in f.name}
+
+
+def test_published_tables_are_never_modified(location_sampler) -> None:
+    """Test that updates publish new tables and leave the ones a draw already bound untouched."""
+    tables = location_sampler.tables
+    before = _contents(tables)
+    location_sampler.update_cities(
+        {
+            'Campinas': {
+                'city_name': 'Campinas',
+                'city_uf': 'SP',
+                'population_percentage_state': 0.5,
+                'population_percentage_total': 0.3,
+                'cep_range_begins': '13000-000',
+                'cep_range_ends': '13999-999',
+            }
+        }
+    )
+    location_sampler.update_states({'São Paulo': {'state_abbr': 'SP', 'population_percentage': 0.9}})
+    assert location_sampler.tables is not tables
+    assert _contents(tables) == before
+
+    # Moving a city to another state rebuilds every table, which may renumber the cities
+    tables = location_sampler.tables
+    before = _contents(tables)
+    moved = {**location_sampler.data['cities']['Campinas'], 'city_uf': 'RJ'}
+    location_sampler.update_cities({'Campinas': moved})
+    assert _contents(tables) == before
+    assert location_sampler.tables.city_records[location_sampler.city_index('Campinas')]['city_uf'] == 'RJ'
@@ -0,0 +1,93 @@
+"""Tests for the BrazilianNameSampler batch API."""
+
+from pathlib import Path
+
+import pytest
+
+from src.br_name_class import BrazilianNameSampler, TimePeriod
+
+
+@pytest.fixture
+def batch_data():
+    return {
+        'common_names_percentage': {
+            period.value: {'names': {'Maria': {'percentage': 0.6}, 'José': {'percentage': 0.4}}, 'total': 2} for period in TimePeriod
+        },
+        'surnames': {
+            'SILVA': {'percentage': 0.5},
+            'ALVES': {'percentage': 0.3},
+            'JUNIOR': {'percentage': 0.2},
+            'top_40': {'SILVA': {'percentage': 1.0}},
+        },
+    }
+
+
+def test_sample_names_returns_parallel_columns(batch_data) -> None:
+    """Test that every column has one entry per requested row."""
+    sampler = BrazilianNameSampler(batch_data)
+    columns = sampler.sample_names(500)
+    assert set(columns) == {'first_name', 'middle_name', 'surname'}
+    assert all(len(column) == 500 for column in columns.values())
+    assert set(columns['first_name']) <= {'Maria', 'José'}
+    assert all(middle is None for middle in columns['middle_name'])
+    assert all(len(surname.split(' ')) >= 2 for surname in columns['surname'])
+
+
+def test_sample_names_options(batch_data) -> None:
+    """Test raw, single-surname, top 40 and no-surname options."""
+    sampler = BrazilianNameSampler(batch_data)
+
+    columns = sampler.sample_names(200, raw=True, top_40=True, with_only_one_surname=True)
+    assert set(columns['first_name']) <= {'MARIA', 'JOSÉ'}
+    assert all('SILVA' in surname for surname in columns['surname'])
+
+    columns = sampler.sample_names(50, include_surname=False)
+    assert columns['surname'] == [''] * 50
+
+
+def test_sample_names_last_surname_rules(batch_data) -> None:
+    """Test that the last surname never gets a prefix and JUNIOR becomes Jr."""
+    sampler = BrazilianNameSampler(batch_data)
+    for surname in sampler.sample_names(1000)['surname']:
+        last = surname.split(' ')[-1]
+        assert last in {'SILVA', 'ALVES', 'Jr.'}
+
+
+def test_middle_name_table_cached_until_data_replaced(batch_data) -> None:
+    """Test that the middle-name table is built once and rebuilt only on data replacement."""
+    sampler = BrazilianNameSampler(batch_data, Path(__file__).parents[1] / 'data' / 'middle_names.json')
+    table = sampler.middle_name_table
+    assert table is sampler.middle_name_table
+    assert len(table.names) == len(table.cum_weights) > 0
+    assert table.cum_weights[-1] == pytest.approx(1.0)
+
+    sampler.middle_names_data = {
+        'percentage_with_second': 100,
+        'second_names': {'Clara': {'count': 1, 'percentage': 1.0}, 'Vazio': {'count': 0, 'percentage': 0}},
+    }
+    assert sampler.middle_name_table.names == ['Clara']
+    assert set(sampler.sample_names(20)['middle_name']) == {'Clara'}
+
+
+def test_surname_index_tables(batch_data) -> None:
+    """Test the precomputed full and top 40 surname indexes."""
+    sampler = BrazilianNameSampler(batch_data)
+
+    full = sampler.surname_index()
+    assert full.surnames == ['SILVA', 'ALVES', 'JUNIOR']
+    assert full.prefixed == frozenset({0})
+    assert full.junior == frozenset({2})
+    assert sampler.surname_index(top_40=True).surnames == ['SILVA']
+
+    indices = sampler.sample_surname_indices(1000)
+    assert len(indices) == 1000
+    assert set(indices) <= {0, 1, 2}
+    assert set(sampler.sample_surname_indices(100, top_40=True)) == {0}
+
+
+def test_surname_index_missing_data(batch_data) -> None:
+    """Test that drawing from an empty surname table fails clearly."""
+    batch_data['surnames'] = {'SILVA': {'percentage': 1.0}}
+    sampler = BrazilianNameSampler(batch_data)
+    with pytest.raises(ValueError, match='No top 40 surname data'):
+        sampler.get_random_surname(top_40=True)
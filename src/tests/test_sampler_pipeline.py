@@ -0,0 +1,280 @@
+"""Tests for the single-pass generation pipeline in src.sampler."""
+
+import asyncio
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from src.br_name_class import TimePeriod
+from src.br_rg_class import BrazilianRG
+from src.sampler import (
+    SamplerSession,
+    aiter_sample_chunks,
+    aiter_samples,
+    get_session,
+    iter_sample_chunks,
+    iter_samples,
+    sample,
+    save_samples_to_jsonl,
+)
+from src.sharded_sampler import iter_sharded_chunks, write_sharded_jsonl
+
+DATA_DIR = Path(__file__).parents[1] / 'data'
+
+FLAGS = [
+    'city_only', 'state_abbr_only', 'state_full_only', 'only_cep', 'cep_without_dash', 'make_api_call', 'return_only_name',
+    'name_raw', 'only_surname', 'top_40', 'with_only_one_surname', 'always_middle', 'only_middle', 'always_cpf', 'always_pis',
+    'always_cnpj', 'always_cei', 'always_rg', 'always_phone', 'only_cpf', 'only_pis', 'only_cnpj', 'only_cei', 'only_rg',
+    'only_fone', 'only_document', 'all_data',
+]  # fmt: skip
+
+
+@pytest.fixture
+def sample_options(tmp_path) -> dict:
+    """Keyword arguments for sample() backed by small data files."""
+    names = {'Maria': {'percentage': 0.6}, 'José': {'percentage': 0.4}}
+    names_path = tmp_path / 'names_data.json'
+    names_path.write_text(
+        json.dumps({'common_names_percentage': {period.value: {'names': names, 'total': 2} for period in TimePeriod}}), encoding='utf-8'
+    )
+    surnames_path = tmp_path / 'surnames_data.json'
+    surnames_path.write_text(
+        json.dumps({'surnames': {'SILVA': {'percentage': 0.6}, 'ALVES': {'percentage': 0.4}, 'top_40': {'SILVA': {'percentage': 1.0}}}}),
+        encoding='utf-8',
+    )
+
+    with (DATA_DIR / 'locations_data_normalized.json').open(encoding='utf-8') as f:
+        locations = json.load(f)
+    for city_name, city_data in locations['cities'].items():
+        city_data['city_name'] = city_name
+    locations_path = tmp_path / 'locations_data.json'
+    locations_path.write_text(json.dumps(locations), encoding='utf-8')
+
+    options = dict.fromkeys(FLAGS, False)
+    options.update(
+        qty=50,
+        q=None,
+        time_period=TimePeriod.UNTIL_2010,
+        json_path=locations_path,
+        names_path=names_path,
+        middle_names_path=DATA_DIR / 'middle_names.json',
+        surnames_path=surnames_path,
+        locations_path=None,
+        include_issuer=True,
+        save_to_jsonl=None,
+    )
+    return options
+
+
+def test_documents_match_row_location(sample_options) -> None:
+    """Test that the RG issuer describes the same state as the row's location."""
+    sample_options['all_data'] = True
+    results = sample(**sample_options)
+    assert len(results) == 50
+    for row in results:
+        assert row['rg']
+        assert f'-{row["state_abbr"]}' in row['rg'].split(' ')[0]
+        assert row['cep'] and row['city'] and row['phone'] and row['cpf']
+
+
+def test_rg_options_default_to_constructor() -> None:
+    """Test that per-call RG options fall back to the constructor's and can override them either way."""
+    rg = BrazilianRG('RJ', rng=random.Random(1))
+    assert ' ' not in rg.generate()
+    assert rg.generate(include_issuer=True).startswith('DETRAN-RJ ')
+    assert rg.generate(include_issuer=True, include_state_prefix=True).split(' ')[1] == 'RJ'
+
+    rg = BrazilianRG('SP', include_issuer=True, include_state_prefix=True, rng=random.Random(2))
+    assert rg.generate().startswith('SSP-SP SP ')
+    assert ' ' not in rg.generate(include_issuer=False, include_state_prefix=False)
+    assert ' ' not in BrazilianRG('SP', include_issuer=True, only_rg=True).generate()
+    assert BrazilianRG('SP', only_rg=True).generate(only_rg=False, include_issuer=True).startswith('SSP-SP ')
+
+
+def test_document_only_mode(sample_options) -> None:
+    """Test that only the requested documents are generated."""
+    sample_options.update(only_cpf=True, qty=5)
+    results = sample(**sample_options)
+    assert all(row['cpf'] and not row['rg'] and not row['name'] for row in results)
+
+
+@pytest.fixture
+def stream_options(sample_options) -> dict:
+    """Options accepted by the streaming API."""
+    for key in ('qty', 'q', 'save_to_jsonl'):
+        sample_options.pop(key)
+    return sample_options
+
+
+def test_iter_sample_chunks_are_bounded(stream_options) -> None:
+    """Test that chunks never exceed chunk_size and cover qty exactly."""
+    chunks = list(iter_sample_chunks(25, chunk_size=10, **stream_options))
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert len(list(iter_samples(7, chunk_size=3, **stream_options))) == 7
+
+
+def test_iter_samples_rejects_unknown_options(stream_options) -> None:
+    """Test that typos in option names are reported."""
+    with pytest.raises(TypeError, match='alwayz_cpf'):
+        next(iter_samples(1, alwayz_cpf=True, **stream_options))
+
+
+def test_aiter_samples(stream_options) -> None:
+    """Test the async streaming variant."""
+
+    async def collect() -> list[dict]:
+        return [record async for record in aiter_samples(12, chunk_size=5, **stream_options)]
+
+    records = asyncio.run(collect())
+    assert len(records) == 12
+    assert all(record['city'] and record['cep'] for record in records)
+
+
+def test_save_samples_to_jsonl(tmp_path, stream_options) -> None:
+    """Test streaming records straight into a JSONL file."""
+    output = tmp_path / 'out.jsonl'
+    assert save_samples_to_jsonl(str(output), 15, chunk_size=4, **stream_options) == 15
+    assert save_samples_to_jsonl(str(output), 5, append=True, **stream_options) == 5
+    lines = output.read_text(encoding='utf-8').splitlines()
+    assert len(lines) == 20
+    assert all(json.loads(line)['city'] for line in lines)
+
+
+def test_sharded_output_is_independent_of_worker_count(stream_options) -> None:
+    """Test that the same seed gives the same samples in-process and over a process pool."""
+    stream_options['all_data'] = True
+    inline = list(iter_sharded_chunks(25, workers=1, seed=42, shard_size=10, **stream_options))
+    pooled = list(iter_sharded_chunks(25, workers=2, seed=42, shard_size=10, **stream_options))
+    assert [len(chunk) for chunk in pooled] == [10, 10, 5]
+    assert pooled == inline
+    assert inline != list(iter_sharded_chunks(25, workers=1, seed=43, shard_size=10, **stream_options))
+
+
+def test_write_sharded_jsonl(tmp_path, stream_options) -> None:
+    """Test that each shard is written to its own JSONL file."""
+    paths = write_sharded_jsonl(tmp_path / 'out.jsonl', 25, workers=2, seed=7, shard_size=10, **stream_options)
+    assert [path.name for path in paths] == ['out-00000.jsonl', 'out-00001.jsonl', 'out-00002.jsonl']
+    lines = [line for path in paths for line in path.read_text(encoding='utf-8').splitlines()]
+    merged = [record for chunk in iter_sharded_chunks(25, seed=7, shard_size=10, **stream_options) for record in chunk]
+    assert [json.loads(line) for line in lines] == merged
+
+
+def test_injected_rng_makes_runs_reproducible(stream_options) -> None:
+    """Test that an injected RNG reproduces the same records without touching the global RNG."""
+    stream_options['all_data'] = True
+    state = random.getstate()
+    first = list(iter_samples(20, rng=random.Random(123), **stream_options))
+    second = list(iter_samples(20, rng=random.Random(123), **stream_options))
+    assert random.getstate() == state
+    assert json.dumps(first, ensure_ascii=False) == json.dumps(second, ensure_ascii=False)
+    assert first != list(iter_samples(20, rng=random.Random(124), **stream_options))
+
+
+def test_pipelined_api_mode(monkeypatch, worker_command, stream_options) -> None:
+    """Test that pipelined API mode resolves every row over one pool, in order and reproducibly."""
+    from src.utils import cep_wrapper
+
+    command, spawns = worker_command
+    depths = []
+
+    def new_backend(backend: str, size: int, pipeline_depth: int = 1) -> cep_wrapper.CepWorkerPool:
+        depths.append(pipeline_depth)
+        return cep_wrapper.CepWorkerPool(size=2, command=command)
+
+    monkeypatch.setattr(cep_wrapper, '_new_backend', new_backend)
+    stream_options.update(all_data=True, make_api_call=True, cep_cache_path=None, cep_pipeline_depth=3)
+
+    pipelined = list(iter_sample_chunks(250, chunk_size=120, rng=random.Random(5), pipelined=True, **stream_options))
+    assert [len(chunk) for chunk in pipelined] == [120, 120, 10]
+    records = [record for chunk in pipelined for record in chunk]
+    assert all(record['street'] and record['building_number'] for record in records)
+    assert len(spawns.read_text()) == 2
+    assert depths == [3]
+
+    again = list(iter_sample_chunks(250, chunk_size=120, rng=random.Random(5), pipelined=True, **stream_options))
+    assert again == pipelined
+
+
+def test_api_mode_reuses_one_backend_across_chunks(monkeypatch, worker_command, stream_options) -> None:
+    """Test that non-pipelined API runs start one backend for all their chunks and close it afterwards."""
+    from src.utils import cep_wrapper
+
+    command, spawns = worker_command
+    pools = []
+
+    def new_backend(backend: str, size: int, pipeline_depth: int = 1) -> cep_wrapper.CepWorkerPool:
+        pools.append(cep_wrapper.CepWorkerPool(size=2, command=command))
+        return pools[-1]
+
+    monkeypatch.setattr(cep_wrapper, '_new_backend', new_backend)
+    stream_options.update(all_data=True, make_api_call=True, cep_cache_path=None)
+
+    chunks = list(iter_sample_chunks(130, chunk_size=40, rng=random.Random(5), **stream_options))
+    assert [len(chunk) for chunk in chunks] == [40, 40, 40, 10]
+    assert all(record['street'] for chunk in chunks for record in chunk)
+    assert len(pools) == 1 and len(spawns.read_text()) == 2
+    assert all(worker is None for worker in pools[0]._workers)
+
+    async def collect() -> list[list[dict]]:
+        return [chunk async for chunk in aiter_sample_chunks(130, chunk_size=40, rng=random.Random(5), **stream_options)]
+
+    assert asyncio.run(collect()) == chunks
+    assert len(pools) == 2 and len(spawns.read_text()) == 4
+
+
+def test_api_answers_checked_against_cep_index(tmp_path, sample_options) -> None:
+    """Test that missing city/state come from the offline CEP index and answers for another state are discarded."""
+    from src.br_location_class import BrazilianLocationSampler
+    from src.sampler import get_address_data_batch
+    from src.utils.cep_wrapper import CepBackend
+
+    answers = {
+        '01001000': {'cep': '01001-000', 'state': '', 'city': '', 'street': 'Praça da Sé', 'neighborhood': 'Sé'},
+        '20040002': {'cep': '20040-002', 'state': 'SP', 'city': 'São Paulo', 'street': 'Rua Errada', 'neighborhood': 'Centro'},
+    }
+
+    class CannedBackend(CepBackend):
+        async def _lookup_once(self, cep: str) -> dict:
+            return answers.get(cep, {'error': 'CEP não encontrado', 'cep': cep})
+
+    location_sampler = BrazilianLocationSampler(sample_options['json_path'])
+    ceps = ['01001-000', '20040-002', '69945-000']
+    results = asyncio.run(get_address_data_batch(ceps, True, cep_pool=CannedBackend(), cep_index=location_sampler.cep_index))
+    assert results[0]['city'] == 'São Paulo' and results[0]['state'] == 'SP' and results[0]['street'] == 'Praça da Sé'
+    assert results[1]['state'] == 'RJ' and results[1]['city'] == 'Rio de Janeiro' and results[1]['street'] != 'Rua Errada'
+    assert results[1]['cep'] == '20040-002'
+    assert results[2]['city'] == 'Acrelândia' and results[2]['state'] == 'AC'
+
+
+def test_sessions_are_shared_until_data_changes(monkeypatch, sample_options) -> None:
+    """Test that repeated sample() calls reuse one loaded session, reloaded once a data file changes."""
+    import os
+
+    from src import sampler as sampler_module
+
+    loads = []
+    load_samplers = sampler_module.load_samplers
+    monkeypatch.setattr(sampler_module, 'load_samplers', lambda *args: loads.append(args) or load_samplers(*args))
+    sample_options['qty'] = 3
+
+    sample(**sample_options)
+    sample(**{**sample_options, 'only_cpf': True})
+    assert len(loads) == 1
+    paths = [sample_options[key] for key in ('json_path', 'names_path', 'middle_names_path', 'surnames_path', 'locations_path')]
+    session = get_session(*paths)
+    assert get_session(*paths) is session
+
+    os.utime(sample_options['surnames_path'], ns=(0, 0))
+    assert get_session(*paths) is not session
+    assert len(loads) == 2
+
+
+def test_sampler_session_generate(sample_options) -> None:
+    """Test generating from a session and that it refuses options naming other data files."""
+    session = SamplerSession(*(sample_options[key] for key in ('json_path', 'names_path', 'middle_names_path', 'surnames_path')), None)
+    assert len(session.generate(7, chunk_size=3, all_data=True)) == 7
+    assert all(row['cpf'] for row in session.generate(2, only_cpf=True, json_path=sample_options['json_path']))
+    with pytest.raises(ValueError, match='json_path'):
+        session.generate(1, json_path=DATA_DIR / 'locations_data_normalized.json')
@@ -1,7 +1,11 @@
 import json
 import random
+import threading
+from collections.abc import Sequence
 from pathlib import Path
 
+DEFAULT_NAMES_PATH = 'src/data/names_data.json'
+
 
 class AddressProvider_for_offline:
     city_suffixes = (
@@ -590,6 +594,105 @@ class AddressProvider_for_offline:
         'Itaipu',
     )
 
+    last_names = (
+        'Silva',
+        'Santos',
+        'Oliveira',
+        'Souza',
+        'Rodrigues',
+        'Ferreira',
+        'Alves',
+        'Pereira',
+        'Lima',
+        'Gomes',
+        'Costa',
+        'Ribeiro',
+        'Martins',
+        'Carvalho',
+        'Almeida',
+        'Lopes',
+        'Soares',
+        'Fernandes',
+        'Vieira',
+        'Barbosa',
+        'Rocha',
+        'Dias',
+        'Nascimento',
+        'Andrade',
+        'Moreira',
+        'Nunes',
+        'Marques',
+        'Machado',
+        'Mendes',
+        'Freitas',
+        'Cardoso',
+        'Ramos',
+    )
+
+    # Building numbers 1-999 as strings, drawn in bulk by generate_addresses()
+    building_numbers = tuple(str(number) for number in range(1, 1000))
+    # First-name pools by resolved names file, loaded once and shared by every provider (see load_name_pool)
+    _name_pools: dict[str, tuple[str, ...]] = {}
+    _name_pools_lock = threading.Lock()
+
+    def __init__(self, rng: random.Random | None = None, name_pool: Sequence[str] | None = None):
+        """
+        Args:
+            rng: Random number source for every draw (defaults to the global random module)
+            name_pool: First names to draw from (defaults to the shared pool of the default names file)
+        """
+        self.rng = rng if rng is not None else random
+        self._name_pool = tuple(name_pool) if name_pool is not None else None
+
+    @classmethod
+    def load_name_pool(cls, names_path: str | Path = DEFAULT_NAMES_PATH) -> tuple[str, ...]:
+        """
+        Returns the first names of every time period in a names data file.
+
+        The file is read once per process; later calls return the same immutable pool.
+
+        Args:
+            names_path: Path to the names data JSON file
+
+        Returns:
+            The names as a tuple, ('João',) if the file has none or ('Maria',) if it can't be read
+        """
+        key = str(Path(names_path).resolve())
+        pool = cls._name_pools.get(key)
+        if pool is not None:
+            return pool
+        with cls._name_pools_lock:
+            if key not in cls._name_pools:
+                cls._name_pools[key] = cls._read_name_pool(names_path)
+            return cls._name_pools[key]
+
+    @staticmethod
+    def _read_name_pool(names_path: str | Path) -> tuple[str, ...]:
+        try:
+            with Path(names_path).open(encoding='utf-8') as f:
+                names_data = json.load(f)
+            periods = names_data.get('common_names_percentage', names_data)
+
+            # Names of every period, so names common in several periods are drawn more often
+            all_names = []
+            for period_data in periods.values():
+                if isinstance(period_data, dict) and 'names' in period_data:
+                    all_names.extend(period_data['names'])
+        except (FileNotFoundError, json.JSONDecodeError, AttributeError) as e:
+            # In case of error, fall back to a default name
+            print(f'Warning: Could not load names from {names_path}: {e}')
+            return ('Maria',)
+
+        # If no names were found, fall back to a default name
+        return tuple(all_names) or ('João',)
+
+    @property
+    def name_pool(self) -> tuple[str, ...]:
+        """First names drawn by first_name(), loaded from the default names file on first use."""
+        if self._name_pool is None:
+            self._name_pool = self.load_name_pool()
+        return self._name_pool
+
     def street_prefix(self) -> str:
         """
         :example: 'rua'
@@ -618,7 +721,7 @@ class AddressProvider_for_offline:
         Returns:
             A random element from the sequence
         """
-        return random.choice(elements)
+        return self.rng.choice(elements)
 
     def building_number(self) -> str:
         """
@@ -627,7 +730,7 @@ class AddressProvider_for_offline:
         Returns:
             A random building number as a string
         """
-        return str(random.randint(1, 999))
+        return str(self.rng.randint(1, 999))
 
     def last_name(self) -> str:
         """
@@ -636,41 +739,7 @@ class AddressProvider_for_offline:
         Returns:
             A random last name as a string
         """
-        last_names = [
-            'Silva',
-            'Santos',
-            'Oliveira',
-            'Souza',
-            'Rodrigues',
-            'Ferreira',
-            'Alves',
-            'Pereira',
-            'Lima',
-            'Gomes',
-            'Costa',
-            'Ribeiro',
-            'Martins',
-            'Carvalho',
-            'Almeida',
-            'Lopes',
-            'Soares',
-            'Fernandes',
-            'Vieira',
-            'Barbosa',
-            'Rocha',
-            'Dias',
-            'Nascimento',
-            'Andrade',
-            'Moreira',
-            'Nunes',
-            'Marques',
-            'Machado',
-            'Mendes',
-            'Freitas',
-            'Cardoso',
-            'Ramos',
-        ]
-        return self.random_element(last_names)
+        return self.random_element(self.last_names)
 
     def first_name(self) -> str:
         """
@@ -679,10 +748,21 @@ class AddressProvider_for_offline:
         Returns:
             A random first name as a string
         """
-        # Use the non_weighted_random_name method to get a random first name
-        return self.non_weighted_random_name()
+        return self.random_element(self.name_pool)
 
-    def non_weighted_random_name(self, names_path: str = 'src/data/names_data.json') -> str:
+    def first_names(self, k: int) -> list[str]:
+        """
+        Returns k random first names in one batch.
+
+        Args:
+            k: Number of names to draw
+
+        Returns:
+            A list of k first names
+        """
+        return self.rng.choices(self.name_pool, k=k)
+
+    def non_weighted_random_name(self, names_path: str = DEFAULT_NAMES_PATH) -> str:
         """
         Returns a random name from the names data file without weighting.
 
@@ -692,24 +772,43 @@ class AddressProvider_for_offline:
         Returns:
             A random name as a string
         """
-        try:
-            # Load names from the file
-            with Path(names_path).open(encoding='utf-8') as f:
-                names_data = json.load(f)
+        return self.random_element(self.load_name_pool(names_path))
 
-            # Extract all names from the data
-            all_names = []
-            for period_data in names_data.values():
-                if isinstance(period_data, dict) and 'names' in period_data:
-                    all_names.extend([name for name, _ in period_data['names']])
+    def generate_addresses(self, ceps: Sequence[str], existing: Sequence[dict] | None = None) -> dict[str, list[str]]:
+        """
+        Returns street, neighborhood, building number and CEP columns for a batch of CEPs.
 
-            # If no names were found, return a default name
-            if not all_names:
-                return 'João'
+        Each column is drawn with one choices() call over the rows that need it, instead
+        of a draw per field per row.
 
-            # Return a random name
-            return self.random_element(all_names)
-        except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
-            # In case of error, return a default name
-            print(f'Warning: Could not load names from {names_path}: {e}')
-            return 'Maria'
+        Args:
+            ceps: CEPs with or without dash, one per address
+            existing: Optional address data per CEP (e.g. API answers). Only the fields left empty are generated
+
+        Returns:
+            Dictionary of equally long lists keyed 'street', 'neighborhood', 'building_number' and 'cep'
+        """
+        if existing is not None and len(existing) != len(ceps):
+            raise ValueError('existing must hold one address per CEP')
+        choices = self.rng.choices
+
+        rows = existing if existing is not None else [{}] * len(ceps)
+        columns = {field: [row.get(field, '') for row in rows] for field in ('street', 'neighborhood', 'building_number', 'cep')}
+
+        missing = [i for i, street in enumerate(columns['street']) if not street]
+        streets = columns['street']
+        for i, prefix, last_name in zip(missing, choices(self.street_prefixes, k=len(missing)), choices(self.last_names, k=len(missing))):
+            streets[i] = f'{prefix} {last_name}'
+
+        for field, elements in (('neighborhood', self.bairros), ('building_number', self.building_numbers)):
+            column = columns[field]
+            missing = [i for i, value in enumerate(column) if not value]
+            for i, value in zip(missing, choices(elements, k=len(missing))):
+                column[i] = value
+
+        # CEPs are returned with dash
+        cep_column = columns['cep']
+        for i, cep in enumerate(ceps):
+            if not cep_column[i]:
+                cep_column[i] = f'{cep[:5]}-{cep[5:]}' if '-' not in cep and len(cep) == 8 else cep
+        return columns
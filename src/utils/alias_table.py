@@ -0,0 +1,98 @@
+"""
+Walker/Vose alias tables for constant-time weighted sampling.
+"""
+
+import random
+from collections.abc import Sequence
+from types import ModuleType
+
+
+class AliasTable:
+    """Precomputed alias table over a discrete weighted distribution.
+
+    Building the table is O(n); every draw afterwards is O(1) and consumes a
+    single uniform variate, so large categorical distributions can be sampled
+    repeatedly without rebuilding cumulative weights on each call.
+    """
+
+    __slots__ = ('_alias', '_prob', '_size')
+
+    def __init__(self, weights: Sequence[float]):
+        """Build the alias table using Vose's algorithm.
+
+        Args:
+            weights: Non-negative weights, one per outcome. They don't need to be normalized.
+
+        Raises:
+            ValueError: If weights is empty, contains negative values or sums to zero
+        """
+        size = len(weights)
+        if size == 0:
+            raise ValueError('Cannot build an alias table from an empty weight list')
+
+        total = float(sum(weights))
+        if total <= 0 or any(w < 0 for w in weights):
+            raise ValueError('Weights must be non-negative and sum to a positive value')
+
+        scaled = [w * size / total for w in weights]
+        prob = [0.0] * size
+        alias = list(range(size))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            prob[less] = scaled[less]
+            alias[less] = more
+            scaled[more] = (scaled[more] + scaled[less]) - 1.0
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+
+        # Whatever is left is 1.0 up to floating point error
+        for i in large + small:
+            prob[i] = 1.0
+
+        self._size = size
+        self._prob = prob
+        self._alias = alias
+
+    def __len__(self) -> int:
+        return self._size
+
+    def sample(self, rng: random.Random | ModuleType = random) -> int:
+        """Draw a single outcome index.
+
+        Args:
+            rng: Random number source (defaults to the global random module)
+
+        Returns:
+            Index of the selected outcome
+        """
+        u = rng.random() * self._size
+        i = int(u)
+        return i if u - i < self._prob[i] else self._alias[i]
+
+    def sample_many(self, k: int, rng: random.Random | ModuleType = random) -> list[int]:
+        """Draw k outcome indices.
+
+        Args:
+            k: Number of draws
+            rng: Random number source (defaults to the global random module)
+
+        Returns:
+            List of k selected outcome indices
+        """
+        size = self._size
+        prob = self._prob
+        alias = self._alias
+        draw = rng.random
+        indices = []
+        for _ in range(k):
+            u = draw() * size
+            i = int(u)
+            indices.append(i if u - i < prob[i] else alias[i])
+        return indices
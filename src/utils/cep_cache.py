@@ -0,0 +1,166 @@
+"""
+Persistent SQLite cache for CEP lookup responses.
+
+Successful answers are kept for `ttl` seconds and failures (responses with an
+'error' key) for the shorter `error_ttl`, so a CEP that was not found is retried
+eventually without being looked up on every run.
+"""
+
+import json
+import sqlite3
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+DEFAULT_CEP_CACHE_PATH = '.cache/cep_cache.sqlite3'
+DEFAULT_CEP_CACHE_TTL = 30 * 24 * 60 * 60  # 30 days
+DEFAULT_CEP_CACHE_ERROR_TTL = 60 * 60  # 1 hour
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters of a CepCache."""
+
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __str__(self) -> str:
+        return f'{self.hits} hits, {self.misses} misses ({self.hit_rate:.1%} hit rate), {self.writes} writes'
+
+
+def cache_key(cep: str) -> str:
+    """Normalize a CEP to its 8 digits so '01001-000' and '01001000' share an entry."""
+    return ''.join(char for char in str(cep) if char.isdigit()).zfill(8)
+
+
+class CepCache:
+    """SQLite-backed CEP response cache with separate TTLs for answers and failures.
+
+    The database is safe to share between processes (e.g. sharded workers);
+    each process should open its own CepCache.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = DEFAULT_CEP_CACHE_PATH,
+        ttl: float = DEFAULT_CEP_CACHE_TTL,
+        error_ttl: float = DEFAULT_CEP_CACHE_ERROR_TTL,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            path: SQLite database file, created (with its directory) if missing
+            ttl: Seconds a successful response stays valid
+            error_ttl: Seconds an error response stays valid
+            clock: Time source returning seconds since the epoch
+
+        Raises:
+            ValueError: If a TTL is negative
+        """
+        if ttl < 0 or error_ttl < 0:
+            raise ValueError('Cache TTLs must be non-negative')
+        self.path = Path(path)
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.clock = clock
+        self.stats = CacheStats()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, timeout=30)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS cep_responses (cep TEXT PRIMARY KEY, response TEXT NOT NULL, expires_at REAL NOT NULL)'
+        )
+        self._connection.commit()
+
+    def __enter__(self) -> 'CepCache':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def get(self, cep: str) -> dict[str, Any] | None:
+        """Return the cached response for cep, or None if missing or expired."""
+        return self.get_many([cep]).get(cep)
+
+    def get_many(self, ceps: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """Return the cached responses for the given CEPs.
+
+        Every requested CEP counts as a hit or a miss in stats (duplicates included).
+
+        Args:
+            ceps: CEPs to look up, with or without dash
+
+        Returns:
+            Dictionary mapping each requested CEP (as given) that has a valid entry to its response
+        """
+        ceps = list(ceps)
+        keys = {cache_key(cep) for cep in ceps}
+        now = self.clock()
+
+        found = {}
+        key_list = list(keys)
+        # Stay well below SQLite's bound parameter limit
+        for start in range(0, len(key_list), 500):
+            batch = key_list[start : start + 500]
+            placeholders = ','.join('?' * len(batch))
+            rows = self._connection.execute(
+                f'SELECT cep, response FROM cep_responses WHERE expires_at > ? AND cep IN ({placeholders})', (now, *batch)
+            )
+            found.update((key, json.loads(response)) for key, response in rows)
+
+        results = {}
+        for cep in ceps:
+            response = found.get(cache_key(cep))
+            if response is None:
+                self.stats.misses += 1
+            else:
+                self.stats.hits += 1
+                results[cep] = response
+        return results
+
+    def put(self, cep: str, response: dict[str, Any]) -> None:
+        """Store a response for cep (see put_many)."""
+        self.put_many([(cep, response)])
+
+    def put_many(self, items: Iterable[tuple[str, dict[str, Any]]]) -> None:
+        """Store responses, using error_ttl for responses with an 'error' key.
+
+        Responses flagged as 'retryable' (the lookup itself could not be carried
+        out, e.g. no worker process could be started) are not cached.
+
+        Args:
+            items: Pairs of (cep, response)
+        """
+        now = self.clock()
+        rows = [
+            (cache_key(cep), json.dumps(response, ensure_ascii=False), now + (self.error_ttl if 'error' in response else self.ttl))
+            for cep, response in items
+            if not response.get('retryable')
+        ]
+        if not rows:
+            return
+        with self._connection:
+            self._connection.executemany('INSERT OR REPLACE INTO cep_responses (cep, response, expires_at) VALUES (?, ?, ?)', rows)
+        self.stats.writes += len(rows)
+
+    def purge_expired(self) -> int:
+        """Delete expired entries.
+
+        Returns:
+            Number of deleted entries
+        """
+        with self._connection:
+            cursor = self._connection.execute('DELETE FROM cep_responses WHERE expires_at <= ?', (self.clock(),))
+        return cursor.rowcount
@@ -0,0 +1,21 @@
+// Classification of cep-promise rejections, shared by cep_service.js and cep_worker.js.
+const NOT_FOUND = /n[aã]o encontrado/i;
+
+// cep-promise rejects with a service_error both when every provider said the CEP
+// doesn't exist and when they failed; only the former is a final answer.
+export function isRetryable(error) {
+    if (error.type !== "service_error") {
+        return false;
+    }
+    const errors = error.errors || [];
+    return errors.length === 0 || !errors.every((serviceError) => NOT_FOUND.test(serviceError.message || ""));
+}
+
+// Error result for a rejected lookup, flagged "retryable" when the providers failed or throttled us.
+export function errorResult(error, cep) {
+    const result = { error: error.message, cep };
+    if (isRetryable(error)) {
+        result.retryable = true;
+    }
+    return result;
+}
@@ -0,0 +1,301 @@
+"""
+Pure-Python asyncio HTTP backend for CEP lookups.
+
+Talks HTTP/1.1 directly over asyncio streams to ViaCEP/BrasilAPI-style JSON
+endpoints, keeping a small pool of keep-alive connections so the TCP/TLS
+handshake is paid once per connection instead of once per CEP. With
+pipeline_depth > 1, lookup_many writes several requests on a connection before
+reading their responses (HTTP pipelining), for providers that allow it.
+"""
+
+import asyncio
+import contextlib
+import json
+import ssl
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlsplit
+
+from .cep_limiter import AdaptiveLimiter, CircuitBreaker
+from .cep_wrapper import DEFAULT_LOOKUP_TIMEOUT, DEFAULT_WORKER_RETRIES, CepBackend, _breaker_open_result
+
+DEFAULT_HTTP_POOL_SIZE = 4
+USER_AGENT = 'ptbr-sampler'
+
+
+def _parse_brasilapi(cep: str, data: dict[str, Any]) -> dict[str, Any]:
+    return {
+        'cep': data.get('cep', cep),
+        'state': data.get('state', ''),
+        'city': data.get('city', ''),
+        'neighborhood': data.get('neighborhood') or '',
+        'street': data.get('street') or '',
+        'service': data.get('service', 'brasilapi'),
+    }
+
+
+def _parse_viacep(cep: str, data: dict[str, Any]) -> dict[str, Any]:
+    if data.get('erro'):
+        return {'error': 'CEP não encontrado', 'cep': cep}
+    return {
+        'cep': data.get('cep', cep),
+        'state': data.get('uf', ''),
+        'city': data.get('localidade', ''),
+        'neighborhood': data.get('bairro', ''),
+        'street': data.get('logradouro', ''),
+        'service': 'viacep',
+    }
+
+
+@dataclass(frozen=True)
+class CepProvider:
+    """A JSON CEP endpoint: base URL, path template with a {cep} field and a response parser."""
+
+    base_url: str
+    path: str
+    parse: Callable[[str, dict[str, Any]], dict[str, Any]]
+
+
+PROVIDERS = {
+    'brasilapi': CepProvider('https://brasilapi.com.br', '/api/cep/v1/{cep}', _parse_brasilapi),
+    'viacep': CepProvider('https://viacep.com.br', '/ws/{cep}/json/', _parse_viacep),
+}
+
+
+class _HttpConnection:
+    """One keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.reusable = True
+
+    @classmethod
+    async def open(cls, host: str, port: int, ssl_context: ssl.SSLContext | None) -> '_HttpConnection':
+        reader, writer = await asyncio.open_connection(host, port, ssl=ssl_context, server_hostname=host if ssl_context else None)
+        return cls(reader, writer)
+
+    async def get_many(self, requests: list[bytes]) -> list[tuple[int, bytes]]:
+        """Write the requests back to back, then read their responses in order."""
+        self.writer.write(b''.join(requests))
+        await self.writer.drain()
+        return [await self._read_response() for _ in requests]
+
+    async def _read_response(self) -> tuple[int, bytes]:
+        status_line = await self.reader.readline()
+        if not status_line:
+            self.reusable = False
+            raise ConnectionError('Connection closed by the CEP service')
+        try:
+            status = int(status_line.split()[1])
+        except (IndexError, ValueError) as e:
+            self.reusable = False
+            raise ConnectionError(f'Malformed HTTP status line: {status_line!r}') from e
+
+        headers = {}
+        while (line := await self.reader.readline()) not in (b'\r\n', b'\n', b''):
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            if headers.get('transfer-encoding', '').lower() == 'chunked':
+                body = bytearray()
+                while size := int((await self.reader.readline()).split(b';')[0], 16):
+                    body += await self.reader.readexactly(size)
+                    await self.reader.readline()
+                # Skip trailers up to the final empty line
+                while (await self.reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                body = bytes(body)
+            elif 'content-length' in headers:
+                body = await self.reader.readexactly(int(headers['content-length']))
+            else:
+                body = await self.reader.read()
+                self.reusable = False
+        except (ValueError, asyncio.IncompleteReadError) as e:
+            self.reusable = False
+            raise ConnectionError(f'Truncated HTTP response: {e}') from e
+
+        if headers.get('connection', '').lower() == 'close':
+            self.reusable = False
+        return status, body
+
+    def close(self) -> None:
+        self.reusable = False
+        self.writer.close()
+
+    async def wait_closed(self) -> None:
+        with contextlib.suppress(ConnectionError, OSError, ssl.SSLError):
+            await self.writer.wait_closed()
+
+
+class HttpCepClient(CepBackend):
+    """CEP backend querying a JSON HTTP provider over pooled keep-alive connections.
+
+    Selectable in place of the Node worker pool (see workers_for_multiple_cep's
+    backend argument). 404/400 answers and ViaCEP's {"erro": true} become
+    {'error': ...} results; 429 and 5xx answers and network errors are retried
+    (see CepBackend).
+
+        async with HttpCepClient('viacep', pool_size=4) as client:
+            results = await client.lookup_many(ceps)
+    """
+
+    name = 'CEP HTTP service'
+
+    def __init__(
+        self,
+        provider: str = 'brasilapi',
+        base_url: str | None = None,
+        pool_size: int = DEFAULT_HTTP_POOL_SIZE,
+        pipeline_depth: int = 1,
+        timeout: float = DEFAULT_LOOKUP_TIMEOUT,
+        max_retries: int = DEFAULT_WORKER_RETRIES,
+        limiter: AdaptiveLimiter | None = None,
+        breaker: CircuitBreaker | None = None,
+    ):
+        """
+        Args:
+            provider: Key of PROVIDERS selecting the path template and response format
+            base_url: Overrides the provider's base URL (e.g. a local mirror or stand-in server)
+            pool_size: Maximum number of open connections
+            pipeline_depth: Requests written per connection before reading responses in lookup_many
+            timeout: Seconds to wait for a single lookup
+            max_retries: Extra attempts for a lookup that failed in a retryable way
+            limiter: Concurrency limiter (defaults to a new AdaptiveLimiter)
+            breaker: Circuit breaker (defaults to a new CircuitBreaker)
+
+        Raises:
+            ValueError: If the provider is unknown, the URL scheme isn't http(s) or a size is smaller than 1
+        """
+        if provider not in PROVIDERS:
+            raise ValueError(f'Unknown CEP provider: {provider}. Choose from: {", ".join(PROVIDERS)}')
+        if pool_size < 1 or pipeline_depth < 1:
+            raise ValueError('pool_size and pipeline_depth must be positive integers')
+        super().__init__(timeout, max_retries, limiter, breaker)
+        self.provider = PROVIDERS[provider]
+        url = urlsplit(base_url or self.provider.base_url)
+        if url.scheme not in ('http', 'https'):
+            raise ValueError(f'Unsupported URL scheme: {url.scheme}')
+        self.host = url.hostname
+        self.port = url.port or (443 if url.scheme == 'https' else 80)
+        self.path_prefix = url.path.rstrip('/')
+        self.ssl_context = ssl.create_default_context() if url.scheme == 'https' else None
+        self.pool_size = pool_size
+        self.pipeline_depth = pipeline_depth
+
+        self.connections_opened = 0
+        self._idle: list[_HttpConnection] = []
+        self._checked_out: set[_HttpConnection] = set()
+        self._slots: asyncio.Semaphore | None = None
+
+    def _request(self, cep: str) -> bytes:
+        path = self.path_prefix + self.provider.path.format(cep=''.join(char for char in cep if char.isdigit()))
+        return (
+            f'GET {path} HTTP/1.1\r\nHost: {self.host}\r\nUser-Agent: {USER_AGENT}\r\n'
+            'Accept: application/json\r\nConnection: keep-alive\r\n\r\n'
+        ).encode('ascii')
+
+    def _result(self, cep: str, status: int, body: bytes) -> dict[str, Any]:
+        """Turn a response into a lookup result, raising ConnectionError for answers worth retrying."""
+        if status == 429 or status >= 500:
+            raise ConnectionError(f'CEP service answered HTTP {status}')
+        if status in (400, 404):
+            return {'error': 'CEP não encontrado', 'cep': cep}
+        if status != 200:
+            return {'error': f'CEP service answered HTTP {status}', 'cep': cep}
+        try:
+            return self.provider.parse(cep, json.loads(body))
+        except (json.JSONDecodeError, UnicodeDecodeError, AttributeError) as e:
+            raise ConnectionError(f'Invalid JSON from CEP service: {e}') from e
+
+    async def _get(self, ceps: list[str]) -> list[tuple[int, bytes]]:
+        """Send GET requests for the CEPs on one pooled connection (pipelined if more than one)."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.pool_size)
+        async with self._slots:
+            connection = self._idle.pop() if self._idle else None
+            if connection is None:
+                connection = await asyncio.wait_for(_HttpConnection.open(self.host, self.port, self.ssl_context), self.timeout)
+                self.connections_opened += 1
+            self._checked_out.add(connection)
+            try:
+                responses = await asyncio.wait_for(connection.get_many([self._request(cep) for cep in ceps]), self.timeout)
+            except BaseException:
+                connection.close()
+                raise
+            finally:
+                self._checked_out.discard(connection)
+            if connection.reusable:
+                self._idle.append(connection)
+            else:
+                connection.close()
+            return responses
+
+    async def _lookup_once(self, cep: str) -> dict[str, Any]:
+        ((status, body),) = await self._get([cep])
+        return self._result(cep, status, body)
+
+    async def lookup_many(self, ceps: list[str], max_in_flight: int | None = None) -> list[dict[str, Any]]:
+        """Look up many CEPs, pipelining pipeline_depth requests per connection round trip.
+
+        CEPs of a pipelined batch that fail in a retryable way fall back to lookup().
+
+        Args:
+            ceps: List of CEP strings
+            max_in_flight: Optional hard cap on outstanding lookups on top of the adaptive limit
+
+        Returns:
+            List of dictionaries with address information, in the order of ceps
+        """
+        depth = self.pipeline_depth if max_in_flight is None else max(1, min(self.pipeline_depth, max_in_flight))
+        if depth == 1:
+            return await super().lookup_many(ceps, max_in_flight)
+
+        # At most max_in_flight CEPs outstanding: batches of depth CEPs, max_in_flight // depth batches at a time
+        semaphore = asyncio.Semaphore(max_in_flight // depth) if max_in_flight is not None else None
+
+        async def bounded_batch(batch: list[str]) -> list[dict[str, Any]]:
+            if semaphore is None:
+                return await run_batch(batch)
+            async with semaphore:
+                return await run_batch(batch)
+
+        async def run_batch(batch: list[str]) -> list[dict[str, Any]]:
+            if not self.breaker.allow():
+                return [_breaker_open_result(cep) for cep in batch]
+            await self.limiter.acquire()
+            started = time.monotonic()
+            try:
+                responses = await self._get(batch)
+            except (ConnectionError, OSError, TimeoutError):
+                await self.limiter.release(ok=False)
+                self.breaker.record_failure()
+                return [await self.lookup(cep) for cep in batch]
+            except BaseException:
+                await self.limiter.release(ok=False)
+                raise
+            await self.limiter.release(ok=True, latency=time.monotonic() - started)
+            self.breaker.record_success()
+
+            results = []
+            for cep, (status, body) in zip(batch, responses):
+                try:
+                    results.append(self._result(cep, status, body))
+                except ConnectionError:
+                    results.append(await self.lookup(cep))
+            return results
+
+        batches = [ceps[start : start + depth] for start in range(0, len(ceps), depth)]
+        return [result for batch in await asyncio.gather(*(bounded_batch(batch) for batch in batches)) for result in batch]
+
+    async def close(self) -> None:
+        """Close every connection, idle or checked out, and wait for them to shut down."""
+        connections = [*self._idle, *self._checked_out]
+        self._idle.clear()
+        self._checked_out.clear()
+        for connection in connections:
+            connection.close()
+        await asyncio.gather(*(connection.wait_closed() for connection in connections))
@@ -0,0 +1,130 @@
+"""
+Offline CEP-to-city reverse lookup.
+
+CepIndex turns the cities' CEP ranges (cep_range_begins/cep_range_ends plus the
+optional cep_starts_two/cep_ends_two second range) into sorted, non-overlapping
+segments held in parallel lists, so a lookup is one binary search.
+
+Where ranges overlap, the narrowest one wins (a single-CEP range inside a big
+city's range is the more specific answer). Identical ranges claimed by cities
+of different states are settled in favour of the state owning most cities in
+the same 3-digit CEP sector.
+"""
+
+import heapq
+from bisect import bisect_right
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class CepLocation:
+    """City owning a CEP."""
+
+    city_name: str
+    state_abbr: str
+    ibge_code: str
+
+
+def cep_to_int(cep: str | int) -> int | None:
+    """Convert a CEP with or without dash (or an int) to its integer value, or None if it isn't a CEP."""
+    if isinstance(cep, int):
+        return cep if 0 <= cep <= 99_999_999 else None
+    digits = str(cep).replace('-', '')
+    if len(digits) <= 8 and digits.isascii() and digits.isdigit():
+        return int(digits)
+    digits = ''.join(char for char in digits if char.isdigit())
+    if not digits or len(digits) > 8:
+        return None
+    return int(digits)
+
+
+def _city_ranges(city_data: dict) -> list[tuple[int, int]]:
+    ranges = []
+    for begin_key, end_key in (('cep_range_begins', 'cep_range_ends'), ('cep_starts_two', 'cep_ends_two')):
+        begin, end = cep_to_int(city_data.get(begin_key) or ''), cep_to_int(city_data.get(end_key) or '')
+        if begin is not None and end is not None and begin <= end:
+            ranges.append((begin, end))
+    return ranges
+
+
+class CepIndex:
+    """Sorted interval index answering which city owns a CEP.
+
+        index = CepIndex(data['cities'])
+        index.lookup('01001-000')  # CepLocation('São Paulo', 'SP', '3550308')
+    """
+
+    def __init__(self, cities: dict[str, dict]):
+        """
+        Args:
+            cities: City data keyed by city name, as in the locations JSON 'cities' table
+        """
+        self.locations: list[CepLocation] = []
+        intervals = []
+        for key, city_data in cities.items():
+            ibge_code = f'{city_data.get("uf_code", "")}{city_data.get("city_code", "")}'
+            location = CepLocation(city_data.get('city_name', key), city_data.get('city_uf', ''), ibge_code)
+            for begin, end in _city_ranges(city_data):
+                intervals.append((begin, end, len(self.locations)))
+            self.locations.append(location)
+
+        # Cities of each state per 3-digit CEP sector, to settle identical ranges claimed by different states
+        sector_states = Counter((begin // 100_000, self.locations[i].state_abbr) for begin, _, i in intervals)
+
+        def priority(interval: tuple[int, int, int]) -> tuple[int, int, int]:
+            begin, end, i = interval
+            return end - begin, -sector_states[begin // 100_000, self.locations[i].state_abbr], i
+
+        # Sweep the interval boundaries, keeping the covering intervals in a heap ordered by priority
+        intervals.sort()
+        boundaries = sorted({point for begin, end, _ in intervals for point in (begin, end + 1)})
+        starts: list[int] = []
+        ends: list[int] = []
+        owners: list[int] = []
+        covering: list[tuple[tuple[int, int, int], int]] = []
+        next_interval = 0
+        for point, next_point in zip(boundaries, boundaries[1:]):
+            while next_interval < len(intervals) and intervals[next_interval][0] == point:
+                heapq.heappush(covering, (priority(intervals[next_interval]), intervals[next_interval][1]))
+                next_interval += 1
+            while covering and covering[0][1] < point:
+                heapq.heappop(covering)
+            if not covering:
+                continue
+            owner = covering[0][0][2]
+            if owners and owners[-1] == owner and ends[-1] == point - 1:
+                ends[-1] = next_point - 1
+            else:
+                starts.append(point)
+                ends.append(next_point - 1)
+                owners.append(owner)
+
+        self.starts = starts
+        self.ends = ends
+        self.owners = owners
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def lookup(self, cep: str | int) -> CepLocation | None:
+        """Return the city owning cep, or None if no city's range contains it."""
+        value = cep_to_int(cep)
+        if value is None:
+            return None
+        i = bisect_right(self.starts, value) - 1
+        if i < 0 or value > self.ends[i]:
+            return None
+        return self.locations[self.owners[i]]
+
+    def lookup_many(self, ceps: Iterable[str | int]) -> list[CepLocation | None]:
+        """Look up many CEPs (see lookup), in order."""
+        starts, ends, owners, locations = self.starts, self.ends, self.owners, self.locations
+        results = []
+        append = results.append
+        for cep in ceps:
+            value = cep_to_int(cep)
+            i = bisect_right(starts, value) - 1 if value is not None else -1
+            append(locations[owners[i]] if i >= 0 and value <= ends[i] else None)
+        return results
@@ -0,0 +1,231 @@
+"""
+Adaptive concurrency control for CEP lookups.
+
+AdaptiveLimiter grows the number of concurrent lookups additively while the
+provider answers quickly and shrinks it multiplicatively (AIMD) on failures or
+slow answers. CircuitBreaker stops lookups altogether after repeated failures
+and lets a single probe through once its reset timeout has passed.
+"""
+
+import asyncio
+import random
+import time
+from collections.abc import Callable
+from typing import Any
+
+# Defaults for AdaptiveLimiter
+DEFAULT_INITIAL_LIMIT = 10
+DEFAULT_MIN_LIMIT = 1
+DEFAULT_MAX_LIMIT = 64
+DEFAULT_LATENCY_TARGET = 2.0
+
+# Defaults for CircuitBreaker
+DEFAULT_FAILURE_THRESHOLD = 20
+DEFAULT_RESET_TIMEOUT = 30.0
+
+# Defaults for backoff_delay
+DEFAULT_BACKOFF_BASE = 0.05
+DEFAULT_BACKOFF_CAP = 5.0
+
+
+def backoff_delay(
+    attempt: int, base: float = DEFAULT_BACKOFF_BASE, cap: float = DEFAULT_BACKOFF_CAP, rng: random.Random = random
+) -> float:
+    """Exponential backoff with full jitter.
+
+    Args:
+        attempt: Zero-based retry attempt
+        base: Delay ceiling of the first retry, in seconds
+        cap: Maximum delay ceiling, in seconds
+        rng: Random number source (defaults to the global random module)
+
+    Returns:
+        Delay in seconds, uniformly drawn from [0, min(cap, base * 2**attempt)]
+    """
+    return rng.uniform(0, min(cap, base * 2**attempt))
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limiter driven by lookup outcomes and latency.
+
+    Every successful lookup answered within latency_target adds 1/limit to the
+    limit (about +1 per limit successes); a failure multiplies it by
+    decrease_factor and a slow success by latency_decrease_factor.
+
+    The limiter may be shared by successive event loops (e.g. one asyncio.run
+    per chunk); what it learned carries over.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = DEFAULT_INITIAL_LIMIT,
+        min_limit: int = DEFAULT_MIN_LIMIT,
+        max_limit: int = DEFAULT_MAX_LIMIT,
+        latency_target: float = DEFAULT_LATENCY_TARGET,
+        decrease_factor: float = 0.5,
+        latency_decrease_factor: float = 0.9,
+    ):
+        """
+        Args:
+            initial_limit: Starting number of concurrent lookups
+            min_limit: Lowest limit the limiter shrinks to
+            max_limit: Highest limit the limiter grows to
+            latency_target: Seconds above which a successful lookup counts as congestion
+            decrease_factor: Multiplier applied to the limit on a failure
+            latency_decrease_factor: Multiplier applied to the limit on a slow success
+
+        Raises:
+            ValueError: If the limits are not 1 <= min_limit <= initial_limit <= max_limit
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError('Limits must satisfy 1 <= min_limit <= initial_limit <= max_limit')
+        self._limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self.latency_decrease_factor = latency_decrease_factor
+
+        self.in_flight = 0
+        self.successes = 0
+        self.failures = 0
+        self.latency_ewma: float | None = None
+        self._condition: asyncio.Condition | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def _get_condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+            # Slots held in a previous event loop can't be released into this one
+            self.in_flight = 0
+        return self._condition
+
+    async def acquire(self) -> None:
+        """Wait until fewer than limit lookups are in flight and take a slot."""
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+    async def release(self, ok: bool, latency: float | None = None) -> None:
+        """Give a slot back and adapt the limit to the lookup's outcome.
+
+        Args:
+            ok: Whether the lookup succeeded
+            latency: Seconds the lookup took, if it succeeded
+        """
+        if ok:
+            self.successes += 1
+            if latency is not None:
+                self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+            if latency is not None and latency > self.latency_target:
+                self._limit = max(self.min_limit, self._limit * self.latency_decrease_factor)
+            else:
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+        else:
+            self.failures += 1
+            self._limit = max(self.min_limit, self._limit * self.decrease_factor)
+
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight = max(0, self.in_flight - 1)
+            condition.notify_all()
+
+    def metrics(self) -> dict[str, Any]:
+        """Return the limiter's current state."""
+        return {
+            'limit': self.limit,
+            'in_flight': self.in_flight,
+            'successes': self.successes,
+            'failures': self.failures,
+            'latency_ewma': self.latency_ewma,
+        }
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    closed: lookups flow normally. After failure_threshold consecutive failures
+    the breaker opens and rejects lookups for reset_timeout seconds, then turns
+    half-open and lets one probe through; its outcome closes or reopens it.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the breaker
+            reset_timeout: Seconds the breaker stays open before a probe is allowed
+            clock: Monotonic time source in seconds
+
+        Raises:
+            ValueError: If failure_threshold is smaller than 1
+        """
+        if failure_threshold < 1:
+            raise ValueError('failure_threshold must be a positive integer')
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+
+        self.consecutive_failures = 0
+        self.rejections = 0
+        self.times_opened = 0
+        self._opened_at: float | None = None
+        self._probe_started_at: float | None = None
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if self.clock() - self._opened_at < self.reset_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def allow(self) -> bool:
+        """Return whether a lookup may be attempted now; every True must be followed by a record_* call."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        now = self.clock()
+        # In half-open state let one probe through (or another one if the last probe never reported back)
+        if state == self.HALF_OPEN and (self._probe_started_at is None or now - self._probe_started_at >= self.reset_timeout):
+            self._probe_started_at = now
+            return True
+        self.rejections += 1
+        return False
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self._opened_at = None
+        self._probe_started_at = None
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self._probe_started_at is not None or self.consecutive_failures >= self.failure_threshold:
+            if self._opened_at is None or self._probe_started_at is not None:
+                self.times_opened += 1
+            self._opened_at = self.clock()
+            self._probe_started_at = None
+
+    def metrics(self) -> dict[str, Any]:
+        """Return the breaker's current state."""
+        return {
+            'state': self.state,
+            'consecutive_failures': self.consecutive_failures,
+            'rejections': self.rejections,
+            'times_opened': self.times_opened,
+        }
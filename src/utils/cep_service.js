@@ -1,4 +1,5 @@
 import cepPromise from "./cep-promise-node/dist/cep-promise.min.js";
+import { errorResult } from "./cep_errors.js";
 
 // Process command line arguments
 const args = process.argv.slice(2);
@@ -11,7 +12,7 @@ async function processCeps(ceps) {
                 try {
                     return await cepPromise(cepValue);
                 } catch (error) {
-                    return { error: error.message, cep: cepValue };
+                    return errorResult(error, cepValue);
                 }
             })
         );
@@ -0,0 +1,34 @@
+import readline from "node:readline";
+import cepPromise from "./cep-promise-node/dist/cep-promise.min.js";
+import { errorResult } from "./cep_errors.js";
+
+// Long-lived CEP worker used by cep_wrapper.CepWorkerPool.
+// Reads one JSON request per line on stdin:   {"id": 1, "cep": "01001000"}
+// Writes one JSON response per line on stdout: {"id": 1, "result": {...}}
+// Failed lookups answer {"error": ..., "cep": ...}, flagged "retryable" when the
+// providers failed or throttled us rather than answering that the CEP doesn't exist.
+// Requests are resolved concurrently, so responses may come back out of order.
+// The process exits once stdin is closed and every pending lookup has answered.
+const lines = readline.createInterface({ input: process.stdin, terminal: false });
+
+lines.on("line", async (line) => {
+    if (!line.trim()) {
+        return;
+    }
+
+    let request;
+    try {
+        request = JSON.parse(line);
+    } catch (err) {
+        process.stdout.write(JSON.stringify({ id: null, error: `Invalid request: ${err.message}` }) + "\n");
+        return;
+    }
+
+    let result;
+    try {
+        result = await cepPromise(request.cep);
+    } catch (error) {
+        result = errorResult(error, request.cep);
+    }
+    process.stdout.write(JSON.stringify({ id: request.id, result }) + "\n");
+});
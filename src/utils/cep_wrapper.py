@@ -1,29 +1,71 @@
 import asyncio
+import contextlib
 import json
 import subprocess
 import sys
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from pathlib import Path
 from typing import Any
 
+from .cep_cache import CepCache, cache_key
+from .cep_limiter import AdaptiveLimiter, CircuitBreaker, backoff_delay
 
-async def get_cep_data(cep: str) -> dict[str, Any]:
+# Long-lived worker script answering JSON-line CEP requests (see cep_worker.js)
+CEP_WORKER_SCRIPT = Path(__file__).with_name('cep_worker.js')
+
+# Defaults for CepWorkerPool
+DEFAULT_POOL_SIZE = 4
+DEFAULT_LOOKUP_TIMEOUT = 30.0
+DEFAULT_WORKER_RETRIES = 3
+
+# Backends selectable in workers_for_multiple_cep: the Node worker pool or an HTTP provider (see cep_http.PROVIDERS)
+CEP_BACKENDS = ('node', 'brasilapi', 'viacep')
+
+# Retries of the one-shot get_cep_data, spaced by jittered exponential backoff
+MAX_LOOKUP_RETRIES = 5
+
+# Limiter and breaker shared by every lookup that doesn't bring its own, so what they
+# learn about the provider carries over between batches (see cep_lookup_metrics)
+SHARED_LIMITER = AdaptiveLimiter()
+SHARED_BREAKER = CircuitBreaker()
+
+# Lookups currently in flight, keyed by (event loop, 8-digit CEP), shared by every caller in the process
+_IN_FLIGHT: dict[tuple[asyncio.AbstractEventLoop, str], asyncio.Future] = {}
+
+
+async def get_cep_data(cep: str, cache: CepCache | None = None) -> dict[str, Any]:
     """
     Retrieves address information for a single CEP using cep_service.js
     which directly imports from the cep-promise package.
 
     Args:
         cep: A CEP (string).
+        cache: Optional persistent cache consulted before and updated after the lookup.
 
     Returns:
         A dictionary containing the address information.
-        Returns an error dictionary if there is an issue after 100 retry attempts.
+        Returns an error dictionary if there is an issue after MAX_LOOKUP_RETRIES retry attempts,
+        or right away while the shared circuit breaker is open.
     """
     # Ensure cep is a string
     cep = str(cep)
 
-    max_retries = 100
+    if cache is not None:
+        cached = cache.get(cep)
+        if cached is not None:
+            return cached
+        result = await get_cep_data(cep)
+        cache.put(cep, result)
+        return result
+
+    max_retries = MAX_LOOKUP_RETRIES
     retry_count = 0
 
     while retry_count < max_retries:
+        if not SHARED_BREAKER.allow():
+            return _breaker_open_result(cep)
         try:
             # Use the cep_service.js directly
             process = await asyncio.create_subprocess_exec(
@@ -37,97 +79,444 @@ async def get_cep_data(cep: str) -> dict[str, Any]:
 
             if process.returncode != 0:
                 error_output = stderr.decode('utf-8').strip() if stderr else 'No error details available'
+                SHARED_BREAKER.record_failure()
                 retry_count += 1
                 if retry_count >= max_retries:
-                    return {'error': f'Error calling cep_service.js after {max_retries} retries: {error_output}', 'cep': cep}
-                await asyncio.sleep(0.01)  # Small delay between retries
+                    return {
+                        'error': f'Error calling cep_service.js after {max_retries} retries: {error_output}',
+                        'cep': cep,
+                        'retryable': True,
+                    }
+                await asyncio.sleep(backoff_delay(retry_count))
                 continue  # Skip to next iteration
 
             result = json.loads(stdout.decode('utf-8'))
 
             # If result is a list with one item, return that item
             if isinstance(result, list) and len(result) == 1:
-                return result[0]
+                result = result[0]
+
+            # The providers failed or throttled us: retry rather than take it as the answer
+            if isinstance(result, dict) and result.get('retryable'):
+                SHARED_BREAKER.record_failure()
+                retry_count += 1
+                if retry_count >= max_retries:
+                    return result
+                await asyncio.sleep(backoff_delay(retry_count))
+                continue
+
+            SHARED_BREAKER.record_success()
             return result
 
         except subprocess.CalledProcessError as e:
+            SHARED_BREAKER.record_failure()
             retry_count += 1
             if retry_count >= max_retries:
-                return {'error': f'Error calling cep_service.js after {max_retries} retries: {e}', 'cep': cep}
-            await asyncio.sleep(0.01)  # Small delay between retries
+                return {'error': f'Error calling cep_service.js after {max_retries} retries: {e}', 'cep': cep, 'retryable': True}
+            await asyncio.sleep(backoff_delay(retry_count))
 
         except json.JSONDecodeError as e:
+            SHARED_BREAKER.record_failure()
             retry_count += 1
             if retry_count >= max_retries:
-                return {'error': f'Error decoding JSON after {max_retries} retries: {e}', 'cep': cep}
-            await asyncio.sleep(0.01)  # Small delay between retries
+                return {'error': f'Error decoding JSON after {max_retries} retries: {e}', 'cep': cep, 'retryable': True}
+            await asyncio.sleep(backoff_delay(retry_count))
 
         except Exception as e:
+            SHARED_BREAKER.record_failure()
             retry_count += 1
             if retry_count >= max_retries:
-                return {'error': f'Unexpected error after {max_retries} retries: {e!s}', 'cep': cep}
-            await asyncio.sleep(0.01)  # Small delay between retries
+                return {'error': f'Unexpected error after {max_retries} retries: {e!s}', 'cep': cep, 'retryable': True}
+            await asyncio.sleep(backoff_delay(retry_count))
+
+
+def _breaker_open_result(cep: str) -> dict[str, Any]:
+    """Error returned without a lookup while the circuit breaker is open; callers fall back to offline data."""
+    return {'error': 'CEP lookups suspended: circuit breaker open', 'cep': cep, 'retryable': True}
+
+
+def cep_lookup_metrics() -> dict[str, dict[str, Any]]:
+    """Return the state of the shared concurrency limiter and circuit breaker."""
+    return {'limiter': SHARED_LIMITER.metrics(), 'breaker': SHARED_BREAKER.metrics()}
+
+
+class _CepWorker:
+    """One long-lived worker process and the requests it still owes an answer to."""
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self.pending: dict[int, asyncio.Future] = {}
+        self.reader = asyncio.create_task(self._read_responses())
+
+    @classmethod
+    async def spawn(cls, command: list[str]) -> '_CepWorker':
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        return cls(process)
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None and not self.reader.done()
+
+    async def _read_responses(self) -> None:
+        """Resolve pending requests as response lines arrive, in whatever order the worker answers."""
+        try:
+            while line := await self.process.stdout.readline():
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                future = self.pending.pop(message.get('id'), None)
+                if future is not None and not future.done():
+                    future.set_result(message.get('result') or {'error': message.get('error', 'Empty response from CEP worker')})
+        finally:
+            # The worker exited or closed stdout: fail everything it still owed so callers can retry
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError('CEP worker exited'))
+            self.pending.clear()
+
+    async def request(self, request_id: int, cep: str, timeout: float) -> dict[str, Any]:
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        try:
+            self.process.stdin.write(json.dumps({'id': request_id, 'cep': cep}).encode('utf-8') + b'\n')
+            await self.process.stdin.drain()
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self.pending.pop(request_id, None)
+
+    async def close(self) -> None:
+        if self.process.returncode is None:
+            with contextlib.suppress(ConnectionError):
+                self.process.stdin.close()
+            try:
+                await asyncio.wait_for(self.process.wait(), 5)
+            except TimeoutError:
+                self.process.kill()
+                await self.process.wait()
+        await asyncio.gather(self.reader, return_exceptions=True)
+
+
+class CepBackend(ABC):
+    """Base class of CEP lookup backends (worker processes, HTTP services).
+
+    Subclasses implement _lookup_once, raising ConnectionError, OSError or
+    TimeoutError for failures worth retrying. lookup() wraps it with the shared
+    machinery: an AdaptiveLimiter governs concurrency, failed attempts are
+    retried after a jittered exponential backoff, and a CircuitBreaker
+    short-circuits lookups with a retryable error while the provider keeps failing.
+    """
 
+    # Used in error messages
+    name = 'CEP backend'
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_LOOKUP_TIMEOUT,
+        max_retries: int = DEFAULT_WORKER_RETRIES,
+        limiter: AdaptiveLimiter | None = None,
+        breaker: CircuitBreaker | None = None,
+    ):
+        """
+        Args:
+            timeout: Seconds to wait for a single lookup
+            max_retries: Extra attempts for a lookup that failed in a retryable way
+            limiter: Concurrency limiter (defaults to a new AdaptiveLimiter)
+            breaker: Circuit breaker (defaults to a new CircuitBreaker)
+        """
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.limiter = limiter if limiter is not None else AdaptiveLimiter()
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+
+    async def __aenter__(self) -> 'CepBackend':
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Release the backend's processes or connections."""
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        """Return the state of the backend's limiter and breaker."""
+        return {'limiter': self.limiter.metrics(), 'breaker': self.breaker.metrics()}
+
+    @abstractmethod
+    async def _lookup_once(self, cep: str) -> dict[str, Any]:
+        """Perform a single lookup attempt."""
+
+    async def lookup(self, cep: str) -> dict[str, Any]:
+        """Look up a single CEP.
+
+        Args:
+            cep: A CEP (string)
+
+        Returns:
+            A dictionary containing the address information, or an error dictionary
+            flagged 'retryable' if the breaker is open or the lookup still failed
+            after max_retries retries.
+        """
+        cep = str(cep)
+        last_error: Exception | None = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                await asyncio.sleep(backoff_delay(attempt - 1))
+            if not self.breaker.allow():
+                return _breaker_open_result(cep)
+
+            await self.limiter.acquire()
+            started = time.monotonic()
+            try:
+                result = await self._lookup_once(cep)
+            except (ConnectionError, OSError, TimeoutError) as e:
+                await self.limiter.release(ok=False)
+                self.breaker.record_failure()
+                last_error = e
+                continue
+            except BaseException:
+                await self.limiter.release(ok=False)
+                raise
+            await self.limiter.release(ok=True, latency=time.monotonic() - started)
+            self.breaker.record_success()
+            return result
+        return {'error': f'Error calling {self.name} after {self.max_retries} retries: {last_error!r}', 'cep': cep, 'retryable': True}
+
+    async def lookup_many(self, ceps: list[str], max_in_flight: int | None = None) -> list[dict[str, Any]]:
+        """Look up many CEPs concurrently.
+
+        Args:
+            ceps: List of CEP strings
+            max_in_flight: Optional hard cap on outstanding lookups on top of the adaptive limit
+
+        Returns:
+            List of dictionaries with address information, in the order of ceps
+        """
+        if max_in_flight is None:
+            return list(await asyncio.gather(*(self.lookup(cep) for cep in ceps)))
+
+        semaphore = asyncio.Semaphore(max(1, max_in_flight))
+
+        async def bounded_lookup(cep: str) -> dict[str, Any]:
+            async with semaphore:
+                return await self.lookup(cep)
+
+        return list(await asyncio.gather(*(bounded_lookup(cep) for cep in ceps)))
 
-async def workers_for_multiple_cep(ceps: list[str], max_workers: int = 10) -> list[dict[str, Any]]:
+
+class CepWorkerPool(CepBackend):
+    """Pool of long-lived CEP worker processes multiplexing lookups over stdin/stdout.
+
+    Each worker reads one JSON request per line and answers with one JSON line,
+    so the Node startup cost is paid once per worker instead of once per CEP.
+    Workers are spawned lazily and replaced if they die; a lookup that was in
+    flight on a dead worker is retried on another one (see CepBackend).
+
+    Use it as an async context manager, or call close() when done:
+
+        async with CepWorkerPool(size=4) as pool:
+            results = await pool.lookup_many(ceps)
     """
-    Process multiple CEPs concurrently using a worker pool.
+
+    name = 'CEP worker'
+
+    def __init__(
+        self,
+        size: int = DEFAULT_POOL_SIZE,
+        command: list[str] | None = None,
+        timeout: float = DEFAULT_LOOKUP_TIMEOUT,
+        max_retries: int = DEFAULT_WORKER_RETRIES,
+        limiter: AdaptiveLimiter | None = None,
+        breaker: CircuitBreaker | None = None,
+    ):
+        """
+        Args:
+            size: Number of worker processes
+            command: Command starting one worker (defaults to running cep_worker.js with node)
+            timeout: Seconds to wait for a single lookup
+            max_retries: Extra attempts for a lookup whose worker died or timed out
+            limiter: Concurrency limiter (defaults to a new AdaptiveLimiter)
+            breaker: Circuit breaker (defaults to a new CircuitBreaker)
+
+        Raises:
+            ValueError: If size is smaller than 1
+        """
+        if size < 1:
+            raise ValueError('size must be a positive integer')
+        super().__init__(timeout, max_retries, limiter, breaker)
+        self.size = size
+        self.command = command or ['node', str(CEP_WORKER_SCRIPT)]
+        self._workers: list[_CepWorker | None] = [None] * size
+        self._spawn_lock = asyncio.Lock()
+        self._next_id = 0
+        self._next_worker = 0
+
+    async def start(self) -> None:
+        """Spawn every worker up front instead of on first use."""
+        for slot in range(self.size):
+            await self._worker(slot)
+
+    async def close(self) -> None:
+        """Close the workers' stdin and wait for them to exit."""
+        workers = [worker for worker in self._workers if worker is not None]
+        self._workers = [None] * self.size
+        await asyncio.gather(*(worker.close() for worker in workers), return_exceptions=True)
+
+    async def _worker(self, slot: int) -> _CepWorker:
+        """Return the live worker in slot, spawning a replacement if needed."""
+        worker = self._workers[slot]
+        if worker is not None and worker.alive:
+            return worker
+        async with self._spawn_lock:
+            worker = self._workers[slot]
+            if worker is None or not worker.alive:
+                if worker is not None:
+                    await worker.close()
+                worker = await _CepWorker.spawn(self.command)
+                self._workers[slot] = worker
+            return worker
+
+    async def _lookup_once(self, cep: str) -> dict[str, Any]:
+        """Send the CEP to the next worker in turn and wait for its answer.
+
+        Raises:
+            ConnectionError: If the worker died, or the upstream providers failed or throttled the lookup
+        """
+        slot = self._next_worker
+        self._next_worker = (slot + 1) % self.size
+        self._next_id += 1
+        request_id = self._next_id
+
+        worker = await self._worker(slot)
+        result = await worker.request(request_id, cep, self.timeout)
+
+        # If result is a list with one item, return that item
+        if isinstance(result, list) and len(result) == 1:
+            result = result[0]
+        if result.get('retryable'):
+            raise ConnectionError(result.get('error', 'CEP providers failed'))
+        return result
+
+
+async def _coalesced_lookup(
+    ceps: list[str], lookup: Callable[[list[str]], Awaitable[list[dict[str, Any]]]]
+) -> dict[str, dict[str, Any]]:
+    """Resolve each distinct CEP once, sharing lookups already in flight for other callers.
+
+    CEPs nobody else is resolving are passed to lookup in a single call; the rest
+    wait for the caller that started them.
 
     Args:
-        ceps: List of CEP strings to process
-        max_workers: Maximum number of concurrent workers
+        ceps: CEPs to resolve, duplicates allowed
+        lookup: Coroutine function resolving a list of distinct CEPs, in order
 
     Returns:
-        List of dictionaries containing address information for each CEP
+        Dictionary mapping each given CEP to its result
     """
-    # Use worker pool approach for individual processing
-    queue = asyncio.Queue()
+    loop = asyncio.get_running_loop()
+    owned: list[str] = []
+    waiting: dict[str, asyncio.Future] = {}
+    for cep in dict.fromkeys(ceps):
+        key = (loop, cache_key(cep))
+        future = _IN_FLIGHT.get(key)
+        if future is None:
+            _IN_FLIGHT[key] = loop.create_future()
+            owned.append(cep)
+        else:
+            waiting[cep] = future
 
-    # Add all CEPs to the queue
-    for cep in ceps:
-        await queue.put(cep)
+    results = {}
+    try:
+        if owned:
+            for cep, result in zip(owned, await lookup(owned)):
+                results[cep] = result
+                _IN_FLIGHT[(loop, cache_key(cep))].set_result(result)
+    finally:
+        for cep in owned:
+            future = _IN_FLIGHT.pop((loop, cache_key(cep)))
+            if not future.done():
+                # The lookup failed or was cancelled: release the waiters with a retryable error
+                future.set_result({'error': 'CEP lookup was interrupted', 'cep': cep, 'retryable': True})
 
-    # Results container with mapping to preserve order
-    results_dict = {}
+    for cep, future in waiting.items():
+        results[cep] = await future
+    return results
 
-    # Worker function that processes CEPs from the queue
-    async def worker():
-        while not queue.empty():
-            try:
-                # Get a CEP from the queue
-                cep = await queue.get()
 
-                # Process the CEP using get_cep_data function
-                result = await get_cep_data(cep)
+def _new_backend(backend: str, size: int, pipeline_depth: int = 1) -> CepBackend:
+    """Create a backend by name, sharing SHARED_LIMITER and SHARED_BREAKER.
+
+    pipeline_depth is passed to HTTP backends (see HttpCepClient) and ignored by the worker pool.
+
+    Raises:
+        ValueError: If backend is not one of CEP_BACKENDS
+    """
+    if backend not in CEP_BACKENDS:
+        raise ValueError(f'Unknown CEP backend: {backend}. Choose from: {", ".join(CEP_BACKENDS)}')
+    if backend == 'node':
+        return CepWorkerPool(size=size, limiter=SHARED_LIMITER, breaker=SHARED_BREAKER)
+
+    from .cep_http import HttpCepClient
+
+    return HttpCepClient(backend, pool_size=size, pipeline_depth=pipeline_depth, limiter=SHARED_LIMITER, breaker=SHARED_BREAKER)
 
-                # Store the result with the CEP as key to preserve order
-                results_dict[cep] = result
 
-                # Mark task as done
-                queue.task_done()
-            except Exception as e:
-                # Handle any exceptions in the worker
-                results_dict[cep] = {'error': f'Worker error processing CEP: {e!s}', 'cep': cep}
-                queue.task_done()
+async def workers_for_multiple_cep(
+    ceps: list[str],
+    max_workers: int | None = None,
+    pool: CepBackend | None = None,
+    cache: CepCache | None = None,
+    backend: str = 'node',
+    pipeline_depth: int = 1,
+) -> list[dict[str, Any]]:
+    """
+    Process multiple CEPs concurrently over a pool of long-lived worker processes.
 
-    # Create worker tasks
-    tasks = []
-    for _ in range(min(max_workers, len(ceps))):
-        task = asyncio.create_task(worker())
-        tasks.append(task)
+    Each distinct CEP is looked up once: duplicates in ceps, and CEPs another
+    caller in this process is already resolving, share a single lookup and the
+    same result dictionary.
 
-    # Wait for the queue to be fully processed
-    await queue.join()
+    Args:
+        ceps: List of CEP strings to process
+        max_workers: Optional hard cap on concurrent lookups; by default the adaptive limiter decides
+        pool: Backend (CepWorkerPool, HttpCepClient) to reuse across calls. If None, a backend
+            of up to DEFAULT_POOL_SIZE workers or connections sharing SHARED_LIMITER and
+            SHARED_BREAKER is started for this call (only if some CEP is not cached) and closed afterwards.
+        cache: Optional persistent cache. Cached CEPs are answered without any lookup
+            and fresh answers are stored.
+        backend: Backend started when pool is None: 'node' (cep_worker.js processes) or an
+            HTTP provider ('brasilapi', 'viacep')
+        pipeline_depth: Requests pipelined per connection by an HTTP backend started when pool is None
 
-    # Cancel any remaining worker tasks
-    for task in tasks:
-        task.cancel()
+    Returns:
+        List of dictionaries containing address information for each CEP
+    """
+    if not ceps:
+        return []
 
-    # Wait for all tasks to be cancelled
-    await asyncio.gather(*tasks, return_exceptions=True)
+    cached = cache.get_many(ceps) if cache is not None else {}
+    misses = [cep for cep in ceps if cep not in cached]
+    if not misses:
+        return [cached[cep] for cep in ceps]
 
-    # Convert results dict back to list in the original order
-    return [results_dict.get(cep, {'error': 'CEP processing failed', 'cep': cep}) for cep in ceps]
+    async def lookup(distinct_ceps: list[str]) -> list[dict[str, Any]]:
+        if pool is not None:
+            looked_up = await pool.lookup_many(distinct_ceps, max_workers)
+        else:
+            size = max(1, min(DEFAULT_POOL_SIZE, max_workers or DEFAULT_POOL_SIZE, len(distinct_ceps)))
+            async with _new_backend(backend, size, pipeline_depth) as new_pool:
+                looked_up = await new_pool.lookup_many(distinct_ceps, max_workers)
+        if cache is not None:
+            cache.put_many(zip(distinct_ceps, looked_up))
+        return looked_up
+
+    fresh = await _coalesced_lookup(misses, lookup)
+    return [cached[cep] if cep in cached else fresh[cep] for cep in ceps]
 
 
 async def display_cep_info(data):
@@ -6,6 +6,11 @@ import re
 
 from .util import clean_id, pad_id
 
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; random_cpfs falls back to pure Python
+    np = None
+
 """
 Functions for working with Brazilian CPF identifiers.
 
@@ -14,6 +19,12 @@ Functions for working with Brazilian CPF identifiers.
 NONDIGIT = re.compile(r'[^0-9]')
 CPF_WEIGHTS = [1, 2, 3, 4, 5, 6, 7, 8, 9]
 
+# Check digit sums of each 3-digit group of a 9-digit stem, by group value: the first
+# check digit weighs the stem digits 1-9, the second weighs them 0-8 (plus 9 x first)
+_GROUP_DIGITS = [f'{x:03d}' for x in range(1000)]
+_GROUP_SUMS_FIRST = [[sum(w * int(d) for w, d in zip(CPF_WEIGHTS[3 * g : 3 * g + 3], x)) for x in _GROUP_DIGITS] for g in range(3)]
+_GROUP_SUMS_SECOND = [[sum((w - 1) * int(d) for w, d in zip(CPF_WEIGHTS[3 * g : 3 * g + 3], x)) for x in _GROUP_DIGITS] for g in range(3)]
+
 
 def validate_cpf(cpf, autopad=True):
     """Check whether CPF is valid."""
@@ -72,10 +83,66 @@ def pad_cpf(cpf, validate=False):
     return padded
 
 
-def random_cpf(formatted=True):
+def random_cpf(formatted=True, rng=random):
     """Create a random, valid CPF identifier."""
-    stem = random.randint(100000000, 999999999)
+    stem = rng.randint(100000000, 999999999)
     cpf = str(stem) + '{0}{1}'.format(*cpf_check_digits(stem))
     if formatted:
         return format_cpf(cpf)
     return cpf
+
+
+def random_cpfs(n, formatted=True, rng=None):
+    """Create n random, valid CPF identifiers at once.
+
+    Draws the same stems as random_cpf (100000000-999999999). With numpy installed
+    the stems are drawn as an (n, 9) digit matrix and both check digits come from
+    matrix products with CPF_WEIGHTS; otherwise each stem is split into three
+    3-digit groups whose weighted sums are looked up in precomputed tables.
+
+    rng may be a random.Random (or the random module, the default) or a
+    numpy.random.Generator. A random.Random only seeds the numpy generator, so
+    the same seed gives different CPFs with and without numpy.
+    """
+    if n < 0:
+        raise ValueError(f'n must be non-negative: {n}')
+    rng = rng if rng is not None else random
+    if np is not None:
+        return _random_cpfs_numpy(n, formatted, rng)
+
+    first_a, first_b, first_c = _GROUP_SUMS_FIRST
+    second_a, second_b, second_c = _GROUP_SUMS_SECOND
+    groups = _GROUP_DIGITS
+    cpfs = []
+    append = cpfs.append
+    for stem in rng.choices(range(100000000, 1000000000), k=n):
+        ab, c = divmod(stem, 1000)
+        a, b = divmod(ab, 1000)
+        d1 = (first_a[a] + first_b[b] + first_c[c]) % 11 % 10
+        d2 = (second_a[a] + second_b[b] + second_c[c] + 9 * d1) % 11 % 10
+        if formatted:
+            append(f'{groups[a]}.{groups[b]}.{groups[c]}-{d1}{d2}')
+        else:
+            append(f'{stem}{d1}{d2}')
+    return cpfs
+
+
+def _random_cpfs_numpy(n, formatted, rng):
+    generator = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng.getrandbits(64))
+    digits = np.empty((n, 11), dtype=np.int64)
+    digits[:, 0] = generator.integers(1, 10, size=n)
+    digits[:, 1:9] = generator.integers(0, 10, size=(n, 8))
+
+    weights = np.array(CPF_WEIGHTS, dtype=np.int64)
+    digits[:, 9] = digits[:, :9] @ weights % 11 % 10
+    digits[:, 10] = digits[:, 1:10] @ weights % 11 % 10
+
+    # Build the ASCII bytes of every CPF in one array and decode the batch
+    if formatted:
+        chars = np.empty((n, 14), dtype=np.uint8)
+        chars[:, [0, 1, 2, 4, 5, 6, 8, 9, 10, 12, 13]] = digits + ord('0')
+        chars[:, [3, 7]] = ord('.')
+        chars[:, 11] = ord('-')
+    else:
+        chars = (digits + ord('0')).astype(np.uint8)
+    return chars.view(f'S{chars.shape[1]}').ravel().astype(str).tolist()
@@ -56,7 +56,7 @@ class PhoneNumber:
         return self.numerify(self.generator.parse(pattern))
 
 
-def generate_phone_number(ddd=None):
+def generate_phone_number(ddd=None, rng=random):
     """
     Generate a random Brazilian phone number.
     Randomly returns either a landline (8 digits) or a cellphone (9 digits).
@@ -67,6 +67,7 @@ def generate_phone_number(ddd=None):
 
     Args:
         ddd (str, optional): The area code to use. If None, a random one will be selected.
+        rng (random.Random, optional): Random number source. Defaults to the global random module.
     """
     # Brazilian area codes (DDD)
     area_codes = [
@@ -140,31 +141,31 @@ def generate_phone_number(ddd=None):
     ]
 
     # Use provided DDD or generate a random area code
-    area_code = ddd if ddd else random.choice(area_codes)
+    area_code = ddd if ddd else rng.choice(area_codes)
 
     # Randomly decide whether to generate a landline or cellphone
-    is_cellphone = random.choice([True, False])
+    is_cellphone = rng.choice([True, False])
 
     if is_cellphone:
         # Cellphone: 9 digits starting with 9
         first_digit = '9'
         # Generate the next 4 digits of the first part (total 5 digits for cellphone)
-        rest_first_part = ''.join(random.choices('0123456789', k=4))
+        rest_first_part = ''.join(rng.choices('0123456789', k=4))
         first_part = f'{first_digit}{rest_first_part}'
 
         # Generate the second part (4 digits)
-        second_part = ''.join(random.choices('0123456789', k=4))
+        second_part = ''.join(rng.choices('0123456789', k=4))
 
         # Format the cellphone number: (XX) 9XXXX-XXXX
         return f'({area_code}) {first_part}-{second_part}'
     # Landline: 8 digits, first digit is never 0
     # Generate the first part (4 digits), first digit is never 0
-    first_digit = random.choice('123456789')
-    rest_first_part = ''.join(random.choices('0123456789', k=3))
+    first_digit = rng.choice('123456789')
+    rest_first_part = ''.join(rng.choices('0123456789', k=3))
     first_part = f'{first_digit}{rest_first_part}'
 
     # Generate the second part (4 digits)
-    second_part = ''.join(random.choices('0123456789', k=4))
+    second_part = ''.join(rng.choices('0123456789', k=4))
 
     # Format the landline number: (XX) XXXX-XXXX
     return f'({area_code}) {first_part}-{second_part}'
@@ -1,8 +1,8 @@
 #!/usr/bin/env python
 
 
+import random
 import re
-from random import randint
 
 from .util import clean_id, pad_id
 
@@ -62,9 +62,9 @@ def pad_pis(pis, validate=False):
     return padded
 
 
-def random_pis(formatted=True):
+def random_pis(formatted=True, rng=random):
     """Create a random, valid PIS identifier."""
-    pis = randint(1000000000, 9999999999)
+    pis = rng.randint(1000000000, 9999999999)
     pis = str(pis) + str(pis_check_digit(pis))
     if formatted:
         return format_pis(pis)